@@ -0,0 +1,978 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+opsi python library - AsyncPostgres
+
+Copyright (C) 2014-2015 Daniel Koch
+
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License, version 3
+as published by the Free Software Foundation.
+
+This program is distributed in the hope that it will be useful, but
+WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Affero General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Asynchronous variant of the postgres backend.
+
+The CRUD methods of this backend return twisted Deferreds instead of
+results. Queries are run over a txpostgres connection pool, so a
+twisted based front end (like opsiconfd) can keep many requests in
+flight without blocking a thread per query.
+
+Table creation, license pools and the hardware audit methods are not
+asynchronous and still use the blocking connection pool of the
+PostgresBackend. The same goes for the clean up of dependent objects
+which ConfigDataBackend runs through the backend context.
+
+@copyright: Daniel Koch <koch@triple6.org>
+@author: Daniel Koch <koch@triple6.org>
+@license: GNU Affero GPL version 3
+"""
+
+__version__ = '4.0.6.1'
+
+import json
+
+import psycopg2.extras
+
+from twisted.internet import defer, reactor, task
+
+try:
+	from txpostgres import txpostgres
+except ImportError:
+	txpostgres = None
+
+from OPSI.Logger import Logger
+from OPSI.Types import BackendConfigurationError, BackendReferentialIntegrityError
+from OPSI.Types import forceList, forceObjectClassList
+from OPSI.Object import *
+from OPSI.Backend.Backend import ConfigDataBackend
+from OPSI.Backend.Postgres import Postgres, PostgresBackend
+
+logger = Logger()
+
+
+class AsyncPostgres(Postgres):
+
+	def __init__(self, **kwargs):
+		self._startDeferred = None
+		Postgres.__init__(self, **kwargs)
+
+	def _createConnectionPool(self):
+		if txpostgres is None:
+			raise BackendConfigurationError(u"Module txpostgres is required for the asynchronous postgres backend")
+		logger.debug2(u"Creating asynchronous connection pool")
+		self._pool = txpostgres.ConnectionPool(
+				None,
+				min            = self._connectionPoolSize,
+				host           = self._address,
+				user           = self._username,
+				password       = self._password,
+				dbname         = self._database,
+				cursor_factory = psycopg2.extras.RealDictCursor,
+		)
+
+	def start(self):
+		if self._startDeferred is None:
+			logger.info(u"Starting asynchronous connection pool")
+			self._startDeferred = self._pool.start()
+		return self._startDeferred
+
+	def stop(self):
+		logger.info(u"Stopping asynchronous connection pool")
+		self._startDeferred = None
+		return self._pool.close()
+
+	def runInteraction(self, interaction, *args, **kwargs):
+		"""
+		Runs interaction(cursor, *args, **kwargs) in one transaction.
+		Returns a Deferred firing with the result of the interaction
+		after the commit.
+		"""
+		if not self._transactionIsolationLevel:
+			return self._pool.runInteraction(interaction, *args, **kwargs)
+
+		def isolated(cursor, *args, **kwargs):
+			d = cursor.execute(u'SET TRANSACTION ISOLATION LEVEL %s' % self._transactionIsolationLevel)
+			return d.addCallback(lambda cur: interaction(cursor, *args, **kwargs))
+		return self._pool.runInteraction(isolated, *args, **kwargs)
+
+	@defer.inlineCallbacks
+	def runTransaction(self, interaction, *args, **kwargs):
+		"""
+		Runs interaction(cursor, *args, **kwargs) like runInteraction
+		and retries it after serialization failures and deadlocks like
+		Postgres.runTransaction.
+		"""
+		attempt = 0
+		while True:
+			try:
+				result = yield self.runInteraction(interaction, *args, **kwargs)
+			except psycopg2.Error as e:
+				attempt += 1
+				delay = self._retryDelay(e, attempt)
+				if delay is None:
+					raise
+				yield task.deferLater(reactor, delay, lambda: None)
+			else:
+				self._countTransaction('transactions')
+				defer.returnValue(result)
+
+	@defer.inlineCallbacks
+	def getSet(self, query):
+		logger.debug2(u"getSet: %s" % query)
+		valueSet = yield self._pool.runQuery(self._prepareQuery(query))
+		if not valueSet:
+			logger.debug(u"No result for query '%s'" % query)
+			valueSet = []
+		defer.returnValue(valueSet)
+
+	def getTuples(self, query):
+		"""
+		Returns a Deferred firing with the column names and the rows
+		as tuples like Postgres.getTuples.
+		"""
+		logger.debug2(u"getTuples: %s" % query)
+
+		def interaction(cursor):
+			def fetch(cur):
+				columns = [column[0] for column in cur.description]
+				return (columns, [tuple(row[column] for column in columns) for row in cur.fetchall()])
+			return cursor.execute(self._prepareQuery(query)).addCallback(fetch)
+		return self._pool.runInteraction(interaction)
+
+	@defer.inlineCallbacks
+	def getRow(self, query):
+		logger.debug2(u"getRow: %s" % query)
+		valueSet = yield self._pool.runQuery(self._prepareQuery(query))
+		if not valueSet:
+			logger.debug(u"No result for query '%s'" % query)
+			defer.returnValue({})
+		logger.debug2(u"Result: '%s'" % valueSet[0])
+		defer.returnValue(valueSet[0])
+
+	def _executeRowCount(self, query):
+		def interaction(cursor):
+			return cursor.execute(query).addCallback(lambda cur: cur.rowcount)
+		return self._pool.runInteraction(interaction)
+
+	def insert(self, table, valueHash):
+		query = self._insertQuery(table, valueHash)
+		logger.debug2(u"insert: %s" % query)
+		return self._pool.runOperation(self._prepareQuery(query))
+
+	def update(self, table, where, valueHash, updateWhereNone=False):
+		query = self._updateQuery(table, where, valueHash, updateWhereNone)
+		logger.debug2(u"update: %s" % query)
+		return self._executeRowCount(self._prepareQuery(query))
+
+	def delete(self, table, where):
+		query = self._deleteQuery(table, where)
+		logger.debug2(u"delete: %s" % query)
+		return self._executeRowCount(self._prepareQuery(query))
+
+	def execute(self, query):
+		query = self._prepareQuery(query)
+		logger.debug2(u"SQL query: %s" % query)
+		return self._pool.runOperation(query)
+
+	def executeBatch(self, queries):
+		if not queries:
+			return defer.succeed(None)
+		query = self._prepareQuery(u'\n'.join(queries))
+		logger.debug2(u"executeBatch: %s" % query)
+
+		def interaction(cursor):
+			return cursor.execute(query).addCallback(lambda cur: None)
+		return self.runTransaction(interaction)
+
+
+class SynchronousBackendContext(object):
+	"""
+	Backend context running the blocking methods of a PostgresBackend.
+
+	ConfigDataBackend expects plain results from the backend context,
+	so it must not see the Deferreds of the AsyncPostgresBackend.
+	"""
+
+	def __init__(self, backend):
+		self._backend = backend
+
+	def __getattr__(self, attr):
+		return getattr(PostgresBackend, attr).__get__(self._backend, PostgresBackend)
+
+
+class AsyncPostgresBackend(PostgresBackend):
+
+	def __init__(self, **kwargs):
+		PostgresBackend.__init__(self, **kwargs)
+		self._name = 'asyncpgsql'
+		self._asyncSql = AsyncPostgres(**kwargs)
+		if self._context is self:
+			self._context = SynchronousBackendContext(self)
+
+		logger.debug(u'AsyncPgSQLBackend created: %s' % self)
+
+	def backend_start(self):
+		return self._asyncSql.start()
+
+	def backend_exit(self):
+		return self._asyncSql.stop()
+
+	@defer.inlineCallbacks
+	def _getObjectsAsync(self, objectClass, table, attributes, filter):
+		(attributes, filter) = self._adjustAttributes(objectClass, attributes, filter)
+		(columns, rows) = yield self._asyncSql.getTuples(self._createQuery(table, attributes, filter))
+		decode = self._rowDecoder(objectClass, columns)
+		defer.returnValue([decode(row) for row in rows])
+
+	@defer.inlineCallbacks
+	def _getHashesAsync(self, objectClass, table, attributes, filter):
+		(attributes, filter) = self._adjustAttributes(objectClass, attributes, filter, hashesOnly=True)
+		result = yield self._asyncSql.getSet(self._createQuery(table, attributes, filter))
+		for res in result:
+			self._adjustResult(objectClass, res)
+		defer.returnValue(self._toOpsiHashes(result, objectClass))
+
+	def _fromHashes(self, result, objectClass):
+		return [objectClass.fromHash(res) for res in result]
+
+	@defer.inlineCallbacks
+	def _upsertBatchAsync(self, table, obj, data=None, where=None):
+		if data is None:
+			data = self._objectToDatabaseHash(obj)
+		if where is None:
+			where = self._uniqueCondition(obj)
+		batch = self._asyncSql.batch()
+		if (yield self._asyncSql.getRow(u'select * from "%s" where %s' % (table, where))):
+			batch.update(table, where, data, updateWhereNone=True)
+		else:
+			batch.insert(table, data)
+		defer.returnValue(batch)
+
+	@defer.inlineCallbacks
+	def _insertObjectAsync(self, table, obj, data=None, where=None):
+		batch = yield self._upsertBatchAsync(table, obj, data, where)
+		yield batch.flush()
+
+	def _updateObjectAsync(self, table, obj, data=None):
+		if data is None:
+			data = self._objectToDatabaseHash(obj)
+		return self._asyncSql.update(table, self._uniqueCondition(obj), data)
+
+	def _deleteObjectsAsync(self, tables, objects):
+		logger.info(u"Deleting %d objects from %s" % (len(objects), tables))
+		batch = self._asyncSql.batch()
+		for where in self._uniqueConditions(objects):
+			for table in forceList(tables):
+				batch.delete(table, where)
+		return batch.flush()
+
+	def _replaceRows(self, batch, table, where, rows):
+		batch.delete(table, where)
+		for row in rows:
+			batch.insert(table, row)
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   Hosts                                                                                     -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def host_insertObject(self, host):
+		ConfigDataBackend.host_insertObject(self, host)
+		return self._insertObjectAsync('HOST', host)
+
+	def host_updateObject(self, host):
+		ConfigDataBackend.host_updateObject(self, host)
+		return self._updateObjectAsync('HOST', host)
+
+	def host_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting host hashes, filter: %s" % filter)
+		return self._getHashesAsync(Host, 'HOST', attributes, self._hostTypeFilter(filter))
+
+	def host_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.host_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting hosts, filter: %s" % filter)
+		return self._getObjectsAsync(Host, 'HOST', attributes, self._hostTypeFilter(filter))
+
+	@defer.inlineCallbacks
+	def host_getCounts(self):
+		if self._summaryTables:
+			hosts = yield self._asyncSql.getSet(self._summaryQuery('HOST_SUMMARY', {}))
+			depots = yield self._asyncSql.getSet(self._summaryQuery('CLIENT_DEPOT_SUMMARY', {}))
+		else:
+			hosts = yield self._asyncSql.getSet(u'select "type", count(*) AS "count" from "HOST" group by "type"')
+			depots = yield self._asyncSql.getSet(self.CLIENT_DEPOT_COUNT_QUERY)
+		defer.returnValue(self._hostCounts(hosts, depots))
+
+	def host_deleteObjects(self, hosts):
+		hostIds = [host.id for host in forceObjectClassList(hosts, Host)]
+		if not hostIds:
+			return defer.succeed(None)
+		logger.info(u"Deleting hosts %s" % hostIds)
+		return self._asyncSql.execute(self._hostDeleteQuery(hostIds))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   Configs                                                                                   -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def _configValueRows(self, data):
+		possibleValues = data['possibleValues']
+		defaultValues = data['defaultValues']
+		if possibleValues is None:
+			possibleValues = []
+		if defaultValues is None:
+			defaultValues = []
+		del data['possibleValues']
+		del data['defaultValues']
+		return [
+			{
+				'configId': data['configId'],
+				'value': value,
+				'isDefault': (value in defaultValues)
+			} for value in possibleValues
+		]
+
+	@defer.inlineCallbacks
+	def config_insertObject(self, config):
+		ConfigDataBackend.config_insertObject(self, config)
+		data = self._objectToDatabaseHash(config)
+		rows = self._configValueRows(data)
+		batch = yield self._upsertBatchAsync('CONFIG', config, data=data)
+		self._replaceRows(batch, 'CONFIG_VALUE', self._uniqueCondition(config), rows)
+		yield batch.flush()
+
+	def config_updateObject(self, config):
+		ConfigDataBackend.config_updateObject(self, config)
+		data = self._objectToDatabaseHash(config)
+		where = self._uniqueCondition(config)
+		rows = self._configValueRows(data)
+		batch = self._asyncSql.batch()
+		batch.update('CONFIG', where, data)
+		self._replaceRows(batch, 'CONFIG_VALUE', where, rows)
+		return batch.flush()
+
+	def config_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting config hashes, filter: %s" % filter)
+		return self._configHashesAsync(attributes, filter, hashesOnly=True).addCallback(self._toOpsiHashes, Config)
+
+	def config_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.config_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting configs, filter: %s" % filter)
+		return self._configHashesAsync(attributes, filter).addCallback(self._fromHashes, Config)
+
+	@defer.inlineCallbacks
+	def _configHashesAsync(self, attributes, filter, hashesOnly=False):
+		hashes = []
+		(attributes, filter) = self._adjustAttributes(Config, attributes, filter, hashesOnly)
+		(filter, conditions) = self._configValueConditions(filter)
+		attrs = []
+		for attr in attributes:
+			if not attr in ('defaultValues', 'possibleValues'):
+				attrs.append(attr)
+		for res in (yield self._asyncSql.getSet(self._createQuery('CONFIG', attrs, filter, conditions))):
+			res['possibleValues'] = []
+			res['defaultValues'] = []
+			if not attributes or 'possibleValues' in attributes or 'defaultValues' in attributes:
+				for res2 in (yield self._asyncSql.getSet(u"select * from \"CONFIG_VALUE\" where \"configId\" = '%s'" % self._asyncSql.escapeApostrophe(res['configId']))):
+					res['possibleValues'].append(res2['value'])
+					if res2['isDefault']:
+						res['defaultValues'].append(res2['value'])
+			self._adjustResult(Config, res)
+			hashes.append(res)
+		defer.returnValue(hashes)
+
+	def config_deleteObjects(self, configs):
+		ConfigDataBackend.config_deleteObjects(self, configs)
+		return self._deleteObjectsAsync(('CONFIG_VALUE', 'CONFIG'), forceObjectClassList(configs, Config))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   ConfigStates                                                                              -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def configState_insertObject(self, configState):
+		ConfigDataBackend.configState_insertObject(self, configState)
+		data = self._objectToDatabaseHash(configState)
+		data['values'] = json.dumps(data['values'])
+		return self._insertObjectAsync('CONFIG_STATE', configState, data=data)
+
+	def configState_updateObject(self, configState):
+		ConfigDataBackend.configState_updateObject(self, configState)
+		data = self._objectToDatabaseHash(configState)
+		data['values'] = json.dumps(data['values'])
+		return self._updateObjectAsync('CONFIG_STATE', configState, data=data)
+
+	def configState_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting configState hashes, filter: %s" % filter)
+		return self._getHashesAsync(ConfigState, 'CONFIG_STATE', attributes, filter)
+
+	def configState_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.configState_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting configStates, filter: %s" % filter)
+		return self._getObjectsAsync(ConfigState, 'CONFIG_STATE', attributes, filter)
+
+	def configState_deleteObjects(self, configStates):
+		ConfigDataBackend.configState_deleteObjects(self, configStates)
+		return self._deleteObjectsAsync('CONFIG_STATE', forceObjectClassList(configStates, ConfigState))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   Products                                                                                  -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def _windowsSoftwareIdRows(self, data):
+		windowsSoftwareIds = data['windowsSoftwareIds'] or []
+		del data['windowsSoftwareIds']
+		del data['productClassIds']
+		return [
+			{'windowsSoftwareId': windowsSoftwareId, 'productId': data['productId']}
+			for windowsSoftwareId in windowsSoftwareIds
+		]
+
+	@defer.inlineCallbacks
+	def product_insertObject(self, product):
+		ConfigDataBackend.product_insertObject(self, product)
+		data = self._objectToDatabaseHash(product)
+		rows = self._windowsSoftwareIdRows(data)
+		batch = yield self._upsertBatchAsync('PRODUCT', product, data=data)
+		self._replaceRows(batch, 'WINDOWS_SOFTWARE_ID_TO_PRODUCT', "\"productId\" = '%s'" % data['productId'], rows)
+		yield batch.flush()
+
+	def product_updateObject(self, product):
+		ConfigDataBackend.product_updateObject(self, product)
+		data = self._objectToDatabaseHash(product)
+		rows = self._windowsSoftwareIdRows(data)
+		batch = self._asyncSql.batch()
+		batch.update('PRODUCT', self._uniqueCondition(product), data)
+		self._replaceRows(batch, 'WINDOWS_SOFTWARE_ID_TO_PRODUCT', "\"productId\" = '%s'" % data['productId'], rows)
+		return batch.flush()
+
+	def product_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting product hashes, filter: %s" % filter)
+		return self._productHashesAsync(attributes, filter, hashesOnly=True).addCallback(self._toOpsiHashes, Product)
+
+	def product_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.product_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting products, filter: %s" % filter)
+		return self._productHashesAsync(attributes, filter).addCallback(self._fromHashes, Product)
+
+	@defer.inlineCallbacks
+	def _productHashesAsync(self, attributes, filter, hashesOnly=False):
+		hashes = []
+		(attributes, filter) = self._adjustAttributes(Product, attributes, filter, hashesOnly)
+		for res in (yield self._asyncSql.getSet(self._createQuery('PRODUCT', attributes, filter))):
+			res['windowsSoftwareIds'] = []
+			res['productClassIds'] = []
+			if not attributes or 'windowsSoftwareIds' in attributes:
+				for res2 in (yield self._asyncSql.getSet(u"select * from \"WINDOWS_SOFTWARE_ID_TO_PRODUCT\" where \"productId\" = '%s'" % res['productId'])):
+					res['windowsSoftwareIds'].append(res2['windowsSoftwareId'])
+			self._adjustResult(Product, res)
+			hashes.append(res)
+		defer.returnValue(hashes)
+
+	def product_deleteObjects(self, products):
+		ConfigDataBackend.product_deleteObjects(self, products)
+		products = forceObjectClassList(products, Product)
+		logger.info(u"Deleting %d products" % len(products))
+		batch = self._asyncSql.batch()
+		if products:
+			batch.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', u'"productId" = ANY({0})'.format(self._asyncSql.arrayLiteral([product.getId() for product in products])))
+		for where in self._uniqueConditions(products):
+			batch.delete('PRODUCT', where)
+		return batch.flush()
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   ProductProperties                                                                         -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def productProperty_insertObject(self, productProperty):
+		ConfigDataBackend.productProperty_insertObject(self, productProperty)
+		return self._asyncSql.executeBatch(self._productPropertyQueries(productProperty))
+
+	def productProperty_updateObject(self, productProperty):
+		ConfigDataBackend.productProperty_updateObject(self, productProperty)
+		return self._asyncSql.executeBatch(self._productPropertyQueries(productProperty, update=True))
+
+	def productProperty_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productProperty hashes, filter: %s" % filter)
+		return self._productPropertyHashesAsync(attributes, filter, hashesOnly=True).addCallback(self._toOpsiHashes, ProductProperty)
+
+	def productProperty_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.productProperty_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting product properties, filter: %s" % filter)
+		return self._productPropertyHashesAsync(attributes, filter).addCallback(self._fromHashes, ProductProperty)
+
+	@defer.inlineCallbacks
+	def _productPropertyHashesAsync(self, attributes, filter, hashesOnly=False):
+		hashes = []
+		(attributes, filter) = self._adjustAttributes(ProductProperty, attributes, filter, hashesOnly)
+		for res in (yield self._asyncSql.getSet(self._createQuery('PRODUCT_PROPERTY', attributes, filter))):
+			res['possibleValues'] = []
+			res['defaultValues'] = []
+			if not attributes or 'possibleValues' in attributes or 'defaultValues' in attributes:
+				valueFilter = {
+					'propertyId': res['propertyId'],
+					'productId': res['productId'],
+					'productVersion': res['productVersion'],
+					'packageVersion': res['packageVersion']
+				}
+				for res2 in (yield self._asyncSql.getSet(self._createQuery('PRODUCT_PROPERTY_VALUE', [], valueFilter))):
+					res['possibleValues'].append(res2['value'])
+					if res2['isDefault']:
+						res['defaultValues'].append(res2['value'])
+			hashes.append(res)
+		defer.returnValue(hashes)
+
+	def productProperty_deleteObjects(self, productProperties):
+		ConfigDataBackend.productProperty_deleteObjects(self, productProperties)
+		return self._deleteObjectsAsync(('PRODUCT_PROPERTY_VALUE', 'PRODUCT_PROPERTY'), forceObjectClassList(productProperties, ProductProperty))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   ProductDependencies                                                                       -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def productDependency_insertObject(self, productDependency):
+		ConfigDataBackend.productDependency_insertObject(self, productDependency)
+		return self._insertObjectAsync('PRODUCT_DEPENDENCY', productDependency)
+
+	def productDependency_updateObject(self, productDependency):
+		ConfigDataBackend.productDependency_updateObject(self, productDependency)
+		return self._updateObjectAsync('PRODUCT_DEPENDENCY', productDependency)
+
+	def productDependency_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productDependency hashes, filter: %s" % filter)
+		return self._getHashesAsync(ProductDependency, 'PRODUCT_DEPENDENCY', attributes, filter)
+
+	def productDependency_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.productDependency_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting product dependencies, filter: %s" % filter)
+		return self._getObjectsAsync(ProductDependency, 'PRODUCT_DEPENDENCY', attributes, filter)
+
+	def productDependency_deleteObjects(self, productDependencies):
+		ConfigDataBackend.productDependency_deleteObjects(self, productDependencies)
+		return self._deleteObjectsAsync('PRODUCT_DEPENDENCY', forceObjectClassList(productDependencies, ProductDependency))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   ProductOnDepots                                                                           -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def productOnDepot_insertObject(self, productOnDepot):
+		ConfigDataBackend.productOnDepot_insertObject(self, productOnDepot)
+		productOnDepotClone = productOnDepot.clone(identOnly=True)
+		productOnDepotClone.productVersion = None
+		productOnDepotClone.packageVersion = None
+		productOnDepotClone.productType = None
+		return self._insertObjectAsync('PRODUCT_ON_DEPOT', productOnDepot, where=self._uniqueCondition(productOnDepotClone))
+
+	def productOnDepot_updateObject(self, productOnDepot):
+		ConfigDataBackend.productOnDepot_updateObject(self, productOnDepot)
+		return self._updateObjectAsync('PRODUCT_ON_DEPOT', productOnDepot)
+
+	def productOnDepot_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productOnDepot hashes, filter: %s" % filter)
+		return self._getHashesAsync(ProductOnDepot, 'PRODUCT_ON_DEPOT', attributes, filter)
+
+	def productOnDepot_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.productOnDepot_getObjects(self, attributes=[], **filter)
+		return self._getObjectsAsync(ProductOnDepot, 'PRODUCT_ON_DEPOT', attributes, filter)
+
+	def productOnDepot_deleteObjects(self, productOnDepots):
+		ConfigDataBackend.productOnDepot_deleteObjects(self, productOnDepots)
+		return self._deleteObjectsAsync('PRODUCT_ON_DEPOT', forceObjectClassList(productOnDepots, ProductOnDepot))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   ProductOnClients                                                                          -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def productOnClient_insertObject(self, productOnClient):
+		ConfigDataBackend.productOnClient_insertObject(self, productOnClient)
+		productOnClientClone = productOnClient.clone(identOnly=True)
+		productOnClientClone.productVersion = None
+		productOnClientClone.packageVersion = None
+		productOnClientClone.productType = None
+		return self._insertObjectAsync('PRODUCT_ON_CLIENT', productOnClient, where=self._uniqueCondition(productOnClientClone))
+
+	def productOnClient_updateObject(self, productOnClient):
+		ConfigDataBackend.productOnClient_updateObject(self, productOnClient)
+		return self._updateObjectAsync('PRODUCT_ON_CLIENT', productOnClient)
+
+	def productOnClient_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productOnClient hashes, filter: %s" % filter)
+		return self._getHashesAsync(ProductOnClient, 'PRODUCT_ON_CLIENT', attributes, filter)
+
+	def productOnClient_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.productOnClient_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting productOnClients, filter: %s" % filter)
+		return self._getObjectsAsync(ProductOnClient, 'PRODUCT_ON_CLIENT', attributes, filter)
+
+	def productOnClient_deleteObjects(self, productOnClients):
+		ConfigDataBackend.productOnClient_deleteObjects(self, productOnClients)
+		return self._deleteObjectsAsync('PRODUCT_ON_CLIENT', forceObjectClassList(productOnClients, ProductOnClient))
+
+	def productOnClient_getCounts(self, groupBy=['productId', 'installationStatus'], **filter):
+		logger.info(u"Counting productOnClients by %s, filter: %s" % (groupBy, filter))
+		return self._asyncSql.getSet(self._productOnClientCountQuery(groupBy, filter))
+
+	def productOnClient_getSummary(self, **filter):
+		if not self._summaryTables:
+			return self.productOnClient_getCounts(['productId', 'installationStatus', 'actionResult'], **filter)
+		return self._asyncSql.getSet(self._summaryQuery('PRODUCT_ON_CLIENT_SUMMARY', filter))
+
+	def productOnClient_getEffectiveStates(self, clientIds):
+		logger.info(u"Getting effective product states of %s" % clientIds)
+		return self._asyncSql.getSet(self._effectiveProductStateQuery(clientIds)).addCallback(self._effectiveProductStates)
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   ProductPropertyStates                                                                     -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	@defer.inlineCallbacks
+	def productPropertyState_insertObject(self, productPropertyState):
+		ConfigDataBackend.productPropertyState_insertObject(self, productPropertyState)
+		if not (yield self._asyncSql.getSet(self._createQuery('HOST', ['hostId'], {"hostId": productPropertyState.objectId}))):
+			raise BackendReferentialIntegrityError(u"Object '%s' does not exist" % productPropertyState.objectId)
+		data = self._objectToDatabaseHash(productPropertyState)
+		data['values'] = json.dumps(data['values'])
+		yield self._insertObjectAsync('PRODUCT_PROPERTY_STATE', productPropertyState, data=data)
+
+	def productPropertyState_updateObject(self, productPropertyState):
+		ConfigDataBackend.productPropertyState_updateObject(self, productPropertyState)
+		data = self._objectToDatabaseHash(productPropertyState)
+		data['values'] = json.dumps(data['values'])
+		return self._updateObjectAsync('PRODUCT_PROPERTY_STATE', productPropertyState, data=data)
+
+	def productPropertyState_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productPropertyState hashes, filter: %s" % filter)
+		return self._getHashesAsync(ProductPropertyState, 'PRODUCT_PROPERTY_STATE', attributes, filter)
+
+	def productPropertyState_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.productPropertyState_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting productPropertyStates, filter: %s" % filter)
+		return self._getObjectsAsync(ProductPropertyState, 'PRODUCT_PROPERTY_STATE', attributes, filter)
+
+	def productPropertyState_deleteObjects(self, productPropertyStates):
+		ConfigDataBackend.productPropertyState_deleteObjects(self, productPropertyStates)
+		return self._deleteObjectsAsync('PRODUCT_PROPERTY_STATE', forceObjectClassList(productPropertyStates, ProductPropertyState))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   Groups                                                                                    -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def group_insertObject(self, group):
+		ConfigDataBackend.group_insertObject(self, group)
+		return self._insertObjectAsync('GROUP', group)
+
+	def group_updateObject(self, group):
+		ConfigDataBackend.group_updateObject(self, group)
+		return self._updateObjectAsync('GROUP', group)
+
+	def group_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting group hashes, filter: %s" % filter)
+		return self._getHashesAsync(Group, 'GROUP', attributes, filter)
+
+	def group_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.group_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting groups, filter: %s" % filter)
+		return self._getObjectsAsync(Group, 'GROUP', attributes, filter)
+
+	def group_deleteObjects(self, groups):
+		ConfigDataBackend.group_deleteObjects(self, groups)
+		return self._deleteObjectsAsync('GROUP', forceObjectClassList(groups, Group))
+
+	def group_getSubtree(self, groupIds, groupType=u'HostGroup'):
+		logger.info(u"Getting subtree of %s %s" % (groupType, groupIds))
+		return self._asyncSql.getSet(self._groupSubtreeQuery(groupIds, groupType)).addCallback(self._groupSubtree)
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   ObjectToGroups                                                                            -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def objectToGroup_insertObject(self, objectToGroup):
+		ConfigDataBackend.objectToGroup_insertObject(self, objectToGroup)
+		return self._insertObjectAsync('OBJECT_TO_GROUP', objectToGroup)
+
+	def objectToGroup_updateObject(self, objectToGroup):
+		ConfigDataBackend.objectToGroup_updateObject(self, objectToGroup)
+		return self._updateObjectAsync('OBJECT_TO_GROUP', objectToGroup)
+
+	def objectToGroup_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting objectToGroup hashes, filter: %s" % filter)
+		return self._getHashesAsync(ObjectToGroup, 'OBJECT_TO_GROUP', attributes, filter)
+
+	def objectToGroup_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.objectToGroup_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting objectToGroups, filter: %s" % filter)
+		return self._getObjectsAsync(ObjectToGroup, 'OBJECT_TO_GROUP', attributes, filter)
+
+	def objectToGroup_deleteObjects(self, objectToGroups):
+		ConfigDataBackend.objectToGroup_deleteObjects(self, objectToGroups)
+		return self._deleteObjectsAsync('OBJECT_TO_GROUP', forceObjectClassList(objectToGroups, ObjectToGroup))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   LicenseContracts                                                                          -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def licenseContract_insertObject(self, licenseContract):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.licenseContract_insertObject(self, licenseContract)
+		return self._insertObjectAsync('LICENSE_CONTRACT', licenseContract)
+
+	def licenseContract_updateObject(self, licenseContract):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.licenseContract_updateObject(self, licenseContract)
+		return self._updateObjectAsync('LICENSE_CONTRACT', licenseContract)
+
+	def licenseContract_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed([])
+
+		logger.info(u"Getting licenseContract hashes, filter: %s" % filter)
+		return self._getHashesAsync(LicenseContract, 'LICENSE_CONTRACT', attributes, filter)
+
+	def licenseContract_getObjects(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed([])
+
+		ConfigDataBackend.licenseContract_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting licenseContracts, filter: %s" % filter)
+		return self._getObjectsAsync(LicenseContract, 'LICENSE_CONTRACT', attributes, filter)
+
+	def licenseContract_deleteObjects(self, licenseContracts):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.licenseContract_deleteObjects(self, licenseContracts)
+		return self._deleteObjectsAsync('LICENSE_CONTRACT', forceObjectClassList(licenseContracts, LicenseContract))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   SoftwareLicenses                                                                          -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def softwareLicense_insertObject(self, softwareLicense):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.softwareLicense_insertObject(self, softwareLicense)
+		return self._insertObjectAsync('SOFTWARE_LICENSE', softwareLicense)
+
+	def softwareLicense_updateObject(self, softwareLicense):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.softwareLicense_updateObject(self, softwareLicense)
+		return self._updateObjectAsync('SOFTWARE_LICENSE', softwareLicense)
+
+	def softwareLicense_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed([])
+
+		logger.info(u"Getting softwareLicense hashes, filter: %s" % filter)
+		return self._getHashesAsync(SoftwareLicense, 'SOFTWARE_LICENSE', attributes, filter)
+
+	def softwareLicense_getObjects(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed([])
+
+		ConfigDataBackend.softwareLicense_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting softwareLicenses, filter: %s" % filter)
+		return self._getObjectsAsync(SoftwareLicense, 'SOFTWARE_LICENSE', attributes, filter)
+
+	def softwareLicense_deleteObjects(self, softwareLicenses):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.softwareLicense_deleteObjects(self, softwareLicenses)
+		return self._deleteObjectsAsync('SOFTWARE_LICENSE', forceObjectClassList(softwareLicenses, SoftwareLicense))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   SoftwareLicenseToLicensePools                                                             -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def softwareLicenseToLicensePool_insertObject(self, softwareLicenseToLicensePool):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.softwareLicenseToLicensePool_insertObject(self, softwareLicenseToLicensePool)
+		return self._insertObjectAsync('SOFTWARE_LICENSE_TO_LICENSE_POOL', softwareLicenseToLicensePool)
+
+	def softwareLicenseToLicensePool_updateObject(self, softwareLicenseToLicensePool):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.softwareLicenseToLicensePool_updateObject(self, softwareLicenseToLicensePool)
+		return self._updateObjectAsync('SOFTWARE_LICENSE_TO_LICENSE_POOL', softwareLicenseToLicensePool)
+
+	def softwareLicenseToLicensePool_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed([])
+
+		logger.info(u"Getting softwareLicenseToLicensePool hashes, filter: %s" % filter)
+		return self._getHashesAsync(SoftwareLicenseToLicensePool, 'SOFTWARE_LICENSE_TO_LICENSE_POOL', attributes, filter)
+
+	def softwareLicenseToLicensePool_getObjects(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed([])
+
+		ConfigDataBackend.softwareLicenseToLicensePool_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting softwareLicenseToLicensePool, filter: %s" % filter)
+		return self._getObjectsAsync(SoftwareLicenseToLicensePool, 'SOFTWARE_LICENSE_TO_LICENSE_POOL', attributes, filter)
+
+	def softwareLicenseToLicensePool_deleteObjects(self, softwareLicenseToLicensePools):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.softwareLicenseToLicensePool_deleteObjects(self, softwareLicenseToLicensePools)
+		return self._deleteObjectsAsync('SOFTWARE_LICENSE_TO_LICENSE_POOL', forceObjectClassList(softwareLicenseToLicensePools, SoftwareLicenseToLicensePool))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   LicenseOnClients                                                                          -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def licenseOnClient_insertObject(self, licenseOnClient):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.licenseOnClient_insertObject(self, licenseOnClient)
+		return self._insertObjectAsync('LICENSE_ON_CLIENT', licenseOnClient)
+
+	def licenseOnClient_updateObject(self, licenseOnClient):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.licenseOnClient_updateObject(self, licenseOnClient)
+		return self._updateObjectAsync('LICENSE_ON_CLIENT', licenseOnClient)
+
+	def licenseOnClient_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed([])
+
+		logger.info(u"Getting licenseOnClient hashes, filter: %s" % filter)
+		return self._getHashesAsync(LicenseOnClient, 'LICENSE_ON_CLIENT', attributes, filter)
+
+	def licenseOnClient_getObjects(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed([])
+
+		ConfigDataBackend.licenseOnClient_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting licenseOnClient, filter: %s" % filter)
+		return self._getObjectsAsync(LicenseOnClient, 'LICENSE_ON_CLIENT', attributes, filter)
+
+	def licenseOnClient_deleteObjects(self, licenseOnClients):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return defer.succeed(None)
+
+		ConfigDataBackend.licenseOnClient_deleteObjects(self, licenseOnClients)
+		return self._deleteObjectsAsync('LICENSE_ON_CLIENT', forceObjectClassList(licenseOnClients, LicenseOnClient))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   AuditSoftwares                                                                            -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def auditSoftware_insertObject(self, auditSoftware):
+		ConfigDataBackend.auditSoftware_insertObject(self, auditSoftware)
+		return self._insertObjectAsync('SOFTWARE', auditSoftware)
+
+	def auditSoftware_updateObject(self, auditSoftware):
+		ConfigDataBackend.auditSoftware_updateObject(self, auditSoftware)
+		return self._updateObjectAsync('SOFTWARE', auditSoftware)
+
+	def auditSoftware_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting auditSoftware hashes, filter: %s" % filter)
+		return self._getHashesAsync(AuditSoftware, 'SOFTWARE', attributes, filter)
+
+	def auditSoftware_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.auditSoftware_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting auditSoftware, filter: %s" % filter)
+		return self._getObjectsAsync(AuditSoftware, 'SOFTWARE', attributes, filter)
+
+	def auditSoftware_deleteObjects(self, auditSoftwares):
+		ConfigDataBackend.auditSoftware_deleteObjects(self, auditSoftwares)
+		return self._deleteObjectsAsync('SOFTWARE', forceObjectClassList(auditSoftwares, AuditSoftware))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   AuditSoftwareToLicensePools                                                               -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def auditSoftwareToLicensePool_insertObject(self, auditSoftwareToLicensePool):
+		ConfigDataBackend.auditSoftwareToLicensePool_insertObject(self, auditSoftwareToLicensePool)
+		return self._insertObjectAsync('AUDIT_SOFTWARE_TO_LICENSE_POOL', auditSoftwareToLicensePool)
+
+	def auditSoftwareToLicensePool_updateObject(self, auditSoftwareToLicensePool):
+		ConfigDataBackend.auditSoftwareToLicensePool_updateObject(self, auditSoftwareToLicensePool)
+		return self._updateObjectAsync('AUDIT_SOFTWARE_TO_LICENSE_POOL', auditSoftwareToLicensePool)
+
+	def auditSoftwareToLicensePool_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting auditSoftwareToLicensePool hashes, filter: %s" % filter)
+		return self._getHashesAsync(AuditSoftwareToLicensePool, 'AUDIT_SOFTWARE_TO_LICENSE_POOL', attributes, filter)
+
+	def auditSoftwareToLicensePool_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.auditSoftwareToLicensePool_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting auditSoftwareToLicensePool, filter: %s" % filter)
+		return self._getObjectsAsync(AuditSoftwareToLicensePool, 'AUDIT_SOFTWARE_TO_LICENSE_POOL', attributes, filter)
+
+	def auditSoftwareToLicensePool_deleteObjects(self, auditSoftwareToLicensePools):
+		ConfigDataBackend.auditSoftwareToLicensePool_deleteObjects(self, auditSoftwareToLicensePools)
+		return self._deleteObjectsAsync('AUDIT_SOFTWARE_TO_LICENSE_POOL', forceObjectClassList(auditSoftwareToLicensePools, AuditSoftwareToLicensePool))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   AuditSoftwareOnClients                                                                    -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def auditSoftwareOnClient_insertObject(self, auditSoftwareOnClient):
+		ConfigDataBackend.auditSoftwareOnClient_insertObject(self, auditSoftwareOnClient)
+		data = self._objectToDatabaseHash(auditSoftwareOnClient)
+		if data['lastUsed'] == '0000-00-00 00:00:00':
+			data['lastUsed'] = '0001-01-01 00:00:00'
+		return self._insertObjectAsync('SOFTWARE_CONFIG', auditSoftwareOnClient, data=data)
+
+	def auditSoftwareOnClient_updateObject(self, auditSoftwareOnClient):
+		ConfigDataBackend.auditSoftwareOnClient_updateObject(self, auditSoftwareOnClient)
+		return self._updateObjectAsync('SOFTWARE_CONFIG', auditSoftwareOnClient)
+
+	def auditSoftwareOnClient_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting auditSoftwareOnClient hashes, filter: %s" % filter)
+		return self._getHashesAsync(AuditSoftwareOnClient, 'SOFTWARE_CONFIG', attributes, filter)
+
+	def auditSoftwareOnClient_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.auditSoftwareOnClient_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting auditSoftwareOnClient, filter: %s" % filter)
+		return self._getObjectsAsync(AuditSoftwareOnClient, 'SOFTWARE_CONFIG', attributes, filter)
+
+	def auditSoftwareOnClient_deleteObjects(self, auditSoftwareOnClients):
+		ConfigDataBackend.auditSoftwareOnClient_deleteObjects(self, auditSoftwareOnClients)
+		return self._deleteObjectsAsync('SOFTWARE_CONFIG', forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient))
+
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	# -   BootConfigurations                                                                        -
+	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+	def bootConfiguration_insertObject(self, bootConfiguration):
+		ConfigDataBackend.bootConfiguration_insertObject(self, bootConfiguration)
+		return self._insertObjectAsync('BOOT_CONFIGURATION', bootConfiguration)
+
+	def bootConfiguration_updateObject(self, bootConfiguration):
+		ConfigDataBackend.bootConfiguration_updateObject(self, bootConfiguration)
+		return self._updateObjectAsync('BOOT_CONFIGURATION', bootConfiguration)
+
+	def bootConfiguration_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting bootConfiguration hashes, filter: %s" % filter)
+		return self._getHashesAsync(BootConfiguration, 'BOOT_CONFIGURATION', attributes, filter)
+
+	def bootConfiguration_getObjects(self, attributes=[], **filter):
+		ConfigDataBackend.bootConfiguration_getObjects(self, attributes=[], **filter)
+		logger.info(u"Getting bootConfigurations, filter: %s" % filter)
+		return self._getObjectsAsync(BootConfiguration, 'BOOT_CONFIGURATION', attributes, filter)
+
+	def bootConfiguration_deleteObjects(self, bootConfigurations):
+		ConfigDataBackend.bootConfiguration_deleteObjects(self, bootConfigurations)
+		return self._deleteObjectsAsync('BOOT_CONFIGURATION', forceObjectClassList(bootConfigurations, BootConfiguration))
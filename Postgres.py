@@ -27,9 +27,13 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 __version__ = '4.0.6.1'
 
 import base64
+import random
+import re
 import warnings
 import time
 import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from hashlib import md5
 
 import psycopg2
@@ -39,13 +43,19 @@ from sqlalchemy import pool
 from twisted.conch.ssh import keys
 
 from OPSI.Logger import Logger
-from OPSI.Types import BackendIOError, BackendBadValueError
-from OPSI.Types import forceInt, forceUnicode
-from OPSI.Backend.Backend import ConfigDataBackend
+from OPSI.Types import BackendConfigurationError, BackendIOError
+from OPSI.Types import forceInt, forceUnicode, forceUnicodeLower
 from OPSI.Backend.SQLpg import SQL, SQLBackend, SQLBackendObjectModificationTracker
 
 logger = Logger()
 
+# Let the driver decode jsonb columns
+psycopg2.extras.register_json(oid=3802, array_oid=3807, globally=True)
+
+# SQLSTATEs of failed transactions which succeed if they are retried
+SERIALIZATION_FAILURE = '40001'
+DEADLOCK_DETECTED = '40P01'
+
 
 class ConnectionPool(object):
 	# Storage for the instance reference
@@ -58,6 +68,7 @@ class ConnectionPool(object):
 		if ConnectionPool.__instance is None:
 			logger.info(u"Creating ConnectionPool instance")
 			# Create and remember instance
+			startupMode = kwargs.pop('startup_mode', None)
 			poolArgs = {}
 			for key in ('pool_size', 'max_overflow', 'timeout'):
 				if key in kwargs.keys():
@@ -66,12 +77,59 @@ class ConnectionPool(object):
 			def creator():
 				return psycopg2.connect(**kwargs)
 			ConnectionPool.__instance = pool.QueuePool(creator, **poolArgs)
-			con = ConnectionPool.__instance.connect()
-			con.close()
+			try:
+				if startupMode == 'lazy':
+					logger.debug(u"Connections will be opened on first use")
+				elif startupMode == 'eager':
+					self._warmup(poolArgs.get('pool_size', 5))
+				else:
+					con = ConnectionPool.__instance.connect()
+					con.close()
+			except Exception:
+				# Do not hand out a pool which can not connect
+				ConnectionPool.__instance = None
+				raise
 
 		# Store instance reference as the only member in the handle
 		self.__dict__['_ConnectionPool__instance'] = ConnectionPool.__instance
 
+	def _warmup(self, size):
+		"""
+		Opens size connections in parallel and runs a first query on
+		each, so the requests after startup find them ready in the pool.
+		Raises the error of the first connection if none could be opened.
+		"""
+		logger.info(u"Opening %d connections" % size)
+		connections = []
+		errors = []
+		lock = threading.Lock()
+
+		def connect():
+			try:
+				con = ConnectionPool.__instance.connect()
+				cursor = con.cursor()
+				cursor.execute('SELECT 1')
+				cursor.close()
+				con.commit()
+			except Exception as e:
+				logger.warning(u"Failed to open connection: %s" % e)
+				with lock:
+					errors.append(e)
+				return
+			with lock:
+				connections.append(con)
+
+		threads = [threading.Thread(target=connect) for i in range(size)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		# Returned connections stay open in the pool
+		for con in connections:
+			con.close()
+		if errors and not connections:
+			raise errors[0]
+
 	def destroy(self):
 		logger.notice(u"Destroying ConnectionPool instance")
 		ConnectionPool.__instance = None
@@ -92,7 +150,9 @@ class Postgres(SQL):
 	ESCAPED_BACKSLASH  = "\\"
 	ESCAPED_APOSTROPHE = "''"
 	ESCAPED_ASTERISK   = "*"
-	doCommit = True
+	# Statements changing the schema, they invalidate the schema snapshot.
+	# Temporary tables are not part of the snapshot.
+	DDL_PATTERN = re.compile(u'(^|;)\s*(CREATE|ALTER|DROP)\s+(?!((GLOBAL|LOCAL)\s+)?TEMP(ORARY)?\s)', re.IGNORECASE)
 
 	def __init__(self, **kwargs):
 
@@ -104,6 +164,10 @@ class Postgres(SQL):
 		self._connectionPoolSize        = 20
 		self._connectionPoolMaxOverflow = 10
 		self._connectionPoolTimeout     = 30
+		self._transactionIsolationLevel = None
+		self._transactionMaxRetries     = 10
+		self._transactionRetryDelay     = 0.05
+		self._startupMode               = None
 
 		# Parse arguments
 		for (option, value) in kwargs.items():
@@ -124,8 +188,29 @@ class Postgres(SQL):
 				self._connectionPoolMaxOverflow = forceInt(value)
 			elif option == 'connectionpooltimeout':
 				self._connectionPoolTimeout = forceInt(value)
+			elif option == 'transactionisolationlevel':
+				self._transactionIsolationLevel = forceUnicode(value).upper()
+			elif option == 'transactionmaxretries':
+				self._transactionMaxRetries = forceInt(value)
+			elif option == 'transactionretrydelay':
+				self._transactionRetryDelay = float(value)
+			elif option == 'startupmode':
+				self._startupMode = forceUnicodeLower(value)
+				if not self._startupMode in ('lazy', 'eager'):
+					raise BackendConfigurationError(u"Bad startupMode '%s', use lazy or eager" % value)
 
 		self._transactionLock = threading.Lock()
+		# Connection bound to the current thread by transaction()
+		self._local = threading.local()
+		self._schema = None
+		self._statisticsLock = threading.Lock()
+		self._transactionStatistics = {
+			'transactions': 0,
+			'retries': 0,
+			'serializationFailures': 0,
+			'deadlocks': 0,
+			'failures': 0,
+		}
 		self._pool = None
 
 		self._createConnectionPool()
@@ -146,6 +231,7 @@ class Postgres(SQL):
 						pool_size    = self._connectionPoolSize,
 						max_overflow = self._connectionPoolMaxOverflow,
 						timeout      = self._connectionPoolTimeout,
+						startup_mode = self._startupMode,
 				)
 
 			except Exception as e:
@@ -154,7 +240,126 @@ class Postgres(SQL):
 		finally:
 			self._transactionLock.release()
 
+	def _boundTransaction(self):
+		return getattr(self._local, 'transaction', None)
+
+	@contextmanager
+	def transaction(self, isolationLevel=None):
+		"""
+		Runs everything inside the with block in one transaction.
+
+		The connection is bound to the current thread, so all queries
+		of the thread (including those of the SQLBackend methods) use
+		it and are committed together when the block is left. An
+		exception rolls the transaction back. Nested blocks are
+		mapped to savepoints and keep the isolation level of the
+		outermost block. isolationLevel overrides the configured
+		transactionIsolationLevel.
+		"""
+		bound = self._boundTransaction()
+		if bound:
+			bound['depth'] += 1
+			savepoint = u'savepoint_%d' % bound['depth']
+			bound['cursor'].execute(u'SAVEPOINT "%s"' % savepoint)
+			try:
+				yield
+			except:
+				bound['cursor'].execute(u'ROLLBACK TO SAVEPOINT "%s"' % savepoint)
+				raise
+			else:
+				bound['cursor'].execute(u'RELEASE SAVEPOINT "%s"' % savepoint)
+			finally:
+				bound['depth'] -= 1
+			return
+
+		(conn, cursor) = self.connect()
+		self._local.transaction = {'conn': conn, 'cursor': cursor, 'depth': 0}
+		logger.debug2(u"Transaction started")
+		try:
+			isolationLevel = isolationLevel or self._transactionIsolationLevel
+			if isolationLevel:
+				cursor.execute(u'SET TRANSACTION ISOLATION LEVEL %s' % isolationLevel)
+			yield
+		except:
+			conn.rollback()
+			logger.debug(u"Transaction rolled back")
+			raise
+		else:
+			conn.commit()
+			logger.debug2(u"Transaction committed")
+		finally:
+			self._local.transaction = None
+			self.close(conn, cursor)
+
+	def runTransaction(self, function, *args, **kwargs):
+		"""
+		Calls function(*args, **kwargs) inside transaction() and
+		returns its result. The keyword argument isolationLevel is
+		passed to transaction() instead of function.
+
+		Serialization failures and deadlocks abort the transaction
+		without any harm, so the whole unit of work is retried after a
+		jittered exponential backoff. Inside an already running
+		transaction the function is just called, the outermost unit of
+		work is the one to be retried.
+		"""
+		isolationLevel = kwargs.pop('isolationLevel', None)
+		if self._boundTransaction():
+			return function(*args, **kwargs)
+
+		attempt = 0
+		while True:
+			try:
+				with self.transaction(isolationLevel):
+					result = function(*args, **kwargs)
+				self._countTransaction('transactions')
+				return result
+			except psycopg2.Error as e:
+				attempt += 1
+				delay = self._retryDelay(e, attempt)
+				if delay is None:
+					raise
+				time.sleep(delay)
+
+	def _retryDelay(self, error, attempt):
+		"""
+		Returns the seconds to wait before retry number attempt of a
+		transaction which failed with error, None if it must not be
+		retried.
+		"""
+		if error.pgcode not in (SERIALIZATION_FAILURE, DEADLOCK_DETECTED):
+			return None
+		if error.pgcode == SERIALIZATION_FAILURE:
+			self._countTransaction('serializationFailures')
+		else:
+			self._countTransaction('deadlocks')
+		if attempt > self._transactionMaxRetries:
+			self._countTransaction('failures')
+			logger.error(u"Transaction failed (SQLSTATE %s) - giving up after %d retries" % (error.pgcode, attempt - 1))
+			return None
+		self._countTransaction('retries')
+		delay = random.uniform(0, self._transactionRetryDelay * (2 ** min(attempt, 6)))
+		logger.notice(u"Transaction failed (SQLSTATE %s) - retry %d in %0.3f seconds" % (error.pgcode, attempt, delay))
+		return delay
+
+	def _countTransaction(self, key):
+		with self._statisticsLock:
+			self._transactionStatistics[key] += 1
+
+	def getTransactionStatistics(self):
+		"""
+		Returns the counters of runTransaction: completed transactions,
+		retries, serialization failures and deadlocks seen and
+		transactions given up after the last retry.
+		"""
+		with self._statisticsLock:
+			return dict(self._transactionStatistics)
+
 	def connect(self, cursorType=None):
+		bound = self._boundTransaction()
+		if bound:
+			return (bound['conn'], bound['cursor'])
+
 		myConnectionSuccess = False
 		myMaxRetryConnection = 10
 		myRetryConnectionCounter = 0
@@ -192,6 +397,10 @@ class Postgres(SQL):
 		return (conn, cursor)
 
 	def close(self, conn, cursor):
+		bound = self._boundTransaction()
+		if bound and bound['conn'] is conn:
+			# Closed when the transaction ends
+			return
 		try:
 			cursor.close()
 			conn.close()
@@ -222,6 +431,23 @@ class Postgres(SQL):
 			self.close(conn, cursor)
 		return valueSet
 
+	def getTuples(self, query):
+		"""
+		Returns the column names and the rows as tuples. Tuples are
+		cheaper to build than the dicts getSet returns.
+		"""
+		logger.debug2(u"getTuples: %s" % query)
+		(conn, cursor) = self.connect()
+		tupleCursor = conn.cursor()
+		try:
+			self.execute(query, conn, tupleCursor)
+			columns = [column[0] for column in tupleCursor.description]
+			rows = tupleCursor.fetchall()
+		finally:
+			tupleCursor.close()
+			self.close(conn, cursor)
+		return (columns, rows)
+
 	def getRows(self, query):
 		if not query.lower().startswith("select"):
 			raise BackendIOError(u"getRows method allows select statements only, aborting.")
@@ -280,7 +506,6 @@ class Postgres(SQL):
 		return row
 
 	def insert(self, table, valueHash, conn=None, cursor=None):
-
 		closeConnection = True
 		if conn and cursor:
 			logger.debug(u"TRANSACTION: conn and cursor given, so we should not close the connection.")
@@ -289,25 +514,7 @@ class Postgres(SQL):
 			(conn, cursor) = self.connect()
 		result = -1
 		try:
-                        colNames = []
-                        values = []
-			for (key, value) in valueHash.items():
-                                colNames.append(u'"{0}"'.format(key))
-				if value is None:
-					values.append(u"NULL")
-				elif type(value) is bool:
-					if value:
-						values.append(u"true")
-					else:
-						values.append(u"false")
-				elif type(value) in (float, long, int):
-					values.append(u"{0}".format(value))
-				elif type(value) is str:
-					values.append(u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value.decode("utf-8")))))
-				else:
-					values.append(u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value))))
-
-			query = u'INSERT INTO "{0}" ({1}) VALUES ({2});'.format(table, ', '.join(colNames), ', '.join(values))
+			query = self._insertQuery(table, valueHash)
 			logger.debug2(u"insert: %s" % query)
 			try:
 				self.execute(query, conn, cursor)
@@ -338,30 +545,7 @@ class Postgres(SQL):
 		(conn, cursor) = self.connect()
 		result = 0
 		try:
-			if not valueHash:
-				raise BackendBadValueError(u"No values given")
-                        query = []
-			for (key, value) in valueHash.items():
-				if value is None:
-					if not updateWhereNone:
-						continue
-
-					value = u"NULL"
-				elif type(value) is bool:
-					if value:
-						value = u"true"
-					else:
-						value = u"false"
-				elif type(value) in (float, long, int):
-					value = u"%s" % value
-				elif type(value) is str:
-					value = u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value.decode("utf-8"))))
-				else:
-					value = u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value)))
-
-				query.append(u'"{0}" = {1}'.format(key, value))
-			query = u'UPDATE "{0}" SET {1} WHERE {2};'.format(table, ', '.join(query), where)
-
+			query = self._updateQuery(table, where, valueHash, updateWhereNone)
 			logger.debug2(u"update: %s" % query)
 			try:
 				self.execute(query, conn, cursor)
@@ -387,7 +571,7 @@ class Postgres(SQL):
 			(conn, cursor) = self.connect()
 		result = 0
 		try:
-			query = u'DELETE FROM "%s" WHERE %s;' % (table, where)
+			query = self._deleteQuery(table, where)
 			logger.debug2(u"delete: %s" % query)
 			try:
 				self.execute(query, conn, cursor)
@@ -405,8 +589,11 @@ class Postgres(SQL):
 				self.close(conn, cursor)
 		return result
 
+	def _prepareQuery(self, query):
+		return forceUnicode(query.replace(' GROUP ',' "GROUP" '))
+
 	def execute(self, query, conn=None, cursor=None):
-		query = query.replace(' GROUP ',' "GROUP" ')
+		query = self._prepareQuery(query)
 
 		res = None
 		needClose = False
@@ -414,27 +601,64 @@ class Postgres(SQL):
 			(conn, cursor) = self.connect()
 			needClose = True
 		try:
-			query = forceUnicode(query)
 			logger.debug2(u"SQL query: %s" % query)
 			res = cursor.execute(query)
-			if self.doCommit:
+			if not self._boundTransaction():
 				conn.commit()
+			if self.DDL_PATTERN.search(query):
+				self.invalidateSchema()
 		finally:
 			if needClose:
 				self.close(conn, cursor)
 		return res
 
+	def executeBatch(self, queries):
+		if not queries:
+			return
+		query = u'\n'.join(queries)
+		logger.debug2(u"executeBatch: %s" % query)
+		# All statements are sent with one round trip and
+		# are committed together
+		self.runTransaction(self.execute, query)
+
+	def getSchema(self):
+		"""
+		Returns a snapshot of the schema: a dict mapping each table to
+		an ordered dict of its columns and their types.
+
+		All tables and columns are read with a single catalog query.
+		The snapshot is cached until a statement changes the schema.
+		"""
+		schema = self._schema
+		if schema is not None:
+			return schema
+
+		logger.debug(u"Reading schema")
+		schema = {}
+		query = u'''SELECT c.relname AS table_name, a.attname AS column_name,
+				format_type(a.atttypid, a.atttypmod) AS data_type
+			FROM pg_catalog.pg_class c
+			JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+			LEFT JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+			WHERE n.nspname = 'public' AND c.relkind = 'r'
+			ORDER BY c.relname, a.attnum'''
+		for res in self.getSet(query):
+			columns = schema.setdefault(res['table_name'].upper(), OrderedDict())
+			if res['column_name']:
+				columns[res['column_name']] = res['data_type']
+		self._schema = schema
+		return schema
+
+	def invalidateSchema(self):
+		self._schema = None
+
 	def getTables(self):
 		# Hardware audit database
 		tables = {}
 		logger.debug(u"Current tables:")
-		for i in self.getSet(u"SELECT table_name FROM information_schema.tables WHERE table_schema = 'public';"):
-			tableName = i.values()[0].upper()
+		for (tableName, columns) in self.getSchema().items():
 			logger.debug2(u" [ %s ]" % tableName)
-			tables[tableName] = []
-			for j in self.getSet(u"SELECT column_name FROM information_schema.columns WHERE table_name ='%s'" % tableName.upper()):
-				logger.debug2(u"      %s" % j)
-				tables[tableName].append(j['column_name'])
+			tables[tableName] = columns.keys()
 		return tables
 
 	def getTableCreationOptions(self, table):
@@ -448,17 +672,30 @@ class PostgresBackend(SQLBackend):
 
 	def __init__(self, **kwargs):
 		self._name = 'pgsql'
+		start = time.time()
 
 		SQLBackend.__init__(self, **kwargs)
 		self._sql = Postgres(**kwargs)
+		if self._sql._startupMode != 'lazy':
+			self._getAuditHardwareConfig()
 		warnings.showwarning = self._showwarning
 
 		self._licenseManagementEnabled = True
 		self._licenseManagementModule = False
 		self._sqlBackendModule = False
 
+		self._startupTime = time.time() - start
+		logger.info(u'PgSQLBackend started in %0.3f seconds' % self._startupTime)
 		logger.debug(u'PgSQLBackend created: %s' % self)
 
+	def backend_getStartupTime(self):
+		"""
+		Returns the seconds it took to create the backend, including
+		the connection pool warmup and the hardware audit config parsing
+		unless they are lazy.
+		"""
+		return self._startupTime
+
 	def _showwarning(self, message, category, filename, lineno, line=None, file=None):
 		# logger.warning(u"%s (file: %s, line: %s)" % (message, filename, lineno))
 		if str(message).startswith('Data truncated for column'):
@@ -495,198 +732,6 @@ class PostgresBackend(SQLBackend):
 		self._sql.execute(table)
 		self._sql.execute('CREATE INDEX "index_host_type" on "HOST" ("type");')
 
-	# Overwriting productProperty_insertObject and
-	# productProperty_updateObject to implement Transaction
-	def productProperty_insertObject(self, productProperty):
-		ConfigDataBackend.productProperty_insertObject(self, productProperty)
-		data = self._objectToDatabaseHash(productProperty)
-		possibleValues = data['possibleValues']
-		defaultValues = data['defaultValues']
-		if possibleValues is None:
-			possibleValues = []
-		if defaultValues is None:
-			defaultValues = []
-		del data['possibleValues']
-		del data['defaultValues']
-
-		where = self._uniqueCondition(productProperty)
-		if self._sql.getRow('select * from "PRODUCT_PROPERTY" where %s' % where):
-			self._sql.update("PRODUCT_PROPERTY", where, data, updateWhereNone = True)
-		else:
-			self._sql.insert("PRODUCT_PROPERTY", data)
-
-		if possibleValues is not None:
-			(conn, cursor) = self._sql.connect()
-			myTransactionSuccess = False
-			myMaxRetryTransaction = 10
-			myRetryTransactionCounter = 0
-			while (not myTransactionSuccess) and (myRetryTransactionCounter < myMaxRetryTransaction):
-				try:
-					myRetryTransactionCounter += 1
-					# transaction
-					cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL SERIALIZABLE")
-					self._sql.doCommit = False
-#					conn.begin()
-					logger.debug2(u'Start Transaction: delete from ppv %d' % myRetryTransactionCounter)
-
-					self._sql.delete('PRODUCT_PROPERTY_VALUE', where, conn, cursor)
-					conn.commit()
-					myTransactionSuccess = True
-				except Exception as e:
-					logger.debug(u"Execute error: %s" % e)
-					if e.args[0] == 1213:
-						# 1213: 'Deadlock found when trying to get lock; try restarting transaction'
-						# 1213: May be table locked because of concurrent access - retrying
-						myTransactionSuccess = False
-						if myRetryTransactionCounter >= myMaxRetryTransaction:
-							logger.error(u'Table locked (Code 2013) - giving up after %d retries' % myRetryTransactionCounter)
-							raise
-						else:
-							logger.notice(u'Table locked (Code 2013) - restarting Transaction')
-							time.sleep(0.1)
-					else:
-						logger.error(u'Unknown DB Error: %s' % str(e))
-						raise
-
-				logger.debug2(u'End Transaction')
-				self._sql.doCommit = True
-				logger.debug2(u'doCommit set to true')
-			self._sql.close(conn, cursor)
-
-		(conn, cursor) = self._sql.connect()
-		for value in possibleValues:
-			try:
-				# transform arguments for sql
-				# from uniqueCondition
-				if (value in defaultValues):
-					myPPVdefault = u'"isDefault" = \'true\''
-				else:
-					myPPVdefault = u'"isDefault" = \'false\''
-
-				if type(value) is bool:
-					if value:
-						myPPVvalue = u'"value" = \'true\''
-					else:
-						myPPVvalue = u'"value" = \'false\''
-				elif type(value) in (float, long, int):
-					myPPVvalue = u'"value" = %s' % (value)
-				else:
-					myPPVvalue = u"\"value\" = '%s'" % (self._sql.escapeApostrophe(self._sql.escapeBackslash(value)))
-				myPPVselect = (
-					u"select * from \"PRODUCT_PROPERTY_VALUE\" where "
-					u"\"propertyId\" = '{0}' AND \"productId\" = '{1}' AND "
-					u"\"productVersion\" = '{2}' AND "
-					u"\"packageVersion\" = '{3}' AND {4} AND {5}".format(
-						data['propertyId'],
-						data['productId'],
-						str(data['productVersion']),
-						str(data['packageVersion']),
-						myPPVvalue,
-						myPPVdefault
-					)
-				)
-				myTransactionSuccess = False
-				myMaxRetryTransaction = 10
-				myRetryTransactionCounter = 0
-				while (not myTransactionSuccess) and (myRetryTransactionCounter < myMaxRetryTransaction):
-					try:
-						myRetryTransactionCounter += 1
-						# transaction
-						cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL SERIALIZABLE")
-						self._sql.doCommit = False
-#						conn.begin()
-						logger.notice(u'Start Transaction: insert to ppv %d' % myRetryTransactionCounter)
-						if not self._sql.getRow(myPPVselect , conn, cursor):
-							# self._sql.doCommit = True
-							logger.notice(u'doCommit set to true')
-							self._sql.insert('PRODUCT_PROPERTY_VALUE', {
-								'productId': data['productId'],
-								'productVersion': data['productVersion'],
-								'packageVersion': data['packageVersion'],
-								'propertyId': data['propertyId'],
-								'value': value,
-								'isDefault': (value in defaultValues)
-								}, conn, cursor)
-							conn.commit()
-						else:
-							conn.rollback()
-						myTransactionSuccess = True
-					except Exception as e:
-						logger.debug(u"Execute error: %s" % e)
-						if e.args[0] == 1213:
-							# 1213: 'Deadlock found when trying to get lock; try restarting transaction'
-							# 1213: May be table locked because of concurrent access - retrying
-							myTransactionSuccess = False
-							if myRetryTransactionCounter >= myMaxRetryTransaction:
-								logger.error(u'Table locked (Code 2013) - giving up after %d retries' % myRetryTransactionCounter)
-								raise
-							else:
-								logger.notice(u'Table locked (Code 2013) - restarting Transaction')
-								time.sleep(0.1)
-						else:
-							logger.error(u'Unknown DB Error: %s' % str(e))
-							raise
-
-				logger.debug2(u'End Transaction')
-			finally:
-				self._sql.doCommit = True
-				logger.debug2(u'doCommit set to true')
-		self._sql.close(conn,cursor)
-
-		def productProperty_updateObject(self, productProperty):
-			if not self._sqlBackendModule:
-				raise Exception(u"SQL backend module disabled")
-
-			ConfigDataBackend.productProperty_updateObject(self, productProperty)
-			data = self._objectToDatabaseHash(productProperty)
-			where = self._uniqueCondition(productProperty)
-			possibleValues = data['possibleValues']
-			defaultValues = data['defaultValues']
-			if possibleValues is None:
-				possibleValues = []
-			if defaultValues is None:
-				defaultValues = []
-			del data['possibleValues']
-			del data['defaultValues']
-			self._sql.update('PRODUCT_PROPERTY', where, data)
-
-			if possibleValues is not None:
-				self._sql.delete('PRODUCT_PROPERTY_VALUE', where)
-
-			for value in possibleValues:
-				try:
-					self._sql.doCommit = False
-					logger.debug2(u'doCommit set to false')
-					valuesExist = self._sql.getRow(
-						u"select * from \"PRODUCT_PROPERTY_VALUE\" where "
-						u"\"propertyId\" = '{0}' AND \"productId\" = '{1}' AND "
-						u"\"productVersion\" = '{2}' AND \"packageVersion\" = '{3}' "
-						u"AND \"value\" = '{4}' AND \"isDefault\" = {5}".format(
-							data['propertyId'],
-							data['productId'],
-							str(data['productVersion']),
-							str(data['packageVersion']),
-							value,
-							str(value in defaultValues)
-						)
-					)
-					if not valuesExist:
-						self._sql.doCommit = True
-						logger.debug2(u'doCommit set to true')
-						self._sql.insert('PRODUCT_PROPERTY_VALUE', {
-							'productId': data['productId'],
-							'productVersion': data['productVersion'],
-							'packageVersion': data['packageVersion'],
-							'propertyId': data['propertyId'],
-							'value': value,
-							'isDefault': (value in defaultValues)
-							}
-						)
-				finally:
-					self._sql.doCommit = True
-					logger.debug2(u'doCommit set to true')
-
-
 
 class PostgresBackendObjectModificationTracker(SQLBackendObjectModificationTracker):
 	def __init__(self, **kwargs):
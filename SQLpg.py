@@ -24,7 +24,11 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 @license: GNU Affero GPL version 3
 """
 
+import datetime
+import inspect
+import os
 import time
+from contextlib import contextmanager
 from hashlib import md5
 from twisted.conch.ssh import keys
 
@@ -35,6 +39,18 @@ from OPSI.Backend.Backend import *
 
 logger = Logger()
 
+# Parsed hardware audit configs by config file: (mtime, config)
+_auditHardwareConfigCache = {}
+# Columns needed to create objects by (class, attributes, types)
+_projectionCache = {}
+# Generated codecs by class and by (class, columns)
+_encoderCache = {}
+_decoderCache = {}
+# Keys of toHash() by class
+_hashKeysCache = {}
+# Verified modules signatures by modules file: (md5 of the file, valid)
+_modulesSignatureCache = {}
+
 
 class SQL(object):
 
@@ -45,7 +61,7 @@ class SQL(object):
 	ESCAPED_UNDERSCORE = "\\_"
 	ESCAPED_PERCENT    = "\\%"
 	ESCAPED_ASTERISK   = "\\*"
-	doCommit = True
+	LIKE_OPERATOR      = "LIKE"
 
 	def __init__(self, **kwargs):
 		pass
@@ -59,6 +75,9 @@ class SQL(object):
 	def getSet(self, query):
 		return []
 
+	def getTuples(self, query):
+		return ([], [])
+
 	def getRow(self, query):
 		return {}
 
@@ -74,9 +93,86 @@ class SQL(object):
 	def getTables(self):
 		return {}
 
+	def getSchema(self):
+		return {}
+
 	def execute(self, query, conn=None, cursor=None):
 		return None
 
+	def executeBatch(self, queries):
+		for query in queries:
+			self.execute(query)
+
+	@contextmanager
+	def transaction(self, isolationLevel=None):
+		yield
+
+	def runTransaction(self, function, *args, **kwargs):
+		kwargs.pop('isolationLevel', None)
+		return function(*args, **kwargs)
+
+	def batch(self):
+		return QueryBatch(self)
+
+	def _toSqlValue(self, value):
+		if value is None:
+			return u"NULL"
+		elif type(value) is bool:
+			if value:
+				return u"true"
+			return u"false"
+		elif type(value) in (float, long, int):
+			return u"{0}".format(value)
+		elif type(value) is str:
+			return u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value.decode("utf-8"))))
+		return u"\'{0}\'".format(self.escapeApostrophe(self.escapeBackslash(value)))
+
+	def arrayLiteral(self, values):
+		"""
+		Creates an untyped array literal out of the given values.
+		Postgres resolves it to the array type of the column it is
+		compared to, so it can be used with any column type.
+		"""
+		elements = []
+		for value in values:
+			if type(value) is bool:
+				value = value and u'true' or u'false'
+			elif type(value) is str:
+				value = value.decode("utf-8")
+			else:
+				value = forceUnicode(value)
+			elements.append(u'"{0}"'.format(value.replace(u'\\', u'\\\\').replace(u'"', u'\\"')))
+		return u"'{{{0}}}'".format(self.escapeApostrophe(self.escapeBackslash(u','.join(elements))))
+
+	def _insertQuery(self, table, valueHash):
+		colNames = []
+		values = []
+		for (key, value) in valueHash.items():
+			colNames.append(u'"{0}"'.format(key))
+			values.append(self._toSqlValue(value))
+		return u'INSERT INTO "{0}" ({1}) VALUES ({2});'.format(table, ', '.join(colNames), ', '.join(values))
+
+	def _insertRowsQuery(self, table, columns, rows, suffix=u''):
+		values = []
+		for row in rows:
+			values.append(u'({0})'.format(u', '.join([self._toSqlValue(row.get(column)) for column in columns])))
+		return u'INSERT INTO "{0}" ({1}) VALUES {2}{3};'.format(
+			table, u', '.join([u'"{0}"'.format(column) for column in columns]), u', '.join(values), suffix
+		)
+
+	def _updateQuery(self, table, where, valueHash, updateWhereNone=False):
+		if not valueHash:
+			raise BackendBadValueError(u"No values given")
+		query = []
+		for (key, value) in valueHash.items():
+			if value is None and not updateWhereNone:
+				continue
+			query.append(u'"{0}" = {1}'.format(key, self._toSqlValue(value)))
+		return u'UPDATE "{0}" SET {1} WHERE {2};'.format(table, ', '.join(query), where)
+
+	def _deleteQuery(self, table, where):
+		return u'DELETE FROM "{0}" WHERE {1};'.format(table, where)
+
 	def query(self, query, conn=None, cursor=None):
 		return self.execute(query)
 
@@ -99,6 +195,42 @@ class SQL(object):
 		return string.replace('*', self.ESCAPED_ASTERISK)
 
 
+class QueryBatch(object):
+	"""
+	Collects the statements of one logical operation.
+
+	Nothing is sent to the database before flush() is called. The SQL
+	implementation then sends all statements at once and commits them
+	together, so a multi statement write costs a single round trip.
+	"""
+
+	def __init__(self, sql):
+		self._sql = sql
+		self._queries = []
+
+	def __len__(self):
+		return len(self._queries)
+
+	def execute(self, query):
+		query = query.strip()
+		if not query.endswith(u';'):
+			query += u';'
+		self._queries.append(query)
+
+	def insert(self, table, valueHash):
+		self._queries.append(self._sql._insertQuery(table, valueHash))
+
+	def update(self, table, where, valueHash, updateWhereNone=False):
+		self._queries.append(self._sql._updateQuery(table, where, valueHash, updateWhereNone))
+
+	def delete(self, table, where):
+		self._queries.append(self._sql._deleteQuery(table, where))
+
+	def flush(self):
+		(queries, self._queries) = (self._queries, [])
+		return self._sql.executeBatch(queries)
+
+
 class SQLBackendObjectModificationTracker(BackendModificationListener):
 	def __init__(self, **kwargs):
 		BackendModificationListener.__init__(self)
@@ -169,6 +301,82 @@ class SQLBackendObjectModificationTracker(BackendModificationListener):
 class SQLBackend(ConfigDataBackend):
 
 	OPERATOR_IN_CONDITION_PATTERN = re.compile('^\s*([>=<]+)\s*(\d\.?\d*)')
+	# Attributes stored as jsonb list
+	JSON_LIST_ATTRIBUTES = ('values',)
+	# Spellings of column types in opsihwaudit.conf and the names the
+	# catalog reports for them
+	COLUMN_TYPE_ALIASES = (
+		(re.compile(u'^int(eger|4)?$'), u'integer'),
+		(re.compile(u'^int8$'), u'bigint'),
+		(re.compile(u'^int2$'), u'smallint'),
+		(re.compile(u'^(float8?|double)$'), u'double precision'),
+		(re.compile(u'^bool$'), u'boolean'),
+		(re.compile(u'^varchar\('), u'character varying('),
+		(re.compile(u'^char\('), u'character('),
+		(re.compile(u'^timestamp$'), u'timestamp without time zone'),
+	)
+	# Text columns searched with wildcards, indexed with pg_trgm if available.
+	# Wildcard searches on them are case insensitive.
+	TRIGRAM_INDEXES = (
+		('HOST', 'hostId'),
+		('HOST', 'description'),
+		('HOST', 'inventoryNumber'),
+		('SOFTWARE', 'name'),
+	)
+	# Attributes productOnClient_getCounts can group and filter by
+	PRODUCT_ON_CLIENT_COUNT_ATTRIBUTES = (
+		'productId', 'clientId', 'productType', 'targetConfiguration',
+		'installationStatus', 'actionRequest', 'actionProgress', 'actionResult',
+		'lastAction', 'productVersion', 'packageVersion', 'groupId', 'depotId'
+	)
+	# Filter keys controlling paging instead of filtering
+	PAGING_KEYS = ('limit', 'after', 'orderBy')
+	# Unique keys pages are ordered by unless orderBy is given
+	TABLE_KEYS = {
+		'HOST': ('hostId',),
+		'CONFIG': ('configId',),
+		'CONFIG_STATE': ('configId', 'objectId'),
+		'PRODUCT': ('productId', 'productVersion', 'packageVersion'),
+		'PRODUCT_PROPERTY': ('productId', 'productVersion', 'packageVersion', 'propertyId'),
+		'PRODUCT_DEPENDENCY': ('productId', 'productVersion', 'packageVersion', 'productAction', 'requiredProductId'),
+		'PRODUCT_ON_DEPOT': ('productId', 'depotId'),
+		'PRODUCT_ON_CLIENT': ('productId', 'clientId'),
+		'PRODUCT_PROPERTY_STATE': ('productId', 'propertyId', 'objectId'),
+		'GROUP': ('type', 'groupId'),
+		'OBJECT_TO_GROUP': ('groupType', 'groupId', 'objectId'),
+		'LICENSE_CONTRACT': ('licenseContractId',),
+		'SOFTWARE_LICENSE': ('softwareLicenseId',),
+		'LICENSE_POOL': ('licensePoolId',),
+		'SOFTWARE_LICENSE_TO_LICENSE_POOL': ('softwareLicenseId', 'licensePoolId'),
+		'LICENSE_ON_CLIENT': ('softwareLicenseId', 'licensePoolId', 'clientId'),
+		'SOFTWARE': ('name', 'version', 'subVersion', 'language', 'architecture'),
+		'AUDIT_SOFTWARE_TO_LICENSE_POOL': ('name', 'version', 'subVersion', 'language', 'architecture'),
+		'SOFTWARE_CONFIG': ('clientId', 'name', 'version', 'subVersion', 'language', 'architecture'),
+		'BOOT_CONFIGURATION': ('name', 'clientId'),
+	}
+	# Tables with a surrogate primary key get an index on their key
+	KEYSET_INDEXES = ('CONFIG_STATE', 'PRODUCT_PROPERTY_STATE', 'OBJECT_TO_GROUP', 'LICENSE_ON_CLIENT', 'SOFTWARE_CONFIG')
+	MODULES_FILE = u'/etc/opsi/modules'
+	# Unique key of product property values, md5 keeps long values out
+	# of the index and NULL is indexed as ''
+	PRODUCT_PROPERTY_VALUE_KEY = u'"productId", "productVersion", "packageVersion", "propertyId", (COALESCE(md5("value"), \'\'))'
+	# Summary tables kept up to date by triggers and the trigger
+	# functions maintaining them
+	SUMMARY_TABLES = ('PRODUCT_ON_CLIENT_SUMMARY', 'HOST_SUMMARY', 'CLIENT_DEPOT_SUMMARY')
+	SUMMARY_FUNCTIONS = (
+		'"product_on_client_summary"()', '"host_summary"()', '"client_depot_summary"()',
+		'"client_depot_summary_default"()', '"client_depot_summary_add"(varchar, integer)'
+	)
+	# Clients per depot: the depots of the clientconfig.depot.id config
+	# states and the default depot for the remaining clients
+	CLIENT_DEPOT_COUNT_QUERY = u'''SELECT "depotId", sum("count")::integer AS "count" FROM (
+			SELECT "values"->>0 AS "depotId", count(*) AS "count" FROM "CONFIG_STATE"
+				WHERE "configId" = 'clientconfig.depot.id' AND "values"->>0 IS NOT NULL group by "values"->>0
+			UNION ALL
+			SELECT (SELECT "value" FROM "CONFIG_VALUE" WHERE "configId" = 'clientconfig.depot.id' AND "isDefault" LIMIT 1),
+				(SELECT count(*) FROM "HOST" WHERE "type" = 'OpsiClient') - (SELECT count(*) FROM "CONFIG_STATE"
+					WHERE "configId" = 'clientconfig.depot.id' AND "values"->>0 IS NOT NULL)
+		) AS "clients" WHERE "depotId" IS NOT NULL group by "depotId" HAVING sum("count") <> 0'''
 
 	def __init__(self, **kwargs):
 		self._name = 'sql'
@@ -176,8 +384,39 @@ class SQLBackend(ConfigDataBackend):
 		ConfigDataBackend.__init__(self, **kwargs)
 
 		self._sql = None
-		self._auditHardwareConfig = {}
-		self._setAuditHardwareConfig(self.auditHardware_getConfig())
+		# Parsed on first use
+		self._auditHardwareConfig = None
+		self._summaryTables = False
+
+		for (option, value) in kwargs.items():
+			option = option.lower()
+			if option == 'summarytables':
+				self._summaryTables = forceBool(value)
+
+	def _getAuditHardwareConfig(self):
+		if self._auditHardwareConfig is None:
+			self._setAuditHardwareConfig(self._loadAuditHardwareConfig())
+		return self._auditHardwareConfig
+
+	def _loadAuditHardwareConfig(self):
+		"""
+		Returns the parsed hardware audit config. It is parsed once per
+		process and parsed again only if the config file changed.
+		"""
+		configFile = getattr(self, '_auditHardwareConfigFile', None)
+		try:
+			mtime = os.path.getmtime(configFile)
+		except Exception:
+			mtime = None
+		cached = _auditHardwareConfigCache.get(configFile)
+		if cached and mtime is not None and cached[0] == mtime:
+			return cached[1]
+		start = time.time()
+		config = self.auditHardware_getConfig()
+		logger.debug(u"Parsed hardware audit config in %0.3f seconds" % (time.time() - start))
+		if mtime is not None:
+			_auditHardwareConfigCache[configFile] = (mtime, config)
+		return config
 
 	def _setAuditHardwareConfig(self, config):
 		self._auditHardwareConfig = {}
@@ -190,9 +429,9 @@ class SQLBackend(ConfigDataBackend):
 					'Scope': value["Scope"]
 				}
 
-	def _filterToSql(self, filter={}):
+	def _filterToSql(self, filter={}, table=None):
 		"""
-		Creates a SQL condition out of the given filter.
+		Creates a SQL condition out of the given filter on table.
 		"""
 		condition = []
 		for (key, values) in filter.items():
@@ -202,39 +441,78 @@ class SQLBackend(ConfigDataBackend):
 			if not values:
 				continue
 
+			if key in self.JSON_LIST_ATTRIBUTES:
+				condition.append(u' or '.join([self._jsonListConditionToSql(key, value) for value in values]))
+				continue
+
+			# Plain values are matched with a single array comparison,
+			# wildcards, operators and NULL get a branch of their own
+			plain = []
 			tmp = []
 			for value in values:
-				if type(value) is bool:
-					if value:
-						tmp.append(u'"{0}" = \'true\''.format(key))
-					else:
-						tmp.append(u'"{0}" = \'false\''.format(key))
-				elif type(value) in (float, long, int):
-					tmp.append(u'"{0}" = {1}'.format(key, value))
-				elif value is None:
+				if value is None:
 					tmp.append(u'"{0}" is NULL'.format(key))
+				elif type(value) in (bool, float, long, int):
+					plain.append(value)
 				else:
-					#value = value.replace(self._sql.ESCAPED_ASTERISK, u'\uffff')
-					value = self._sql.escapeApostrophe(self._sql.escapeBackslash(value))
 					match = self.OPERATOR_IN_CONDITION_PATTERN.search(value)
 					if match:
-						operator = match.group(1)
-						value = match.group(2)
-						value = value.replace(u'\uffff', self._sql.ESCAPED_ASTERISK)
-						tmp.append(u'"%s" %s %s' % (key, operator, forceUnicode(value)))
+						tmp.append(u'"%s" %s %s' % (key, match.group(1), forceUnicode(match.group(2))))
+					elif value and not value.replace('*', ''):
+						tmp.append(u'"{0}" is not NULL'.format(key))
+					elif '*' in value:
+						value = self._sql.escapeApostrophe(self._sql.escapeBackslash(value))
+						value = self._sql.escapeUnderscore(self._sql.escapePercent(value)).replace('*', '%')
+						tmp.append(u"\"{0}\" {1} '{2}'".format(key, self._likeOperator(table, key), forceUnicode(value)))
 					else:
-						if '*' in value:
-							operator = 'LIKE'
-							value = self._sql.escapeUnderscore(self._sql.escapePercent(value)).replace('*', '%')
-						else:
-							operator = '='
-
-						value = value.replace(u'\uffff', self._sql.ESCAPED_ASTERISK)
-						tmp.append(u"\"{0}\" {1} '{2}'".format(key, operator, forceUnicode(value)))
+						plain.append(value)
+
+			if len(plain) == 1:
+				tmp.insert(0, u'"{0}" = {1}'.format(key, self._filterValueToSql(plain[0])))
+			elif plain:
+				tmp.insert(0, u'"{0}" = ANY({1})'.format(key, self._sql.arrayLiteral(plain)))
 			condition.append(u' or '.join(tmp))
 		return u' and '.join([u'({0})'.format(c) for c in condition])
 
-	def _createQuery(self, table, attributes=[], filter={}):
+	def _likeOperator(self, table, column):
+		if (table, column) in self.TRIGRAM_INDEXES:
+			return u'ILIKE'
+		return self._sql.LIKE_OPERATOR
+
+	def _filterValueToSql(self, value):
+		if type(value) is bool:
+			if value:
+				return u"'true'"
+			return u"'false'"
+		elif type(value) in (float, long, int):
+			return u"{0}".format(value)
+		return u"'{0}'".format(self._sql.escapeApostrophe(self._sql.escapeBackslash(forceUnicode(value))))
+
+	def _jsonListConditionToSql(self, key, value):
+		"""
+		Creates a condition matching a jsonb list which contains the
+		given value. Wildcards are matched against the list elements.
+		"""
+		if value is None:
+			return u'"{0}" is NULL'.format(key)
+		if isinstance(value, basestring) and '*' in value:
+			value = self._sql.escapeApostrophe(self._sql.escapeBackslash(value))
+			value = self._sql.escapeUnderscore(self._sql.escapePercent(value)).replace('*', '%')
+			return u"EXISTS (SELECT 1 FROM jsonb_array_elements_text(\"{0}\") AS element WHERE element {1} '{2}')".format(key, self._sql.LIKE_OPERATOR, value)
+		value = self._sql.escapeApostrophe(self._sql.escapeBackslash(json.dumps([value])))
+		return u"\"{0}\" @> '{1}'::jsonb".format(key, value)
+
+	def _existsCondition(self, table, outerTable, joinColumn, filter):
+		"""
+		Creates a condition which matches rows of outerTable referenced
+		by a row of table matching the filter. Both tables are joined
+		over joinColumn.
+		"""
+		return u'EXISTS (SELECT 1 FROM "{0}" WHERE "{0}"."{2}" = "{1}"."{2}" AND {3})'.format(
+			table, outerTable, joinColumn, self._filterToSql(filter, table)
+		)
+
+	def _createQuery(self, table, attributes=[], filter={}, conditions=[]):
 		select = u','.join(
 			[u'"{0}"'.format(attribute) for attribute in attributes]
 		)
@@ -242,26 +520,134 @@ class SQLBackend(ConfigDataBackend):
 		if not select:
 			select = u'*'
 
-		where = self._filterToSql(filter)
+		filter = dict(filter)
+		paging = {}
+		for key in self.PAGING_KEYS:
+			if key in filter:
+				paging[key] = filter.pop(key)
+
+		where = [self._filterToSql(filter, table)]
+		where.extend(conditions)
+		(pagingCondition, pagingClause) = self._pagingToSql(table, paging)
+		where.append(pagingCondition)
+		where = u' and '.join([condition for condition in where if condition])
 #		query = u''
 		if where:
 			query = u'select %s from "%s" where %s' % (select, table, where)
 		else:
 			query = u'select %s from "%s"' % (select, table)
+		if pagingClause:
+			query += pagingClause
 		logger.debug(u"Created query: '%s'" % query)
 		return query
 
-	def _adjustAttributes(self, objectClass, attributes, filter):
+	def _testFilterAndAttributes(self, Class, attributes, **filter):
+		# Paging keys are no object attributes
+		for key in self.PAGING_KEYS:
+			filter.pop(key, None)
+		return ConfigDataBackend._testFilterAndAttributes(self, Class, attributes, **filter)
+
+	def _checkNoPaging(self, filter):
+		# Hardware audit data is spread over one table per class
+		for key in self.PAGING_KEYS:
+			if filter.get(key):
+				raise BackendBadValueError(u"Paging is not supported for hardware audit data")
+
+	def _pagingToSql(self, table, paging):
+		"""
+		Compiles the paging filter keys into a keyset condition and an
+		order by / limit clause.
+
+		Pages are ordered by orderBy followed by the key columns of the
+		table which are not part of orderBy, so the order is unique even
+		if orderBy is not. NULL sorts after every value. after holds the
+		values of these columns of the last row of the previous page,
+		rows up to and including it are skipped with a condition on the
+		ordered columns, so deep pages cost the same as the first.
+		"""
+		if not paging.get('limit') and not paging.get('after') and not paging.get('orderBy'):
+			return (u'', u'')
+
+		keys = self.TABLE_KEYS.get(table)
+		if not keys:
+			raise BackendBadValueError(u"No key known for table '%s', it can not be paged" % table)
+		orderBy = forceUnicodeList(paging.get('orderBy') or [])
+		orderBy.extend([key for key in keys if not key in orderBy])
+		for column in orderBy:
+			if '"' in column:
+				raise BackendBadValueError(u"Bad orderBy column '%s'" % column)
+
+		condition = u''
+		after = paging.get('after')
+		if after is not None:
+			after = forceList(after)
+			if len(after) != len(orderBy):
+				raise BackendBadValueError(u"after needs a value for each of %s" % orderBy)
+			condition = self._keysetConditionToSql(orderBy, after, keys)
+
+		clause = u' order by {0}'.format(u', '.join([
+			u'"{0}"'.format(column) if column in keys else u'"{0}" nulls last'.format(column)
+			for column in orderBy
+		]))
+		if paging.get('limit'):
+			limit = forceInt(paging['limit'])
+			if limit < 1:
+				raise BackendBadValueError(u"Bad limit %d" % limit)
+			clause += u' limit {0}'.format(limit)
+		return (condition, clause)
+
+	def _keysetConditionToSql(self, columns, values, keys):
+		"""
+		Creates the condition matching the rows ordered after values.
+		The trailing key columns are never NULL and are compared as one
+		row, the columns before them are compared one by one, so a NULL
+		in values or in a row does not make the condition NULL.
+		"""
+		tail = len(columns)
+		while tail > 0 and columns[tail - 1] in keys and values[tail - 1] is not None:
+			tail -= 1
+		condition = None
+		if tail < len(columns):
+			condition = u'({0}) > ({1})'.format(
+				u', '.join([u'"{0}"'.format(column) for column in columns[tail:]]),
+				u', '.join([self._filterValueToSql(value) for value in values[tail:]])
+			)
+		for index in reversed(range(tail)):
+			column = columns[index]
+			value = values[index]
+			if value is None:
+				# Only NULLs follow NULL
+				if condition:
+					condition = u'("{0}" is NULL and {1})'.format(column, condition)
+				else:
+					condition = u'false'
+				continue
+			value = self._filterValueToSql(value)
+			alternatives = [u'"{0}" > {1}'.format(column, value)]
+			if not column in keys:
+				alternatives.append(u'"{0}" is NULL'.format(column))
+			if condition:
+				alternatives.append(u'("{0}" = {1} and {2})'.format(column, value, condition))
+			condition = u'({0})'.format(u' or '.join(alternatives))
+		return condition
+
+	def _adjustAttributes(self, objectClass, attributes, filter, hashesOnly=False):
+		"""
+		Returns the columns to select and the filter to apply for the
+		requested attributes. With hashesOnly the columns are those of
+		the hashes, which need no objects to be created.
+		"""
 		if not attributes:
 			attributes = []
 		# Work on copies of attributes and filter!
-		# TODO: horribly slow code :<
 		newAttributes = forceUnicodeList(attributes)
 		newFilter = forceDict(filter)
 		id = self._objectAttributeToDatabaseAttribute(objectClass, 'id')
 		if 'id' in newFilter:
 			newFilter[id] = newFilter['id']
 			del newFilter['id']
+		if newFilter.get('orderBy'):
+			newFilter['orderBy'] = [id if column == 'id' else column for column in forceUnicodeList(newFilter['orderBy'])]
 		if 'id' in newAttributes:
 			newAttributes.remove('id')
 			newAttributes.append(id)
@@ -270,17 +656,100 @@ class SQLBackend(ConfigDataBackend):
 				if objectClass.__name__ == oc:
 					newFilter['type'] = forceList(filter['type']).append(objectClass.subClasses.values())
 		if newAttributes:
-			if issubclass(objectClass, Entity) and not 'type' in newAttributes:
-				newAttributes.append('type')
+			newAttributes = self._projection(objectClass, newAttributes, filter.get('type'), hashesOnly)
+		return (newAttributes, newFilter)
+
+	def _projection(self, objectClass, attributes, types=None, hashesOnly=False):
+		"""
+		Returns the columns needed to create objects of objectClass
+		holding the given attributes: the attributes, the type of
+		entities and the mandatory constructor args of every class the
+		objects can be of. A type filter narrows down these classes.
+
+		Hashes only need the mandatory constructor args of objectClass,
+		which are the key of its objects.
+		"""
+		types = tuple(sorted(forceUnicodeList(types or [])))
+		key = (objectClass, tuple(attributes), types, hashesOnly)
+		columns = _projectionCache.get(key)
+		if columns is None:
+			id = self._objectAttributeToDatabaseAttribute(objectClass, 'id')
+			columns = [id if attribute == 'id' else attribute for attribute in attributes]
+			if issubclass(objectClass, Entity) and not 'type' in columns:
+				columns.append('type')
 			objectClasses = [objectClass]
-			objectClasses.extend(objectClass.subClasses.values())
+			if not hashesOnly:
+				objectClasses.extend(objectClass.subClasses.values())
+			if types and not hashesOnly and not [t for t in types if '*' in t]:
+				# A class or one of its base classes is filtered for
+				narrowed = [oc for oc in objectClasses if [c for c in oc.__mro__ if c.__name__ in types]]
+				if narrowed:
+					objectClasses = narrowed
 			for oc in objectClasses:
 				for arg in mandatoryConstructorArgs(oc):
 					if arg == 'id':
 						arg = id
-					if not arg in newAttributes:
-						newAttributes.append(arg)
-		return (newAttributes, newFilter)
+					if not arg in columns:
+						columns.append(arg)
+			_projectionCache[key] = columns
+		return list(columns)
+
+	def _getHashes(self, objectClass, table, attributes, filter):
+		(attributes, filter) = self._adjustAttributes(objectClass, attributes, filter, hashesOnly=True)
+		result = self._sql.getSet(self._createQuery(table, attributes, filter))
+		for res in result:
+			self._adjustResult(objectClass, res)
+		return self._toOpsiHashes(result, objectClass)
+
+	def _toOpsiHashes(self, result, objectClass):
+		return [self._toOpsiHash(objectClass, res) for res in result]
+
+	def _toOpsiHash(self, objectClass, res):
+		"""
+		Turns a result row into the hash toHash() of the object would
+		return, without creating the object. Attributes which were not
+		selected are None like in objects of a projection.
+		"""
+		if issubclass(objectClass, Entity) and res.get('type') != objectClass.__name__:
+			objectClass = objectClass.subClasses.get(res.get('type'), objectClass)
+		keys = self._hashKeys(objectClass)
+		if keys is None:
+			return objectClass.fromHash(res).toHash()
+		hash = {}
+		for key in keys:
+			value = res.get(key)
+			if isinstance(value, datetime.datetime):
+				value = forceOpsiTimestamp(value)
+			hash[key] = value
+		hash['type'] = objectClass.__name__
+		# Converted by the constructors, stored as text
+		if hash.get('licenseRequired') is not None:
+			hash['licenseRequired'] = forceBool(hash['licenseRequired'])
+		if objectClass.__name__ in ('BoolConfig', 'BoolProductProperty'):
+			for key in ('possibleValues', 'defaultValues'):
+				if hash.get(key) is not None:
+					hash[key] = forceBoolList(hash[key])
+		return hash
+
+	def _hashKeys(self, objectClass):
+		"""
+		Returns the keys of toHash() of objects of objectClass, which are
+		the constructor args of the class and its base classes. Surrogate
+		key columns are no constructor args, so they are left out.
+		None if the class has variable constructor args.
+		"""
+		if objectClass in _hashKeysCache:
+			return _hashKeysCache[objectClass]
+		keys = None
+		if self._constructorArgs(objectClass) is not None:
+			keys = []
+			for oc in objectClass.__mro__:
+				for arg in self._constructorArgs(oc) or []:
+					if not arg in keys:
+						keys.append(arg)
+			keys.append('type')
+		_hashKeysCache[objectClass] = keys
+		return keys
 
 	def _adjustResult(self, objectClass, result):
 		id = self._objectAttributeToDatabaseAttribute(objectClass, 'id')
@@ -290,6 +759,99 @@ class SQLBackend(ConfigDataBackend):
 		return result
 
 	def _objectToDatabaseHash(self, object):
+		encoder = _encoderCache.get(object.__class__)
+		if encoder is None:
+			encoder = _encoderCache[object.__class__] = self._createObjectEncoder(object.__class__)
+		return encoder(object)
+
+	def _constructorArgs(self, objectClass):
+		"""
+		Returns the constructor args of objectClass or None if they
+		can not be passed by name ( e.g. **kwargs of audit hardware ).
+		"""
+		try:
+			spec = inspect.getargspec(objectClass.__init__)
+		except TypeError:
+			return None
+		if spec.keywords or spec.varargs:
+			return None
+		return spec.args[1:]
+
+	def _createObjectEncoder(self, objectClass):
+		"""
+		Generates a function returning the database hash of an object
+		by reading its attributes directly, which saves the toHash()
+		copy and renaming it key by key. Classes with own toHash() or
+		variable constructor args use _genericObjectToDatabaseHash.
+		"""
+		args = self._constructorArgs(objectClass)
+		definedIn = [c for c in objectClass.__mro__ if 'toHash' in c.__dict__]
+		if args is None or not definedIn or definedIn[0].__name__ != 'BaseObject':
+			return self._genericObjectToDatabaseHash
+		items = []
+		for arg in args:
+			if arg == 'actionSequence' and issubclass(objectClass, ProductOnClient):
+				continue
+			items.append(u"'%s': obj.%s" % (self._objectAttributeToDatabaseAttribute(objectClass, arg), arg))
+		if not issubclass(objectClass, Relationship):
+			items.append(u"'type': '%s'" % objectClass.__name__)
+		source = u'def encode(obj):\n\treturn {%s}\n' % u', '.join(items)
+		namespace = {}
+		exec compile(source, '<encoder %s>' % objectClass.__name__, 'exec') in namespace
+		return namespace['encode']
+
+	def _rowDecoder(self, objectClass, columns):
+		key = (objectClass, tuple(columns))
+		decoder = _decoderCache.get(key)
+		if decoder is None:
+			decoder = _decoderCache[key] = self._createRowDecoder(objectClass, columns)
+		return decoder
+
+	def _createRowDecoder(self, objectClass, columns):
+		"""
+		Generates a function creating an object out of a row tuple with
+		the given columns. Row values are passed to the constructor as
+		keyword arguments, entities are dispatched on their type column.
+		Unknown types and classes with variable constructor args are
+		created by fromHash.
+		"""
+		id = self._objectAttributeToDatabaseAttribute(objectClass, 'id')
+		attributes = [u'id' if column == id else column for column in columns]
+
+		def fallback(row):
+			return objectClass.fromHash(dict(zip(attributes, row)))
+
+		namespace = {'fallback': fallback}
+		source = []
+		decoders = []
+		objectClasses = [objectClass]
+		objectClasses.extend(objectClass.subClasses.values())
+		for oc in objectClasses:
+			args = self._constructorArgs(oc)
+			if args is None:
+				continue
+			namespace[oc.__name__] = oc
+			kwargs = [u'%s=row[%d]' % (arg, attributes.index(arg)) for arg in args if arg in attributes]
+			source.append(u'def decode%s(row):\n\treturn %s(%s)\n' % (oc.__name__, oc.__name__, u', '.join(kwargs)))
+			decoders.append(u"'%s': decode%s" % (oc.__name__, oc.__name__))
+
+		if issubclass(objectClass, Entity) and 'type' in attributes:
+			source.append(u'decoders = {%s}\n' % u', '.join(decoders))
+			source.append(u'def decode(row):\n\treturn decoders.get(row[%d], fallback)(row)\n' % attributes.index('type'))
+		elif not issubclass(objectClass, Entity) and decoders:
+			source.append(u'decode = decode%s\n' % objectClass.__name__)
+		else:
+			return fallback
+		exec compile(u''.join(source), '<decoder %s>' % objectClass.__name__, 'exec') in namespace
+		return namespace['decode']
+
+	def _getObjects(self, objectClass, table, attributes, filter, conditions=[]):
+		(attributes, filter) = self._adjustAttributes(objectClass, attributes, filter)
+		(columns, rows) = self._sql.getTuples(self._createQuery(table, attributes, filter, conditions))
+		decode = self._rowDecoder(objectClass, columns)
+		return [decode(row) for row in rows]
+
+	def _genericObjectToDatabaseHash(self, object):
 		hash = object.toHash()
 		if object.getType() == 'ProductOnClient':
 			try:
@@ -359,10 +921,59 @@ class SQLBackend(ConfigDataBackend):
 			else:
 				condition.append(u"\"{0}\" = '{1}'".format(arg, self._sql.escapeApostrophe(self._sql.escapeBackslash(value))))
 		if isinstance(object, HostGroup) or isinstance(object, ProductGroup):
-			condition.append(u"'type' = '{0}'".format(object.getType()))
+			condition.append(u"\"type\" = '{0}'".format(object.getType()))
 
 		return ' and '.join(condition)
 
+	def _uniqueConditions(self, objects):
+		"""
+		Creates conditions matching all of the given objects, one for
+		each set of key columns. Single column keys are matched with an
+		array, multi column keys with a VALUES list.
+
+		:param objects: The objects to create the conditions for.
+		:returntype: list
+		"""
+		keys = {}
+		for object in objects:
+			columns = []
+			values = []
+			for arg in mandatoryConstructorArgs(object.__class__):
+				value = getattr(object, arg)
+				if value is None:
+					continue
+				columns.append(self._objectAttributeToDatabaseAttribute(object.__class__, arg))
+				values.append(value)
+			if isinstance(object, HostGroup) or isinstance(object, ProductGroup):
+				columns.append('type')
+				values.append(object.getType())
+			keys.setdefault(tuple(columns), []).append(values)
+
+		conditions = []
+		for (columns, rows) in keys.items():
+			if not columns:
+				continue
+			if len(columns) == 1:
+				conditions.append(u'"{0}" = ANY({1})'.format(columns[0], self._sql.arrayLiteral([row[0] for row in rows])))
+				continue
+			conditions.append(u'({0}) IN (VALUES {1})'.format(
+				u', '.join([u'"{0}"'.format(column) for column in columns]),
+				u', '.join([u'({0})'.format(u', '.join([self._sql._toSqlValue(value) for value in row])) for row in rows])
+			))
+		return conditions
+
+	def _deleteObjects(self, tables, objects):
+		"""
+		Deletes the given objects from the given tables in one transaction.
+		"""
+		if not objects:
+			return
+		batch = self._sql.batch()
+		for where in self._uniqueConditions(objects):
+			for table in forceList(tables):
+				batch.delete(table, where)
+		batch.flush()
+
 	def _objectExists(self, table, object):
 		query = 'select * from "%s" where %s' % (table, self._uniqueCondition(object))
 		return bool(self._sql.getRow(query))
@@ -385,6 +996,7 @@ class SQLBackend(ConfigDataBackend):
 					logger.error(e)
 					done = False
 					errors += 1
+		self._dropSummaryFunctions()
 
 	def backend_createBase(self):
 		ConfigDataBackend.backend_createBase(self)
@@ -433,7 +1045,7 @@ class SQLBackend(ConfigDataBackend):
 					"config_state_id"  ''' + self._sql.AUTOINCREMENT + ''',
 					"configId" varchar(200) NOT NULL,
 					"objectId" varchar(255) NOT NULL,
-					"values" text,
+					"values" jsonb,
 					PRIMARY KEY ("config_state_id")
 				) %s;
 				''' % self._sql.getTableCreationOptions('CONFIG_STATE')
@@ -441,6 +1053,9 @@ class SQLBackend(ConfigDataBackend):
 			self._sql.execute(table)
 			self._sql.execute('CREATE INDEX "index_config_state_configId" on "CONFIG_STATE" ("configId");')
 			self._sql.execute('CREATE INDEX "index_config_state_objectId" on "CONFIG_STATE" ("objectId");')
+			self._sql.execute('CREATE INDEX "index_config_state_values" on "CONFIG_STATE" USING gin ("values" jsonb_path_ops);')
+		else:
+			self._convertValuesToJsonb('CONFIG_STATE', 'index_config_state_values')
 
 		if not 'PRODUCT' in tables.keys():
 			logger.debug(u'Creating table PRODUCT')
@@ -535,6 +1150,7 @@ class SQLBackend(ConfigDataBackend):
 				''' % self._sql.getTableCreationOptions('PRODUCT_PROPERTY_VALUE')
 			logger.debug(table)
 			self._sql.execute(table)
+		self._createProductPropertyValueIndex()
 
 		if not 'PRODUCT_DEPENDENCY' in tables.keys():
 			logger.debug(u'Creating table "PRODUCT_DEPENDENCY"')
@@ -587,13 +1203,16 @@ class SQLBackend(ConfigDataBackend):
 					"productId" varchar(255) NOT NULL,
 					"propertyId" varchar(200) NOT NULL,
 					"objectId" varchar(255) NOT NULL,
-					"values" text,
+					"values" jsonb,
 					PRIMARY KEY ("product_property_state_id")
 				) %s;
 				''' % self._sql.getTableCreationOptions('PRODUCT_PROPERTY_STATE')
 			logger.debug(table)
 			self._sql.execute(table)
 			self._sql.execute('CREATE INDEX "index_product_property_state_objectId" on "PRODUCT_PROPERTY_STATE" ("objectId");')
+			self._sql.execute('CREATE INDEX "index_product_property_state_values" on "PRODUCT_PROPERTY_STATE" USING gin ("values" jsonb_path_ops);')
+		else:
+			self._convertValuesToJsonb('PRODUCT_PROPERTY_STATE', 'index_product_property_state_values')
 
 		if not 'GROUP' in tables.keys():
 			logger.debug(u'Creating table GROUP')
@@ -805,95 +1424,368 @@ class SQLBackend(ConfigDataBackend):
 			self._sql.execute('CREATE INDEX "index_software_config_clientId" on "SOFTWARE_CONFIG" ("clientId");')
 			self._sql.execute('CREATE INDEX "index_software_config_nvsla" on "SOFTWARE_CONFIG" ("name", "version", "subVersion", "language", "architecture");')
 
+		self._createTrigramIndexes()
+		self._createKeysetIndexes()
+		self._createGroupTreeIndexes()
+
 		# Hardware audit tables
-		for (hwClass, values) in self._auditHardwareConfig.items():
-			logger.debug(u"Processing hardware class '%s'" % hwClass)
-			hardwareDeviceTableName = u'HARDWARE_DEVICE_' + hwClass
-			hardwareConfigTableName = u'HARDWARE_CONFIG_' + hwClass
-
-			hardwareDeviceTable = u'CREATE TABLE "' + hardwareDeviceTableName + '" (\n' + \
-						u'"hardware_id"  ' + self._sql.AUTOINCREMENT + ',\n'
-			hardwareConfigTable = u'CREATE TABLE "' + hardwareConfigTableName + '" (\n' + \
-						u'"config_id"  ' + self._sql.AUTOINCREMENT + ',\n' + \
-						u'"hostId" varchar(50) NOT NULL,\n' + \
-						u'"hardware_id" INTEGER NOT NULL,\n' + \
-						u'"firstseen" TIMESTAMP NOT NULL DEFAULT \'0001-01-01 00:00:00\',\n' + \
-						u'"lastseen" TIMESTAMP NOT NULL DEFAULT \'0001-01-01 00:00:00\',\n' + \
-						u'"state" SMALLINT NOT NULL,\n'
-
-			hardwareDeviceTableExists = hardwareDeviceTableName in tables.keys()
-			hardwareConfigTableExists = hardwareConfigTableName in tables.keys()
-
-			if hardwareDeviceTableExists:
-				hardwareDeviceTable = u'ALTER TABLE "' + hardwareDeviceTableName + u'"\n'
-			if hardwareConfigTableExists:
-				hardwareConfigTable = u'ALTER TABLE "' + hardwareConfigTableName + u'"\n'
-
-			hardwareDeviceValuesProcessed = 0;
-			hardwareConfigValuesProcessed = 0;
-			for (value, valueInfo) in values.items():
-				logger.debug(u"  Processing value '%s'" % value)
-				if   (valueInfo['Scope'] == 'g'):
-					if hardwareDeviceTableExists:
-						if value in tables[hardwareDeviceTableName]:
-							logger.debug2(u"Column exitst -> Change")
-							# Column exists => change
-							if not self._sql.ALTER_TABLE_CHANGE_SUPPORTED:
-								continue
-							hardwareDeviceTable += u'ALTER COLUMN "%s" TYPE %s ,\n' % (value, valueInfo['Type'])
-						else:
-							# Column does not exist => add
-							hardwareDeviceTable += u'ADD %s %s NULL,\n' % (value, valueInfo["Type"])
-					else:
-						hardwareDeviceTable += u'"%s" %s NULL,\n' % (value, valueInfo["Type"])
-					hardwareDeviceValuesProcessed += 1
-				elif (valueInfo['Scope'] == 'i'):
-					if hardwareConfigTableExists:
-						if value in tables[hardwareConfigTableName]:
-							# Column exists => change
-							if not self._sql.ALTER_TABLE_CHANGE_SUPPORTED:
-								continue
-							hardwareConfigTable += u'ALTER COLUMN "%s" TYPE %s ,\n' % (value, valueInfo['Type'])
-						else:
-							# Column does not exist => add
-							hardwareConfigTable += u'ADD %s %s NULL,\n' % (value, valueInfo['Type'])
-					else:
-						hardwareConfigTable += u'"%s" %s NULL,\n' % (value, valueInfo['Type'])
-					hardwareConfigValuesProcessed += 1
-
-			if not hardwareDeviceTableExists:
-				hardwareDeviceTable += u'PRIMARY KEY (hardware_id)\n'
-			if not hardwareConfigTableExists:
-				hardwareConfigTable += u'PRIMARY KEY (config_id)\n'
-
-			# Remove leading and trailing whitespace
-			hardwareDeviceTable = hardwareDeviceTable.strip()
-			hardwareConfigTable = hardwareConfigTable.strip()
-
-			# Remove trailing comma
-			if (hardwareDeviceTable[-1] == u','):
-				hardwareDeviceTable = hardwareDeviceTable[:-1]
-			if (hardwareConfigTable[-1] == u','):
-				hardwareConfigTable = hardwareConfigTable[:-1]
-
-			# Finish sql query
-			if hardwareDeviceTableExists:
-				hardwareDeviceTable += u' ;\n'
-			else:
-				hardwareDeviceTable += u'\n) %s;\n' % self._sql.getTableCreationOptions(hardwareDeviceTableName)
+		for migration in self._auditHardwareSchemaMigrations():
+			logger.notice(u"Migrating table %s: %s" % (migration['table'], u', '.join(
+				[u'%s %s' % (change['action'], change['column']) for change in migration['changes']]
+			)))
+			logger.debug(migration['statement'])
+			self._sql.execute(migration['statement'])
+
+		if self._summaryTables:
+			self._createSummaryTables()
+		elif 'PRODUCT_ON_CLIENT_SUMMARY' in tables.keys():
+			logger.notice(u"Summary tables disabled, removing them")
+			self._dropSummaryFunctions()
+			for table in self.SUMMARY_TABLES:
+				self._sql.execute(u'DROP TABLE IF EXISTS "%s";' % table)
+
+	def _createSummaryTables(self):
+		"""
+		Creates the summary tables and the triggers maintaining them
+		and fills them from the current data.
+
+		PRODUCT_ON_CLIENT_SUMMARY counts productOnClients per productId,
+		installationStatus and actionResult, HOST_SUMMARY counts hosts
+		per type and CLIENT_DEPOT_SUMMARY counts clients per depot they
+		are assigned to by a clientconfig.depot.id config state or by
+		default. Rows are deleted when their count drops to 0.
+
+		A depot config state moves its client from the default depot to
+		the depot of the state. The changes only add to the counts, so
+		the order in which the triggers of a statement deleting hosts
+		and their config states run does not matter. Changing the
+		default depot recounts CLIENT_DEPOT_SUMMARY.
+		"""
+		logger.notice(u"Creating summary tables")
+		tables = self._sql.getTables()
+		if not 'PRODUCT_ON_CLIENT_SUMMARY' in tables.keys():
+			self._sql.execute(u'''CREATE TABLE "PRODUCT_ON_CLIENT_SUMMARY" (
+					"productId" varchar(255) NOT NULL,
+					"installationStatus" varchar(16),
+					"actionResult" varchar(16),
+					"count" integer NOT NULL
+				);''')
+			self._sql.execute(u'''CREATE UNIQUE INDEX "index_product_on_client_summary" on "PRODUCT_ON_CLIENT_SUMMARY"
+				("productId", (COALESCE("installationStatus", '')), (COALESCE("actionResult", '')));''')
+		if not 'HOST_SUMMARY' in tables.keys():
+			self._sql.execute(u'''CREATE TABLE "HOST_SUMMARY" (
+					"type" varchar(30) NOT NULL,
+					"count" integer NOT NULL,
+					PRIMARY KEY ("type")
+				);''')
+		if not 'CLIENT_DEPOT_SUMMARY' in tables.keys():
+			self._sql.execute(u'''CREATE TABLE "CLIENT_DEPOT_SUMMARY" (
+					"depotId" varchar(255) NOT NULL,
+					"count" integer NOT NULL,
+					PRIMARY KEY ("depotId")
+				);''')
+
+		self._sql.execute(u'''CREATE OR REPLACE FUNCTION "product_on_client_summary"() RETURNS trigger AS $$
+			BEGIN
+				IF TG_OP IN ('UPDATE', 'DELETE') THEN
+					UPDATE "PRODUCT_ON_CLIENT_SUMMARY" SET "count" = "count" - 1
+						WHERE "productId" = OLD."productId"
+						AND COALESCE("installationStatus", '') = COALESCE(OLD."installationStatus", '')
+						AND COALESCE("actionResult", '') = COALESCE(OLD."actionResult", '');
+					DELETE FROM "PRODUCT_ON_CLIENT_SUMMARY" WHERE "count" = 0 AND "productId" = OLD."productId";
+				END IF;
+				IF TG_OP IN ('INSERT', 'UPDATE') THEN
+					INSERT INTO "PRODUCT_ON_CLIENT_SUMMARY" ("productId", "installationStatus", "actionResult", "count")
+						VALUES (NEW."productId", NEW."installationStatus", NEW."actionResult", 1)
+						ON CONFLICT ("productId", (COALESCE("installationStatus", '')), (COALESCE("actionResult", '')))
+						DO UPDATE SET "count" = "PRODUCT_ON_CLIENT_SUMMARY"."count" + 1;
+				END IF;
+				RETURN NULL;
+			END;
+			$$ LANGUAGE plpgsql;''')
+		# Adds delta to the clients of depot, NULL is the default depot
+		self._sql.execute(u'''CREATE OR REPLACE FUNCTION "client_depot_summary_add"(depot varchar, delta integer) RETURNS void AS $$
+			BEGIN
+				IF depot IS NULL THEN
+					SELECT "value" INTO depot FROM "CONFIG_VALUE" WHERE "configId" = 'clientconfig.depot.id' AND "isDefault" LIMIT 1;
+					IF depot IS NULL THEN
+						RETURN;
+					END IF;
+				END IF;
+				INSERT INTO "CLIENT_DEPOT_SUMMARY" ("depotId", "count") VALUES (depot, delta)
+					ON CONFLICT ("depotId") DO UPDATE SET "count" = "CLIENT_DEPOT_SUMMARY"."count" + delta;
+				DELETE FROM "CLIENT_DEPOT_SUMMARY" WHERE "depotId" = depot AND "count" = 0;
+			END;
+			$$ LANGUAGE plpgsql;''')
+		self._sql.execute(u'''CREATE OR REPLACE FUNCTION "host_summary"() RETURNS trigger AS $$
+			BEGIN
+				IF TG_OP IN ('UPDATE', 'DELETE') THEN
+					UPDATE "HOST_SUMMARY" SET "count" = "count" - 1 WHERE "type" = OLD."type";
+					DELETE FROM "HOST_SUMMARY" WHERE "type" = OLD."type" AND "count" = 0;
+					IF OLD."type" = 'OpsiClient' THEN
+						PERFORM "client_depot_summary_add"(NULL, -1);
+					END IF;
+				END IF;
+				IF TG_OP IN ('INSERT', 'UPDATE') THEN
+					INSERT INTO "HOST_SUMMARY" ("type", "count") VALUES (NEW."type", 1)
+						ON CONFLICT ("type") DO UPDATE SET "count" = "HOST_SUMMARY"."count" + 1;
+					IF NEW."type" = 'OpsiClient' THEN
+						PERFORM "client_depot_summary_add"(NULL, 1);
+					END IF;
+				END IF;
+				RETURN NULL;
+			END;
+			$$ LANGUAGE plpgsql;''')
+		self._sql.execute(u'''CREATE OR REPLACE FUNCTION "client_depot_summary"() RETURNS trigger AS $$
+			BEGIN
+				IF TG_OP IN ('UPDATE', 'DELETE') AND OLD."configId" = 'clientconfig.depot.id' AND OLD."values"->>0 IS NOT NULL THEN
+					PERFORM "client_depot_summary_add"(OLD."values"->>0, -1);
+					PERFORM "client_depot_summary_add"(NULL, 1);
+				END IF;
+				IF TG_OP IN ('INSERT', 'UPDATE') AND NEW."configId" = 'clientconfig.depot.id' AND NEW."values"->>0 IS NOT NULL THEN
+					PERFORM "client_depot_summary_add"(NEW."values"->>0, 1);
+					PERFORM "client_depot_summary_add"(NULL, -1);
+				END IF;
+				RETURN NULL;
+			END;
+			$$ LANGUAGE plpgsql;''')
+		self._sql.execute(u'''CREATE OR REPLACE FUNCTION "client_depot_summary_default"() RETURNS trigger AS $$
+			BEGIN
+				DELETE FROM "CLIENT_DEPOT_SUMMARY";
+				INSERT INTO "CLIENT_DEPOT_SUMMARY" ("depotId", "count") %s;
+				RETURN NULL;
+			END;
+			$$ LANGUAGE plpgsql;''' % self.CLIENT_DEPOT_COUNT_QUERY)
+
+		# Updates of other columns ( e.g. actionProgress ) do not touch the counters
+		self._sql.executeBatch([
+			u'DROP TRIGGER IF EXISTS "product_on_client_summary" ON "PRODUCT_ON_CLIENT";',
+			u'DROP TRIGGER IF EXISTS "product_on_client_summary_update" ON "PRODUCT_ON_CLIENT";',
+			u'''CREATE TRIGGER "product_on_client_summary" AFTER INSERT OR DELETE ON "PRODUCT_ON_CLIENT"
+				FOR EACH ROW EXECUTE PROCEDURE "product_on_client_summary"();''',
+			u'''CREATE TRIGGER "product_on_client_summary_update" AFTER UPDATE ON "PRODUCT_ON_CLIENT"
+				FOR EACH ROW WHEN (OLD."productId" IS DISTINCT FROM NEW."productId"
+					OR OLD."installationStatus" IS DISTINCT FROM NEW."installationStatus"
+					OR OLD."actionResult" IS DISTINCT FROM NEW."actionResult")
+				EXECUTE PROCEDURE "product_on_client_summary"();''',
+			u'DROP TRIGGER IF EXISTS "host_summary" ON "HOST";',
+			u'DROP TRIGGER IF EXISTS "host_summary_update" ON "HOST";',
+			u'''CREATE TRIGGER "host_summary" AFTER INSERT OR DELETE ON "HOST"
+				FOR EACH ROW EXECUTE PROCEDURE "host_summary"();''',
+			u'''CREATE TRIGGER "host_summary_update" AFTER UPDATE ON "HOST"
+				FOR EACH ROW WHEN (OLD."type" IS DISTINCT FROM NEW."type")
+				EXECUTE PROCEDURE "host_summary"();''',
+			u'DROP TRIGGER IF EXISTS "client_depot_summary" ON "CONFIG_STATE";',
+			u'''CREATE TRIGGER "client_depot_summary" AFTER INSERT OR UPDATE OR DELETE ON "CONFIG_STATE"
+				FOR EACH ROW EXECUTE PROCEDURE "client_depot_summary"();''',
+			u'DROP TRIGGER IF EXISTS "client_depot_summary_default" ON "CONFIG_VALUE";',
+			u'DROP TRIGGER IF EXISTS "client_depot_summary_default_delete" ON "CONFIG_VALUE";',
+			u'''CREATE TRIGGER "client_depot_summary_default" AFTER INSERT OR UPDATE ON "CONFIG_VALUE"
+				FOR EACH ROW WHEN (NEW."configId" = 'clientconfig.depot.id')
+				EXECUTE PROCEDURE "client_depot_summary_default"();''',
+			u'''CREATE TRIGGER "client_depot_summary_default_delete" AFTER DELETE ON "CONFIG_VALUE"
+				FOR EACH ROW WHEN (OLD."configId" = 'clientconfig.depot.id')
+				EXECUTE PROCEDURE "client_depot_summary_default"();''',
+		])
+		self.backend_refreshSummaryTables()
+
+	def _dropSummaryFunctions(self):
+		# Drops the triggers too
+		for function in self.SUMMARY_FUNCTIONS:
+			self._sql.execute(u'DROP FUNCTION IF EXISTS %s CASCADE;' % function)
+
+	def backend_refreshSummaryTables(self):
+		"""
+		Recounts the summary tables from the current data. The triggers
+		keep them up to date, this is only needed after changing the
+		tables with the triggers disabled.
+		"""
+		logger.info(u"Refreshing summary tables")
+		# Writers wait until the counts are complete
+		self._sql.executeBatch([
+			u'LOCK TABLE "PRODUCT_ON_CLIENT", "HOST", "CONFIG_STATE", "CONFIG_VALUE" IN SHARE MODE;',
+			u'DELETE FROM "PRODUCT_ON_CLIENT_SUMMARY";',
+			u'''INSERT INTO "PRODUCT_ON_CLIENT_SUMMARY" ("productId", "installationStatus", "actionResult", "count")
+				SELECT "productId", "installationStatus", "actionResult", count(*) FROM "PRODUCT_ON_CLIENT"
+				group by "productId", "installationStatus", "actionResult";''',
+			u'DELETE FROM "HOST_SUMMARY";',
+			u'INSERT INTO "HOST_SUMMARY" ("type", "count") SELECT "type", count(*) FROM "HOST" group by "type";',
+			u'DELETE FROM "CLIENT_DEPOT_SUMMARY";',
+			u'INSERT INTO "CLIENT_DEPOT_SUMMARY" ("depotId", "count") %s;' % self.CLIENT_DEPOT_COUNT_QUERY,
+		])
+
+	def auditHardware_getSchemaMigrations(self):
+		"""
+		Returns the changes backend_createBase would make to the hardware
+		audit tables without applying them.
 
-			if hardwareConfigTableExists:
-				hardwareConfigTable += u' ;\n'
-			else:
-				hardwareConfigTable += u'\n) %s;\n' % self._sql.getTableCreationOptions(hardwareConfigTableName)
+		Each entry holds the table, the statement and the changes
+		(column, action, currentType and type).
+
+		:returntype: list
+		"""
+		return self._auditHardwareSchemaMigrations()
+
+	def _normalizeColumnType(self, type):
+		type = u' '.join(forceUnicodeLower(type).split())
+		type = type.replace(u' (', u'(').replace(u', ', u',')
+		for (pattern, replacement) in self.COLUMN_TYPE_ALIASES:
+			type = pattern.sub(replacement, type)
+		return type
+
+	def _auditHardwareSchemaMigrations(self):
+		"""
+		Compares the hardware audit tables in the database with the
+		hardware audit config. Only missing tables and columns and
+		columns with a different type result in a statement, one per
+		table. Columns are matched case insensitively, lower case
+		columns of older versions are renamed instead of added again.
+		"""
+		schema = self._sql.getSchema()
+		migrations = []
+		for hwClass in sorted(self._getAuditHardwareConfig().keys()):
+			values = self._getAuditHardwareConfig()[hwClass]
+			for (table, scope) in ((u'HARDWARE_DEVICE_' + hwClass, 'g'), (u'HARDWARE_CONFIG_' + hwClass, 'i')):
+				columns = [(value, valueInfo['Type']) for (value, valueInfo) in sorted(values.items()) if valueInfo['Scope'] == scope]
+				if table not in schema:
+					migrations.append(self._createAuditHardwareTableMigration(table, scope, columns))
+					continue
+
+				# Older versions added columns unquoted, Postgres stored
+				# their names in lower case
+				current = dict((name.lower(), name) for name in schema[table])
+				changes = []
+				statements = []
+				clauses = []
+				for (column, type) in columns:
+					currentColumn = schema[table].get(column) and column or current.get(column.lower())
+					currentType = currentColumn and schema[table][currentColumn]
+					if currentColumn and currentColumn != column:
+						changes.append({'column': column, 'action': 'rename', 'currentType': currentType, 'type': currentType})
+						statements.append(u'ALTER TABLE "%s" RENAME COLUMN "%s" TO "%s";' % (table, currentColumn, column))
+					if currentType is None:
+						changes.append({'column': column, 'action': 'add', 'currentType': None, 'type': type})
+						clauses.append(u'ADD "%s" %s NULL' % (column, type))
+					elif self._normalizeColumnType(currentType) != self._normalizeColumnType(type):
+						if not self._sql.ALTER_TABLE_CHANGE_SUPPORTED:
+							continue
+						changes.append({'column': column, 'action': 'alter', 'currentType': currentType, 'type': type})
+						clauses.append(u'ALTER COLUMN "%s" TYPE %s' % (column, type))
+				if clauses:
+					statements.append(u'ALTER TABLE "%s"\n%s;' % (table, u',\n'.join(clauses)))
+				if statements:
+					migrations.append({
+						'table': table,
+						'statement': u'\n'.join(statements),
+						'changes': changes
+					})
+		return migrations
 
-			# Execute sql query
-			if hardwareDeviceValuesProcessed or not hardwareDeviceTableExists:
-				logger.debug(hardwareDeviceTable)
-				self._sql.execute(hardwareDeviceTable)
-			if hardwareConfigValuesProcessed or not hardwareConfigTableExists:
-				logger.debug(hardwareConfigTable)
-				self._sql.execute(hardwareConfigTable)
+	def _createAuditHardwareTableMigration(self, table, scope, columns):
+		if scope == 'g':
+			definitions = [u'"hardware_id" ' + self._sql.AUTOINCREMENT]
+			primaryKey = u'hardware_id'
+		else:
+			definitions = [
+				u'"config_id" ' + self._sql.AUTOINCREMENT,
+				u'"hostId" varchar(50) NOT NULL',
+				u'"hardware_id" INTEGER NOT NULL',
+				u'"firstseen" TIMESTAMP NOT NULL DEFAULT \'0001-01-01 00:00:00\'',
+				u'"lastseen" TIMESTAMP NOT NULL DEFAULT \'0001-01-01 00:00:00\'',
+				u'"state" SMALLINT NOT NULL',
+			]
+			primaryKey = u'config_id'
+		definitions.extend([u'"%s" %s NULL' % (column, type) for (column, type) in columns])
+		definitions.append(u'PRIMARY KEY (%s)' % primaryKey)
+		return {
+			'table': table,
+			'statement': u'CREATE TABLE "%s" (\n%s\n) %s;' % (table, u',\n'.join(definitions), self._sql.getTableCreationOptions(table)),
+			'changes': [{'column': column, 'action': 'create', 'currentType': None, 'type': type} for (column, type) in columns]
+		}
+
+	def _convertValuesToJsonb(self, table, index):
+		"""
+		Converts the values column of a table created by an older
+		version from json encoded text to jsonb.
+		"""
+		dataType = self._sql.getSchema().get(table, {}).get('values')
+		if not dataType or dataType == 'jsonb':
+			return
+		logger.notice(u'Converting column "values" of table %s to jsonb' % table)
+		self._sql.execute(u'ALTER TABLE "%s" ALTER COLUMN "values" TYPE jsonb USING NULLIF("values", \'\')::jsonb;' % table)
+		self._sql.execute(u'CREATE INDEX "%s" on "%s" USING gin ("values" jsonb_path_ops);' % (index, table))
+
+	def _getIndexes(self):
+		return [res['indexname'] for res in self._sql.getSet(u"SELECT indexname FROM pg_indexes WHERE schemaname = 'public'")]
+
+	def _createProductPropertyValueIndex(self):
+		"""
+		Creates the unique index product property values are upserted
+		against. Duplicates written by older versions are removed first,
+		the default value is kept if there is one. The index of the
+		first version of it did not cover NULL values and is replaced.
+		"""
+		indexes = self._getIndexes()
+		if 'index_product_property_value_key' in indexes:
+			return
+		logger.notice(u'Creating unique index on table PRODUCT_PROPERTY_VALUE')
+		batch = self._sql.batch()
+		if 'index_product_property_value_unique' in indexes:
+			batch.execute(u'DROP INDEX "index_product_property_value_unique"')
+		batch.execute(u'''DELETE FROM "PRODUCT_PROPERTY_VALUE" WHERE "product_property_id" IN (
+			SELECT "product_property_id" FROM (
+				SELECT "product_property_id", row_number() OVER (
+					PARTITION BY "productId", "productVersion", "packageVersion", "propertyId", "value"
+					ORDER BY "isDefault" DESC NULLS LAST, "product_property_id"
+				) AS "position" FROM "PRODUCT_PROPERTY_VALUE"
+			) AS "ranked" WHERE "position" > 1)''')
+		batch.execute(u'CREATE UNIQUE INDEX "index_product_property_value_key" on "PRODUCT_PROPERTY_VALUE" (%s)' % self.PRODUCT_PROPERTY_VALUE_KEY)
+		batch.flush()
+
+	def _createTrigramIndexes(self):
+		"""
+		Creates GIN trigram indexes which let wildcard searches with
+		a leading wildcard use an index. They are optional, nothing is
+		done if the pg_trgm extension is not available.
+		"""
+		try:
+			self._sql.execute(u'CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+		except Exception as e:
+			logger.warning(u"Extension pg_trgm not available, wildcard searches will not be indexed: %s" % e)
+			return
+
+		indexes = self._getIndexes()
+		for (table, column) in self.TRIGRAM_INDEXES:
+			index = u'index_%s_%s_trgm' % (table.lower(), column)
+			if index in indexes:
+				continue
+			logger.debug(u'Creating trigram index %s' % index)
+			self._sql.execute(u'CREATE INDEX "%s" on "%s" USING gin ("%s" gin_trgm_ops);' % (index, table, column))
+
+	def _createKeysetIndexes(self):
+		"""
+		Creates indexes on the keys pages of tables with a surrogate
+		primary key are ordered by.
+		"""
+		indexes = self._getIndexes()
+		for table in self.KEYSET_INDEXES:
+			index = u'index_%s_keyset' % table.lower()
+			if index in indexes:
+				continue
+			logger.debug(u'Creating keyset index %s' % index)
+			self._sql.execute(u'CREATE INDEX "%s" on "%s" (%s);' % (
+				index, table, u', '.join([u'"%s"' % column for column in self.TABLE_KEYS[table]])
+			))
+
+	def _createGroupTreeIndexes(self):
+		"""
+		Creates the index group_getSubtree walks the group tree with.
+		Its member lookup on ("groupType", "groupId") uses the keyset
+		index of OBJECT_TO_GROUP, which starts with these columns.
+		"""
+		if not u'index_group_type_parentGroupId' in self._getIndexes():
+			logger.debug(u'Creating index index_group_type_parentGroupId')
+			self._sql.execute(u'CREATE INDEX "index_group_type_parentGroupId" on "GROUP" ("type", "parentGroupId");')
 
 	def _createTableHost(self):
 		logger.debug(u'Creating table HOST')
@@ -942,26 +1834,80 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(host)
 		self._sql.update('HOST', where, data)
 
+	def host_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting host hashes, filter: %s" % filter)
+		return self._getHashes(Host, 'HOST', attributes, self._hostTypeFilter(filter))
+
 	def host_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.host_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting hosts, filter: %s" % filter)
-		hosts = []
+		return self._getObjects(Host, 'HOST', attributes, self._hostTypeFilter(filter))
+
+	def _hostTypeFilter(self, filter):
 		type = forceList(filter.get('type', []))
 		if 'OpsiDepotserver' in type and not 'OpsiConfigserver' in type:
 			type.append('OpsiConfigserver')
 			filter['type'] = type
-		(attributes, filter) = self._adjustAttributes(Host, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('HOST', attributes, filter)):
-			self._adjustResult(Host, res)
-			hosts.append(Host.fromHash(res))
-		return hosts
+		return filter
+
+	def host_getCounts(self):
+		"""
+		Returns the number of hosts per type and the number of clients
+		per depot they are assigned to as
+		{'hosts': {type: count}, 'clientsOnDepot': {depotId: count}}.
+		Clients without a depot config state count for the default depot.
+		Reads the summary tables if summaryTables is enabled.
+		"""
+		if self._summaryTables:
+			hosts = self._sql.getSet(self._summaryQuery('HOST_SUMMARY', {}))
+			depots = self._sql.getSet(self._summaryQuery('CLIENT_DEPOT_SUMMARY', {}))
+		else:
+			hosts = self._sql.getSet(u'select "type", count(*) AS "count" from "HOST" group by "type"')
+			depots = self._sql.getSet(self.CLIENT_DEPOT_COUNT_QUERY)
+		return self._hostCounts(hosts, depots)
+
+	def _hostCounts(self, hosts, depots):
+		return {
+			'hosts': dict((res['type'], res['count']) for res in hosts),
+			'clientsOnDepot': dict((res['depotId'], res['count']) for res in depots)
+		}
 
 	def host_deleteObjects(self, hosts):
-		ConfigDataBackend.host_deleteObjects(self, hosts)
-		for host in forceObjectClassList(hosts, Host):
-			logger.info(u"Deleting host %s" % host)
-			where = self._uniqueCondition(host)
-			self._sql.delete('HOST', where)
+		# ConfigDataBackend.host_deleteObjects only removes the dependent
+		# objects host by host through the context, they are deleted here
+		# with the hosts. The modification tracker sees this call itself.
+		hostIds = [host.id for host in forceObjectClassList(hosts, Host)]
+		if not hostIds:
+			return
+		logger.info(u"Deleting hosts %s" % hostIds)
+		self._sql.execute(self._hostDeleteQuery(hostIds))
+
+	def _hostDeleteQuery(self, hostIds):
+		"""
+		Creates a single statement deleting the given hosts and every
+		row referencing them. The deletes of the referencing rows are
+		data modifying CTEs, so everything happens in one transaction
+		and the foreign keys on HOST are checked at the end of the
+		statement.
+		"""
+		references = [
+			('OBJECT_TO_GROUP', 'objectId'),
+			('PRODUCT_ON_CLIENT', 'clientId'),
+			('PRODUCT_ON_DEPOT', 'depotId'),
+			('PRODUCT_PROPERTY_STATE', 'objectId'),
+			('CONFIG_STATE', 'objectId'),
+			('LICENSE_ON_CLIENT', 'clientId'),
+			('BOOT_CONFIGURATION', 'clientId'),
+			('SOFTWARE_CONFIG', 'clientId'),
+		]
+		for hardwareClass in sorted(self._getAuditHardwareConfig().keys()):
+			references.append((u'HARDWARE_CONFIG_' + hardwareClass, 'hostId'))
+
+		hostIds = self._sql.arrayLiteral(hostIds)
+		ctes = []
+		for (index, (table, column)) in enumerate(references):
+			ctes.append(u'"delete_{0}" AS (DELETE FROM "{1}" WHERE "{2}" = ANY({3}))'.format(index, table, column, hostIds))
+		return u'WITH {0} DELETE FROM "HOST" WHERE "hostId" = ANY({1});'.format(u', '.join(ctes), hostIds)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   Configs                                                                                   -
@@ -979,18 +1925,20 @@ class SQLBackend(ConfigDataBackend):
 		del data['defaultValues']
 
 		where = self._uniqueCondition(config)
+		batch = self._sql.batch()
 		if self._sql.getRow('select * from "CONFIG" where %s' % where):
-			self._sql.update('CONFIG', where, data, updateWhereNone=True)
+			batch.update('CONFIG', where, data, updateWhereNone=True)
 		else:
-			self._sql.insert('CONFIG', data)
+			batch.insert('CONFIG', data)
 
-		self._sql.delete('CONFIG_VALUE', where)
+		batch.delete('CONFIG_VALUE', where)
 		for value in possibleValues:
-			self._sql.insert('CONFIG_VALUE', {
+			batch.insert('CONFIG_VALUE', {
 				'configId': data['configId'],
 				'value': value,
 				'isDefault': (value in defaultValues)
 				})
+		batch.flush()
 
 	def config_updateObject(self, config):
 		ConfigDataBackend.config_updateObject(self, config)
@@ -1005,44 +1953,35 @@ class SQLBackend(ConfigDataBackend):
 		del data['possibleValues']
 		del data['defaultValues']
 
-		self._sql.update('CONFIG', where, data)
-		self._sql.delete('CONFIG_VALUE', where)
+		batch = self._sql.batch()
+		batch.update('CONFIG', where, data)
+		batch.delete('CONFIG_VALUE', where)
 		for value in possibleValues:
-			self._sql.insert('CONFIG_VALUE', {
+			batch.insert('CONFIG_VALUE', {
 				'configId': data['configId'],
 				'value': value,
 				'isDefault': (value in defaultValues)
 				})
+		batch.flush()
+
+	def config_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting config hashes, filter: %s" % filter)
+		return self._toOpsiHashes(self._configHashes(attributes, filter, hashesOnly=True), Config)
 
 	def config_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.config_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting configs, filter: %s" % filter)
-		configs = []
-		(attributes, filter) = self._adjustAttributes(Config, attributes, filter)
+		return [Config.fromHash(res) for res in self._configHashes(attributes, filter)]
 
-		if filter.has_key('defaultValues'):
-			if filter['defaultValues']:
-				configIds = filter.get('configId')
-				filter['configId'] = []
-				for res in self._sql.getSet(self._createQuery('CONFIG_VALUE', ['configId'], {'configId': configIds, 'value': filter['defaultValues'], 'isDefault': True})):
-					filter['configId'].append(res['configId'])
-				if not filter['configId']:
-					return []
-			del filter['defaultValues']
-		if filter.has_key('possibleValues'):
-			if filter['possibleValues']:
-				configIds = filter.get('configId')
-				filter['configId'] = []
-				for res in self._sql.getSet(self._createQuery('CONFIG_VALUE', ['configId'], {'configId': configIds, 'value': filter['possibleValues']})):
-					filter['configId'].append(res['configId'])
-				if not filter['configId']:
-					return []
-			del filter['possibleValues']
+	def _configHashes(self, attributes, filter, hashesOnly=False):
+		hashes = []
+		(attributes, filter) = self._adjustAttributes(Config, attributes, filter, hashesOnly)
+		(filter, conditions) = self._configValueConditions(filter)
 		attrs = []
 		for attr in attributes:
 			if not attr in ('defaultValues', 'possibleValues'):
 				attrs.append(attr)
-		for res in self._sql.getSet(self._createQuery('CONFIG', attrs, filter)):
+		for res in self._sql.getSet(self._createQuery('CONFIG', attrs, filter, conditions)):
 			res['possibleValues'] = []
 			res['defaultValues'] = []
 			if not attributes or 'possibleValues' in attributes or 'defaultValues' in attributes:
@@ -1051,16 +1990,30 @@ class SQLBackend(ConfigDataBackend):
 					if res2['isDefault']:
 						res['defaultValues'].append(res2['value'])
 			self._adjustResult(Config, res)
-			configs.append(Config.fromHash(res))
-		return configs
+			hashes.append(res)
+		return hashes
+
+	def _configValueConditions(self, filter):
+		"""
+		Moves the defaultValues and possibleValues filters into
+		subqueries on CONFIG_VALUE.
+		"""
+		conditions = []
+		if filter.has_key('defaultValues'):
+			if filter['defaultValues']:
+				conditions.append(self._existsCondition('CONFIG_VALUE', 'CONFIG', 'configId', {'value': filter['defaultValues'], 'isDefault': True}))
+			del filter['defaultValues']
+		if filter.has_key('possibleValues'):
+			if filter['possibleValues']:
+				conditions.append(self._existsCondition('CONFIG_VALUE', 'CONFIG', 'configId', {'value': filter['possibleValues']}))
+			del filter['possibleValues']
+		return (filter, conditions)
 
 	def config_deleteObjects(self, configs):
 		ConfigDataBackend.config_deleteObjects(self, configs)
-		for config in forceObjectClassList(configs, Config):
-			logger.info(u"Deleting config %s" % config)
-			where = self._uniqueCondition(config)
-			self._sql.delete('CONFIG_VALUE', where)
-			self._sql.delete('CONFIG', where)
+		configs = forceObjectClassList(configs, Config)
+		logger.info(u"Deleting %d configs" % len(configs))
+		self._deleteObjects(('CONFIG_VALUE', 'CONFIG'), configs)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ConfigStates                                                                              -
@@ -1083,23 +2036,20 @@ class SQLBackend(ConfigDataBackend):
 		data['values'] = json.dumps(data['values'])
 		self._sql.update('CONFIG_STATE', where, data)
 
+	def configState_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting configState hashes, filter: %s" % filter)
+		return self._getHashes(ConfigState, 'CONFIG_STATE', attributes, filter)
+
 	def configState_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.configState_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting configStates, filter: %s" % filter)
-		configStates = []
-		(attributes, filter) = self._adjustAttributes(ConfigState, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('CONFIG_STATE', attributes, filter)):
-			if res.has_key('values'):
-				res['values'] = json.loads(res['values'])
-			configStates.append(ConfigState.fromHash(res))
-		return configStates
+		return self._getObjects(ConfigState, 'CONFIG_STATE', attributes, filter)
 
 	def configState_deleteObjects(self, configStates):
 		ConfigDataBackend.configState_deleteObjects(self, configStates)
-		for configState in forceObjectClassList(configStates, ConfigState):
-			logger.info("Deleting configState %s" % configState)
-			where = self._uniqueCondition(configState)
-			self._sql.delete('CONFIG_STATE', where)
+		configStates = forceObjectClassList(configStates, ConfigState)
+		logger.info(u"Deleting %d configStates" % len(configStates))
+		self._deleteObjects('CONFIG_STATE', configStates)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   Products                                                                                  -
@@ -1112,14 +2062,16 @@ class SQLBackend(ConfigDataBackend):
 		del data['productClassIds']
 
 		where = self._uniqueCondition(product)
+		batch = self._sql.batch()
 		if self._sql.getRow('select * from "PRODUCT" where %s' % where):
-			self._sql.update('PRODUCT', where, data, updateWhereNone=True)
+			batch.update('PRODUCT', where, data, updateWhereNone=True)
 		else:
-			self._sql.insert('PRODUCT', data)
+			batch.insert('PRODUCT', data)
 
-		self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', "\"productId\" = '%s'" % data['productId'])
+		batch.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', "\"productId\" = '%s'" % data['productId'])
 		for windowsSoftwareId in windowsSoftwareIds:
-			self._sql.insert('WINDOWS_SOFTWARE_ID_TO_PRODUCT', {'windowsSoftwareId': windowsSoftwareId, 'productId': data['productId']})
+			batch.insert('WINDOWS_SOFTWARE_ID_TO_PRODUCT', {'windowsSoftwareId': windowsSoftwareId, 'productId': data['productId']})
+		batch.flush()
 
 	def product_updateObject(self, product):
 		ConfigDataBackend.product_updateObject(self, product)
@@ -1128,17 +2080,26 @@ class SQLBackend(ConfigDataBackend):
 		windowsSoftwareIds = data['windowsSoftwareIds']
 		del data['windowsSoftwareIds']
 		del data['productClassIds']
-		self._sql.update('PRODUCT', where, data)
-		self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', "\"productId\" = '%s'" % data['productId'])
+		batch = self._sql.batch()
+		batch.update('PRODUCT', where, data)
+		batch.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', "\"productId\" = '%s'" % data['productId'])
 		if windowsSoftwareIds:
 			for windowsSoftwareId in windowsSoftwareIds:
-				self._sql.insert('WINDOWS_SOFTWARE_ID_TO_PRODUCT', {'windowsSoftwareId': windowsSoftwareId, 'productId': data['productId']})
+				batch.insert('WINDOWS_SOFTWARE_ID_TO_PRODUCT', {'windowsSoftwareId': windowsSoftwareId, 'productId': data['productId']})
+		batch.flush()
+
+	def product_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting product hashes, filter: %s" % filter)
+		return self._toOpsiHashes(self._productHashes(attributes, filter, hashesOnly=True), Product)
 
 	def product_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.product_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting products, filter: %s" % filter)
-		products = []
-		(attributes, filter) = self._adjustAttributes(Product, attributes, filter)
+		return [Product.fromHash(res) for res in self._productHashes(attributes, filter)]
+
+	def _productHashes(self, attributes, filter, hashesOnly=False):
+		hashes = []
+		(attributes, filter) = self._adjustAttributes(Product, attributes, filter, hashesOnly)
 		for res in self._sql.getSet(self._createQuery('PRODUCT', attributes, filter)):
 			res['windowsSoftwareIds'] = []
 			res['productClassIds'] = []
@@ -1148,82 +2109,98 @@ class SQLBackend(ConfigDataBackend):
 			if not attributes or 'productClassIds' in attributes:
 				pass
 			self._adjustResult(Product, res)
-			products.append(Product.fromHash(res))
-		return products
+			hashes.append(res)
+		return hashes
 
 	def product_deleteObjects(self, products):
 		ConfigDataBackend.product_deleteObjects(self, products)
-		for product in forceObjectClassList(products, Product):
-			logger.info("Deleting product %s" % product)
-			where = self._uniqueCondition(product)
-			self._sql.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', "\"productId\" = '%s'" % product.getId())
-			self._sql.delete('PRODUCT', where)
+		products = forceObjectClassList(products, Product)
+		if not products:
+			return
+		logger.info(u"Deleting %d products" % len(products))
+		batch = self._sql.batch()
+		batch.delete('WINDOWS_SOFTWARE_ID_TO_PRODUCT', u'"productId" = ANY({0})'.format(self._sql.arrayLiteral([product.getId() for product in products])))
+		for where in self._uniqueConditions(products):
+			batch.delete('PRODUCT', where)
+		batch.flush()
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductProperties                                                                         -
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	def productProperty_insertObject(self, productProperty):
 		ConfigDataBackend.productProperty_insertObject(self, productProperty)
-		data = self._objectToDatabaseHash(productProperty)
-		possibleValues = data['possibleValues']
-		defaultValues = data['defaultValues']
-		if possibleValues is None:
-			possibleValues = []
-		if defaultValues is None:
-			defaultValues = []
-		del data['possibleValues']
-		del data['defaultValues']
-
-		where = self._uniqueCondition(productProperty)
-		if self._sql.getRow('select * from "PRODUCT_PROPERTY" where %s' % where):
-			self._sql.update('PRODUCT_PROPERTY', where, data, updateWhereNone=True)
-		else:
-			self._sql.insert('PRODUCT_PROPERTY', data)
-
-		if not possibleValues is None:
-			self._sql.delete('PRODUCT_PROPERTY_VALUE', where)
-		for value in possibleValues:
-			self._sql.insert('PRODUCT_PROPERTY_VALUE', {
-					'productId': data['productId'],
-					'productVersion': data['productVersion'],
-					'packageVersion': data['packageVersion'],
-					'propertyId': data['propertyId'],
-					'value': value,
-					'isDefault': (value in defaultValues)
-					})
+		self._sql.executeBatch(self._productPropertyQueries(productProperty))
 
 	def productProperty_updateObject(self, productProperty):
 		ConfigDataBackend.productProperty_updateObject(self, productProperty)
+		self._sql.executeBatch(self._productPropertyQueries(productProperty, update=True))
+
+	def _productPropertyQueries(self, productProperty, update=False):
+		"""
+		Creates the statements writing a product property and its values.
+
+		The values are reconciled with a set based diff: values which
+		are no longer possible are deleted, the others are inserted or
+		get their isDefault flag updated. Run as one batch this is a
+		single transaction per property.
+		"""
 		data = self._objectToDatabaseHash(productProperty)
+		possibleValues = data.pop('possibleValues') or []
+		defaultValues = data.pop('defaultValues') or []
 		where = self._uniqueCondition(productProperty)
-		possibleValues = data['possibleValues']
-		defaultValues = data['defaultValues']
-		if possibleValues is None:
-			possibleValues = []
-		if defaultValues is None:
-			defaultValues = []
-		del data['possibleValues']
-		del data['defaultValues']
-		self._sql.update('PRODUCT_PROPERTY', where, data)
-
-		if not possibleValues is None:
-			self._sql.delete('PRODUCT_PROPERTY_VALUE', where)
+		key = ('productId', 'productVersion', 'packageVersion', 'propertyId')
 
+		queries = []
+		if update:
+			queries.append(self._sql._updateQuery('PRODUCT_PROPERTY', where, data))
+		else:
+			queries.append(self._sql._insertRowsQuery('PRODUCT_PROPERTY', data.keys(), [data],
+				u' ON CONFLICT ({0}) DO UPDATE SET {1}'.format(
+					u', '.join([u'"{0}"'.format(column) for column in key]),
+					u', '.join([u'"{0}" = EXCLUDED."{0}"'.format(column) for column in data.keys() if column not in key])
+				)
+			))
+
+		values = []
 		for value in possibleValues:
-			self._sql.insert('PRODUCT_PROPERTY_VALUE', {
+			if value not in values:
+				values.append(value)
+		notNullValues = [value for value in values if value is not None]
+		if notNullValues:
+			queries.append(self._sql._deleteQuery('PRODUCT_PROPERTY_VALUE',
+				u'{0} and ("value" is NULL or NOT ("value" = ANY({1})))'.format(where, self._sql.arrayLiteral(notNullValues))
+			))
+		else:
+			queries.append(self._sql._deleteQuery('PRODUCT_PROPERTY_VALUE', where))
+
+		if values:
+			rows = [
+				{
 					'productId': data['productId'],
 					'productVersion': data['productVersion'],
 					'packageVersion': data['packageVersion'],
 					'propertyId': data['propertyId'],
 					'value': value,
 					'isDefault': (value in defaultValues)
-					})
+				} for value in values
+			]
+			queries.append(self._sql._insertRowsQuery('PRODUCT_PROPERTY_VALUE', key + ('value', 'isDefault'), rows,
+				u' ON CONFLICT ({0}) DO UPDATE SET "isDefault" = EXCLUDED."isDefault"'.format(self.PRODUCT_PROPERTY_VALUE_KEY)
+			))
+		return queries
+
+	def productProperty_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productProperty hashes, filter: %s" % filter)
+		return self._toOpsiHashes(self._productPropertyHashes(attributes, filter, hashesOnly=True), ProductProperty)
 
 	def productProperty_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.productProperty_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting product properties, filter: %s" % filter)
-		productProperties = []
-		(attributes, filter) = self._adjustAttributes(ProductProperty, attributes, filter)
+		return [ProductProperty.fromHash(res) for res in self._productPropertyHashes(attributes, filter)]
+
+	def _productPropertyHashes(self, attributes, filter, hashesOnly=False):
+		hashes = []
+		(attributes, filter) = self._adjustAttributes(ProductProperty, attributes, filter, hashesOnly)
 		for res in self._sql.getSet(self._createQuery('PRODUCT_PROPERTY', attributes, filter)):
 			res['possibleValues'] = []
 			res['defaultValues'] = []
@@ -1242,16 +2219,14 @@ class SQLBackend(ConfigDataBackend):
 					res['possibleValues'].append(res2['value'])
 					if res2['isDefault']:
 						res['defaultValues'].append(res2['value'])
-			productProperties.append(ProductProperty.fromHash(res))
-		return productProperties
+			hashes.append(res)
+		return hashes
 
 	def productProperty_deleteObjects(self, productProperties):
 		ConfigDataBackend.productProperty_deleteObjects(self, productProperties)
-		for productProperty in forceObjectClassList(productProperties, ProductProperty):
-			logger.info("Deleting product property %s" % productProperty)
-			where = self._uniqueCondition(productProperty)
-			self._sql.delete('PRODUCT_PROPERTY_VALUE', where)
-			self._sql.delete('PRODUCT_PROPERTY', where)
+		productProperties = forceObjectClassList(productProperties, ProductProperty)
+		logger.info(u"Deleting %d productProperties" % len(productProperties))
+		self._deleteObjects(('PRODUCT_PROPERTY_VALUE', 'PRODUCT_PROPERTY'), productProperties)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductDependencies                                                                         -
@@ -1273,21 +2248,20 @@ class SQLBackend(ConfigDataBackend):
 
 		self._sql.update('PRODUCT_DEPENDENCY', where, data)
 
+	def productDependency_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productDependency hashes, filter: %s" % filter)
+		return self._getHashes(ProductDependency, 'PRODUCT_DEPENDENCY', attributes, filter)
+
 	def productDependency_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.productDependency_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting product dependencies, filter: %s" % filter)
-		productDependencies = []
-		(attributes, filter) = self._adjustAttributes(ProductDependency, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('PRODUCT_DEPENDENCY', attributes, filter)):
-			productDependencies.append(ProductDependency.fromHash(res))
-		return productDependencies
+		return self._getObjects(ProductDependency, 'PRODUCT_DEPENDENCY', attributes, filter)
 
 	def productDependency_deleteObjects(self, productDependencies):
 		ConfigDataBackend.productDependency_deleteObjects(self, productDependencies)
-		for productDependency in forceObjectClassList(productDependencies, ProductDependency):
-			logger.info("Deleting product dependency %s" % productDependency)
-			where = self._uniqueCondition(productDependency)
-			self._sql.delete('PRODUCT_DEPENDENCY', where)
+		productDependencies = forceObjectClassList(productDependencies, ProductDependency)
+		logger.info(u"Deleting %d productDependencies" % len(productDependencies))
+		self._deleteObjects('PRODUCT_DEPENDENCY', productDependencies)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductOnDepots                                                                           -
@@ -1312,20 +2286,19 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(productOnDepot)
 		self._sql.update('PRODUCT_ON_DEPOT', where, data)
 
+	def productOnDepot_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productOnDepot hashes, filter: %s" % filter)
+		return self._getHashes(ProductOnDepot, 'PRODUCT_ON_DEPOT', attributes, filter)
+
 	def productOnDepot_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.productOnDepot_getObjects(self, attributes=[], **filter)
-		productOnDepots = []
-		(attributes, filter) = self._adjustAttributes(ProductOnDepot, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('PRODUCT_ON_DEPOT', attributes, filter)):
-			productOnDepots.append(ProductOnDepot.fromHash(res))
-		return productOnDepots
+		return self._getObjects(ProductOnDepot, 'PRODUCT_ON_DEPOT', attributes, filter)
 
 	def productOnDepot_deleteObjects(self, productOnDepots):
 		ConfigDataBackend.productOnDepot_deleteObjects(self, productOnDepots)
-		for productOnDepot in forceObjectClassList(productOnDepots, ProductOnDepot):
-			logger.info(u"Deleting productOnDepot %s" % productOnDepot)
-			where = self._uniqueCondition(productOnDepot)
-			self._sql.delete('PRODUCT_ON_DEPOT', where)
+		productOnDepots = forceObjectClassList(productOnDepots, ProductOnDepot)
+		logger.info(u"Deleting %d productOnDepots" % len(productOnDepots))
+		self._deleteObjects('PRODUCT_ON_DEPOT', productOnDepots)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductOnClients                                                                          -
@@ -1351,21 +2324,140 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(productOnClient)
 		self._sql.update('PRODUCT_ON_CLIENT', where, data)
 
+	def productOnClient_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productOnClient hashes, filter: %s" % filter)
+		return self._getHashes(ProductOnClient, 'PRODUCT_ON_CLIENT', attributes, filter)
+
 	def productOnClient_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.productOnClient_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting productOnClients, filter: %s" % filter)
-		productOnClients = []
-		(attributes, filter) = self._adjustAttributes(ProductOnClient, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('PRODUCT_ON_CLIENT', attributes, filter)):
-			productOnClients.append(ProductOnClient.fromHash(res))
-		return productOnClients
+		return self._getObjects(ProductOnClient, 'PRODUCT_ON_CLIENT', attributes, filter)
 
 	def productOnClient_deleteObjects(self, productOnClients):
 		ConfigDataBackend.productOnClient_deleteObjects(self, productOnClients)
-		for productOnClient in forceObjectClassList(productOnClients, ProductOnClient):
-			logger.info(u"Deleting productOnClient %s" % productOnClient)
-			where = self._uniqueCondition(productOnClient)
-			self._sql.delete('PRODUCT_ON_CLIENT', where)
+		productOnClients = forceObjectClassList(productOnClients, ProductOnClient)
+		logger.info(u"Deleting %d productOnClients" % len(productOnClients))
+		self._deleteObjects('PRODUCT_ON_CLIENT', productOnClients)
+
+	def productOnClient_getCounts(self, groupBy=['productId', 'installationStatus'], **filter):
+		"""
+		Counts productOnClients in the database instead of fetching them.
+		Returns a list of hashes holding the groupBy attributes and the
+		number of matching productOnClients as count, e.g.
+		productOnClient_getCounts(['productId', 'actionResult'], groupId='lab')
+
+		Besides the productOnClient attributes, groupId (host groups of
+		the client) and depotId (depot the client is assigned to) can be
+		used to group and filter. A client in several matching host
+		groups is counted once per group if grouped by groupId.
+		"""
+		logger.info(u"Counting productOnClients by %s, filter: %s" % (groupBy, filter))
+		return self._sql.getSet(self._productOnClientCountQuery(groupBy, filter))
+
+	def productOnClient_getSummary(self, **filter):
+		"""
+		Returns the number of productOnClients per productId,
+		installationStatus and actionResult like productOnClient_getCounts.
+		Reads the summary table if summaryTables is enabled, otherwise
+		counts the productOnClients.
+		"""
+		if not self._summaryTables:
+			return self.productOnClient_getCounts(['productId', 'installationStatus', 'actionResult'], **filter)
+		return self._sql.getSet(self._summaryQuery('PRODUCT_ON_CLIENT_SUMMARY', filter))
+
+	def _summaryQuery(self, table, filter):
+		return self._createQuery(table, filter=filter)
+
+	def _productOnClientCountQuery(self, groupBy, filter):
+		groupBy = forceUnicodeList(groupBy)
+		filter = forceDict(filter)
+		for attribute in groupBy + filter.keys():
+			if not attribute in self.PRODUCT_ON_CLIENT_COUNT_ATTRIBUTES:
+				raise BackendBadValueError(u"Cannot count productOnClients by '%s'" % attribute)
+
+		select = [u'"poc".*']
+		joins = []
+		if 'groupId' in groupBy or 'groupId' in filter:
+			select.append(u'"otg"."groupId"')
+			joins.append(u'JOIN "OBJECT_TO_GROUP" AS "otg" ON "otg"."objectId" = "poc"."clientId" AND "otg"."groupType" = \'HostGroup\'')
+		if 'depotId' in groupBy or 'depotId' in filter:
+			# Clients without a config state use the default depot
+			select.append(u'''COALESCE("cs"."values"->>0, (SELECT "value" FROM "CONFIG_VALUE"
+				WHERE "configId" = 'clientconfig.depot.id' AND "isDefault" LIMIT 1)) AS "depotId"''')
+			joins.append(u'LEFT JOIN "CONFIG_STATE" AS "cs" ON "cs"."objectId" = "poc"."clientId" AND "cs"."configId" = \'clientconfig.depot.id\'')
+
+		columns = u', '.join([u'"{0}"'.format(attribute) for attribute in groupBy])
+		query = u'SELECT {0} FROM "PRODUCT_ON_CLIENT" AS "poc" {1}'.format(u', '.join(select), u' '.join(joins))
+		query = u'SELECT {0}count(*) AS "count" FROM ({1}) AS "productOnClient"'.format(columns and columns + u', ', query)
+		where = self._filterToSql(filter)
+		if where:
+			query += u' WHERE {0}'.format(where)
+		if columns:
+			# Lower case, _prepareQuery quotes ' GROUP ' as table name
+			query += u' group by {0} order by {0}'.format(columns)
+		logger.debug(u"Created query: '%s'" % query)
+		return query
+
+	def productOnClient_getEffectiveStates(self, clientIds):
+		"""
+		Returns the effective state of every product on the depot of
+		each client as one hash per client and product, ordered by
+		clientId and productId. Products without a productOnClient are
+		not_installed with actionRequest none. properties holds the
+		values of every product property: the client's state, else the
+		depot's state, else the default values.
+		"""
+		logger.info(u"Getting effective product states of %s" % clientIds)
+		return self._effectiveProductStates(self._sql.getSet(self._effectiveProductStateQuery(clientIds)))
+
+	def _effectiveProductStateQuery(self, clientIds):
+		query = u'''WITH "client" AS (
+				select "h"."hostId" AS "clientId", COALESCE("cs"."values"->>0, (select "value" from "CONFIG_VALUE"
+					where "configId" = 'clientconfig.depot.id' and "isDefault" limit 1)) AS "depotId"
+				from "HOST" AS "h"
+				left join "CONFIG_STATE" AS "cs" on "cs"."objectId" = "h"."hostId" and "cs"."configId" = 'clientconfig.depot.id'
+				where "h"."hostId" = ANY({0}) and "h"."type" = 'OpsiClient'
+			)
+			select "c"."clientId", "c"."depotId", "pod"."productId", "pod"."productType",
+				"pod"."productVersion", "pod"."packageVersion", "pod"."locked", "p"."name", "p"."priority",
+				COALESCE("poc"."installationStatus", 'not_installed') AS "installationStatus",
+				COALESCE("poc"."actionRequest", 'none') AS "actionRequest",
+				"poc"."actionProgress", "poc"."actionResult", "poc"."lastAction", "poc"."targetConfiguration",
+				"poc"."productVersion" AS "installedProductVersion", "poc"."packageVersion" AS "installedPackageVersion",
+				"poc"."modificationTime", COALESCE("props"."properties", '{{}}') AS "properties"
+			from "client" AS "c"
+			join "PRODUCT_ON_DEPOT" AS "pod" on "pod"."depotId" = "c"."depotId"
+			join "PRODUCT" AS "p" on "p"."productId" = "pod"."productId"
+				and "p"."productVersion" = "pod"."productVersion" and "p"."packageVersion" = "pod"."packageVersion"
+			left join "PRODUCT_ON_CLIENT" AS "poc" on "poc"."clientId" = "c"."clientId" and "poc"."productId" = "pod"."productId"
+			left join lateral (
+				select jsonb_object_agg("pp"."propertyId", COALESCE("cps"."values", "dps"."values", "dv"."values", '[]')) AS "properties"
+				from "PRODUCT_PROPERTY" AS "pp"
+				left join "PRODUCT_PROPERTY_STATE" AS "cps" on "cps"."productId" = "pp"."productId"
+					and "cps"."propertyId" = "pp"."propertyId" and "cps"."objectId" = "c"."clientId"
+				left join "PRODUCT_PROPERTY_STATE" AS "dps" on "dps"."productId" = "pp"."productId"
+					and "dps"."propertyId" = "pp"."propertyId" and "dps"."objectId" = "c"."depotId"
+				left join lateral (
+					select jsonb_agg(CASE WHEN "pp"."type" = 'BoolProductProperty'
+						THEN to_jsonb(lower("ppv"."value") in ('1', 'true'))
+						ELSE to_jsonb("ppv"."value") END order by "ppv"."product_property_id") AS "values"
+					from "PRODUCT_PROPERTY_VALUE" AS "ppv"
+					where "ppv"."productId" = "pp"."productId" and "ppv"."productVersion" = "pp"."productVersion"
+						and "ppv"."packageVersion" = "pp"."packageVersion" and "ppv"."propertyId" = "pp"."propertyId"
+						and "ppv"."isDefault"
+				) AS "dv" on true
+				where "pp"."productId" = "pod"."productId" and "pp"."productVersion" = "pod"."productVersion"
+					and "pp"."packageVersion" = "pod"."packageVersion"
+			) AS "props" on true
+			order by "c"."clientId", "pod"."productId"'''.format(self._sql.arrayLiteral(forceHostIdList(clientIds)))
+		logger.debug(u"Created query: '%s'" % query)
+		return query
+
+	def _effectiveProductStates(self, rows):
+		for res in rows:
+			if isinstance(res['modificationTime'], datetime.datetime):
+				res['modificationTime'] = forceOpsiTimestamp(res['modificationTime'])
+		return rows
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ProductPropertyStates                                                                     -
@@ -1390,25 +2482,20 @@ class SQLBackend(ConfigDataBackend):
 		data['values'] = json.dumps(data['values'])
 		self._sql.update('PRODUCT_PROPERTY_STATE', where, data)
 
+	def productPropertyState_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting productPropertyState hashes, filter: %s" % filter)
+		return self._getHashes(ProductPropertyState, 'PRODUCT_PROPERTY_STATE', attributes, filter)
+
 	def productPropertyState_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.productPropertyState_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting productPropertyStates, filter: %s" % filter)
-		productPropertyStates = []
-		(attributes, filter) = self._adjustAttributes(ProductPropertyState, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('PRODUCT_PROPERTY_STATE', attributes, filter)):
-                        try:
-				res['values'] = json.loads(res['values'])
-                        except KeyError:
-				pass  # Could be non-existing and it would be okay.
-			productPropertyStates.append(ProductPropertyState.fromHash(res))
-		return productPropertyStates
+		return self._getObjects(ProductPropertyState, 'PRODUCT_PROPERTY_STATE', attributes, filter)
 
 	def productPropertyState_deleteObjects(self, productPropertyStates):
 		ConfigDataBackend.productPropertyState_deleteObjects(self, productPropertyStates)
-		for productPropertyState in forceObjectClassList(productPropertyStates, ProductPropertyState):
-			logger.info(u"Deleting productPropertyState %s" % productPropertyState)
-			where = self._uniqueCondition(productPropertyState)
-			self._sql.delete('PRODUCT_PROPERTY_STATE', where)
+		productPropertyStates = forceObjectClassList(productPropertyStates, ProductPropertyState)
+		logger.info(u"Deleting %d productPropertyStates" % len(productPropertyStates))
+		self._deleteObjects('PRODUCT_PROPERTY_STATE', productPropertyStates)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   Groups                                                                                    -
@@ -1429,22 +2516,57 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(group)
 		self._sql.update('GROUP', where, data)
 
+	def group_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting group hashes, filter: %s" % filter)
+		return self._getHashes(Group, 'GROUP', attributes, filter)
+
 	def group_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.group_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting groups, filter: %s" % filter)
-		groups = []
-		(attributes, filter) = self._adjustAttributes(Group, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('GROUP', attributes, filter)):
-			self._adjustResult(Group, res)
-			groups.append(Group.fromHash(res))
-		return groups
+		return self._getObjects(Group, 'GROUP', attributes, filter)
 
 	def group_deleteObjects(self, groups):
 		ConfigDataBackend.group_deleteObjects(self, groups)
-		for group in forceObjectClassList(groups, Group):
-			logger.info(u"Deleting group %s" % group)
-			where = self._uniqueCondition(group)
-			self._sql.delete('GROUP', where)
+		groups = forceObjectClassList(groups, Group)
+		logger.info(u"Deleting %d groups" % len(groups))
+		self._deleteObjects('GROUP', groups)
+
+	def group_getSubtree(self, groupIds, groupType=u'HostGroup'):
+		"""
+		Returns the ids of the given groups and all of their subgroups
+		and the ids of the objects in any of these groups as
+		{'groupIds': [groupId, ...], 'objectIds': [objectId, ...]}.
+		"""
+		logger.info(u"Getting subtree of %s %s" % (groupType, groupIds))
+		return self._groupSubtree(self._sql.getSet(self._groupSubtreeQuery(groupIds, groupType)))
+
+	def _groupSubtreeQuery(self, groupIds, groupType):
+		# UNION instead of UNION ALL stops at groups already visited,
+		# so a parentGroupId cycle does not recurse forever.
+		return u'''WITH RECURSIVE "tree" AS (
+				select "type", "groupId" from "GROUP" where "type" = {0} and "groupId" = ANY({1})
+				UNION
+				select g."type", g."groupId" from "GROUP" AS g
+				join "tree" on g."type" = "tree"."type" and g."parentGroupId" = "tree"."groupId"
+			)
+			select "tree"."groupId", otg."objectId" from "tree"
+			left join "OBJECT_TO_GROUP" AS otg on otg."groupType" = "tree"."type" and otg."groupId" = "tree"."groupId"
+			order by "tree"."groupId", otg."objectId"'''.format(
+			self._sql._toSqlValue(forceGroupType(groupType)),
+			self._sql.arrayLiteral(forceGroupIdList(groupIds))
+		)
+
+	def _groupSubtree(self, rows):
+		result = {'groupIds': [], 'objectIds': []}
+		objectIds = set()
+		for row in rows:
+			if not result['groupIds'] or result['groupIds'][-1] != row['groupId']:
+				result['groupIds'].append(row['groupId'])
+			if row['objectId'] is not None and not row['objectId'] in objectIds:
+				objectIds.add(row['objectId'])
+				result['objectIds'].append(row['objectId'])
+		result['objectIds'].sort()
+		return result
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   ObjectToGroups                                                                            -
@@ -1465,21 +2587,20 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(objectToGroup)
 		self._sql.update('OBJECT_TO_GROUP', where, data)
 
+	def objectToGroup_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting objectToGroup hashes, filter: %s" % filter)
+		return self._getHashes(ObjectToGroup, 'OBJECT_TO_GROUP', attributes, filter)
+
 	def objectToGroup_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.objectToGroup_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting objectToGroups, filter: %s" % filter)
-		objectToGroups = []
-		(attributes, filter) = self._adjustAttributes(ObjectToGroup, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('OBJECT_TO_GROUP', attributes, filter)):
-			objectToGroups.append(ObjectToGroup.fromHash(res))
-		return objectToGroups
+		return self._getObjects(ObjectToGroup, 'OBJECT_TO_GROUP', attributes, filter)
 
 	def objectToGroup_deleteObjects(self, objectToGroups):
 		ConfigDataBackend.objectToGroup_deleteObjects(self, objectToGroups)
-		for objectToGroup in forceObjectClassList(objectToGroups, ObjectToGroup):
-			logger.info(u"Deleting objectToGroup %s" % objectToGroup)
-			where = self._uniqueCondition(objectToGroup)
-			self._sql.delete('OBJECT_TO_GROUP', where)
+		objectToGroups = forceObjectClassList(objectToGroups, ObjectToGroup)
+		logger.info(u"Deleting %d objectToGroups" % len(objectToGroups))
+		self._deleteObjects('OBJECT_TO_GROUP', objectToGroups)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   LicenseContracts                                                                          -
@@ -1508,6 +2629,14 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(licenseContract)
 		self._sql.update('LICENSE_CONTRACT', where, data)
 
+	def licenseContract_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return []
+
+		logger.info(u"Getting licenseContract hashes, filter: %s" % filter)
+		return self._getHashes(LicenseContract, 'LICENSE_CONTRACT', attributes, filter)
+
 	def licenseContract_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
 			logger.warning(u"License management module disabled")
@@ -1515,12 +2644,7 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licenseContract_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting licenseContracts, filter: %s" % filter)
-		licenseContracts = []
-		(attributes, filter) = self._adjustAttributes(LicenseContract, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('LICENSE_CONTRACT', attributes, filter)):
-			self._adjustResult(LicenseContract, res)
-			licenseContracts.append(LicenseContract.fromHash(res))
-		return licenseContracts
+		return self._getObjects(LicenseContract, 'LICENSE_CONTRACT', attributes, filter)
 
 	def licenseContract_deleteObjects(self, licenseContracts):
 		if not self._licenseManagementModule:
@@ -1532,10 +2656,9 @@ class SQLBackend(ConfigDataBackend):
 			return
 
 		ConfigDataBackend.licenseContract_deleteObjects(self, licenseContracts)
-		for licenseContract in forceObjectClassList(licenseContracts, LicenseContract):
-			logger.info(u"Deleting licenseContract %s" % licenseContract)
-			where = self._uniqueCondition(licenseContract)
-			self._sql.delete('LICENSE_CONTRACT', where)
+		licenseContracts = forceObjectClassList(licenseContracts, LicenseContract)
+		logger.info(u"Deleting %d licenseContracts" % len(licenseContracts))
+		self._deleteObjects('LICENSE_CONTRACT', licenseContracts)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   SoftwareLicenses                                                                          -
@@ -1564,6 +2687,14 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(softwareLicense)
 		self._sql.update('SOFTWARE_LICENSE', where, data)
 
+	def softwareLicense_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return []
+
+		logger.info(u"Getting softwareLicense hashes, filter: %s" % filter)
+		return self._getHashes(SoftwareLicense, 'SOFTWARE_LICENSE', attributes, filter)
+
 	def softwareLicense_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
 			logger.warning(u"License management module disabled")
@@ -1571,12 +2702,7 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.softwareLicense_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting softwareLicenses, filter: %s" % filter)
-		softwareLicenses = []
-		(attributes, filter) = self._adjustAttributes(SoftwareLicense, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('SOFTWARE_LICENSE', attributes, filter)):
-			self._adjustResult(SoftwareLicense, res)
-			softwareLicenses.append(SoftwareLicense.fromHash(res))
-		return softwareLicenses
+		return self._getObjects(SoftwareLicense, 'SOFTWARE_LICENSE', attributes, filter)
 
 	def softwareLicense_deleteObjects(self, softwareLicenses):
 		if not self._licenseManagementModule:
@@ -1584,18 +2710,29 @@ class SQLBackend(ConfigDataBackend):
 			return
 
 		ConfigDataBackend.softwareLicense_deleteObjects(self, softwareLicenses)
-		for softwareLicense in forceObjectClassList(softwareLicenses, SoftwareLicense):
-			logger.info(u"Deleting softwareLicense %s" % softwareLicense)
-			where = self._uniqueCondition(softwareLicense)
-			self._sql.delete('SOFTWARE_LICENSE', where)
+		softwareLicenses = forceObjectClassList(softwareLicenses, SoftwareLicense)
+		logger.info(u"Deleting %d softwareLicenses" % len(softwareLicenses))
+		self._deleteObjects('SOFTWARE_LICENSE', softwareLicenses)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   LicensePools                                                                              -
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-	def licensePool_insertObject(self, licensePool):
-		if not self._licenseManagementModule:
-			logger.warning(u"License management module disabled")
-			return
+	def _modulesSignatureValid(self):
+		"""
+		Verifies the signature of the opsi modules. The result is cached
+		with a hash of the content of the modules file, which holds the
+		modules and their signature, so backend_info() and the RSA check
+		only run again after the content changed.
+		"""
+		modulesFile = getattr(self, '_opsiModulesFile', self.MODULES_FILE)
+		try:
+			with open(modulesFile, 'rb') as f:
+				fileHash = md5(f.read()).hexdigest()
+		except Exception:
+			fileHash = None
+		cached = _modulesSignatureCache.get(modulesFile)
+		if cached and fileHash is not None and cached[0] == fileHash:
+			return cached[1]
 
 		backendinfo = self._context.backend_info()
 		modules = backendinfo['modules']
@@ -1617,7 +2754,17 @@ class SQLBackend(ConfigDataBackend):
 				if (val == True):  val = 'yes'
 
 			data += u'%s = %s\r\n' % (module.lower().strip(), val)
-		if not bool(publicKey.verify(md5(data).digest(), [ long(modules['signature']) ])):
+		valid = bool(publicKey.verify(md5(data).digest(), [ long(modules['signature']) ]))
+		if fileHash is not None:
+			_modulesSignatureCache[modulesFile] = (fileHash, valid)
+		return valid
+
+	def licensePool_insertObject(self, licensePool):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return
+
+		if not self._modulesSignatureValid():
 			logger.error(u"Failed to verify modules signature")
 			return
 
@@ -1627,14 +2774,16 @@ class SQLBackend(ConfigDataBackend):
 		del data['productIds']
 
 		where = self._uniqueCondition(licensePool)
+		batch = self._sql.batch()
 		if self._sql.getRow('select * from "LICENSE_POOL" where %s' % where):
-			self._sql.update('LICENSE_POOL', where, data, updateWhereNone=True)
+			batch.update('LICENSE_POOL', where, data, updateWhereNone=True)
 		else:
-			self._sql.insert('LICENSE_POOL', data)
+			batch.insert('LICENSE_POOL', data)
 
-		self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', "\"licensePoolId\" = '%s'" % data['licensePoolId'])
+		batch.delete('PRODUCT_ID_TO_LICENSE_POOL', "\"licensePoolId\" = '%s'" % data['licensePoolId'])
 		for productId in productIds:
-			self._sql.insert('PRODUCT_ID_TO_LICENSE_POOL', {'productId': productId, 'licensePoolId': data['licensePoolId']})
+			batch.insert('PRODUCT_ID_TO_LICENSE_POOL', {'productId': productId, 'licensePoolId': data['licensePoolId']})
+		batch.flush()
 
 	def licensePool_updateObject(self, licensePool):
 		if not self._licenseManagementModule:
@@ -1646,10 +2795,20 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(licensePool)
 		productIds = data['productIds']
 		del data['productIds']
-		self._sql.update('LICENSE_POOL', where, data)
-		self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', "\"licensePoolId\" = '%s'" % data['licensePoolId'])
+		batch = self._sql.batch()
+		batch.update('LICENSE_POOL', where, data)
+		batch.delete('PRODUCT_ID_TO_LICENSE_POOL', "\"licensePoolId\" = '%s'" % data['licensePoolId'])
 		for productId in productIds:
-			self._sql.insert('PRODUCT_ID_TO_LICENSE_POOL', {'productId': productId, 'licensePoolId': data['licensePoolId']})
+			batch.insert('PRODUCT_ID_TO_LICENSE_POOL', {'productId': productId, 'licensePoolId': data['licensePoolId']})
+		batch.flush()
+
+	def licensePool_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return []
+
+		logger.info(u"Getting licensePool hashes, filter: %s" % filter)
+		return self._toOpsiHashes(self._licensePoolHashes(attributes, filter, hashesOnly=True), LicensePool)
 
 	def licensePool_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
@@ -1658,30 +2817,29 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licensePool_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting licensePools, filter: %s" % filter)
-		licensePools = []
-		(attributes, filter) = self._adjustAttributes(LicensePool, attributes, filter)
+		return [LicensePool.fromHash(res) for res in self._licensePoolHashes(attributes, filter)]
 
+	def _licensePoolHashes(self, attributes, filter, hashesOnly=False):
+		hashes = []
+		(attributes, filter) = self._adjustAttributes(LicensePool, attributes, filter, hashesOnly)
+
+		conditions = []
 		if filter.has_key('productIds'):
 			if filter['productIds']:
-				licensePoolIds = filter.get('licensePoolId')
-				filter['licensePoolId'] = []
-				for res in self._sql.getSet(self._createQuery('PRODUCT_ID_TO_LICENSE_POOL', ['licensePoolId'], {'licensePoolId': licensePoolIds, 'productId': filter['productIds']})):
-					filter['licensePoolId'].append(res['licensePoolId'])
-				if not filter['licensePoolId']:
-					return []
+				conditions.append(self._existsCondition('PRODUCT_ID_TO_LICENSE_POOL', 'LICENSE_POOL', 'licensePoolId', {'productId': filter['productIds']}))
 			del filter['productIds']
 		attrs = []
 		for attr in attributes:
 			if not attr in ('productIds',):
 				attrs.append(attr)
-		for res in self._sql.getSet(self._createQuery('LICENSE_POOL', attrs, filter)):
+		for res in self._sql.getSet(self._createQuery('LICENSE_POOL', attrs, filter, conditions)):
 			res['productIds'] = []
 			if not attributes or 'productIds' in attributes:
-				for res2 in self._sql.getSet(u"select * from PRODUCT_ID_TO_LICENSE_POOL where \"licensePoolId\" = '%s'" % res['licensePoolId']):
+				for res2 in self._sql.getSet(u"select * from \"PRODUCT_ID_TO_LICENSE_POOL\" where \"licensePoolId\" = '%s'" % res['licensePoolId']):
 					res['productIds'].append(res2['productId'])
 			self._adjustResult(LicensePool, res)
-			licensePools.append(LicensePool.fromHash(res))
-		return licensePools
+			hashes.append(res)
+		return hashes
 
 	def licensePool_deleteObjects(self, licensePools):
 		if not self._licenseManagementModule:
@@ -1689,11 +2847,9 @@ class SQLBackend(ConfigDataBackend):
 			return
 
 		ConfigDataBackend.licensePool_deleteObjects(self, licensePools)
-		for licensePool in forceObjectClassList(licensePools, LicensePool):
-			logger.info(u"Deleting licensePool %s" % licensePool)
-			where = self._uniqueCondition(licensePool)
-			self._sql.delete('PRODUCT_ID_TO_LICENSE_POOL', "\"licensePoolId\" = '%s'" % licensePool.id)
-			self._sql.delete('LICENSE_POOL', where)
+		licensePools = forceObjectClassList(licensePools, LicensePool)
+		logger.info(u"Deleting %d licensePools" % len(licensePools))
+		self._deleteObjects(('PRODUCT_ID_TO_LICENSE_POOL', 'LICENSE_POOL'), licensePools)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   SoftwareLicenseToLicensePools                                                             -
@@ -1722,6 +2878,14 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(softwareLicenseToLicensePool)
 		self._sql.update('SOFTWARE_LICENSE_TO_LICENSE_POOL', where, data)
 
+	def softwareLicenseToLicensePool_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return []
+
+		logger.info(u"Getting softwareLicenseToLicensePool hashes, filter: %s" % filter)
+		return self._getHashes(SoftwareLicenseToLicensePool, 'SOFTWARE_LICENSE_TO_LICENSE_POOL', attributes, filter)
+
 	def softwareLicenseToLicensePool_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
 			logger.warning(u"License management module disabled")
@@ -1729,11 +2893,7 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.softwareLicenseToLicensePool_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting softwareLicenseToLicensePool, filter: %s" % filter)
-		softwareLicenseToLicensePools = []
-		(attributes, filter) = self._adjustAttributes(SoftwareLicenseToLicensePool, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('SOFTWARE_LICENSE_TO_LICENSE_POOL', attributes, filter)):
-			softwareLicenseToLicensePools.append(SoftwareLicenseToLicensePool.fromHash(res))
-		return softwareLicenseToLicensePools
+		return self._getObjects(SoftwareLicenseToLicensePool, 'SOFTWARE_LICENSE_TO_LICENSE_POOL', attributes, filter)
 
 	def softwareLicenseToLicensePool_deleteObjects(self, softwareLicenseToLicensePools):
 		if not self._licenseManagementModule:
@@ -1741,10 +2901,9 @@ class SQLBackend(ConfigDataBackend):
 			return
 
 		ConfigDataBackend.softwareLicenseToLicensePool_deleteObjects(self, softwareLicenseToLicensePools)
-		for softwareLicenseToLicensePool in forceObjectClassList(softwareLicenseToLicensePools, SoftwareLicenseToLicensePool):
-			logger.info(u"Deleting softwareLicenseToLicensePool %s" % softwareLicenseToLicensePool)
-			where = self._uniqueCondition(softwareLicenseToLicensePool)
-			self._sql.delete('SOFTWARE_LICENSE_TO_LICENSE_POOL', where)
+		softwareLicenseToLicensePools = forceObjectClassList(softwareLicenseToLicensePools, SoftwareLicenseToLicensePool)
+		logger.info(u"Deleting %d softwareLicenseToLicensePools" % len(softwareLicenseToLicensePools))
+		self._deleteObjects('SOFTWARE_LICENSE_TO_LICENSE_POOL', softwareLicenseToLicensePools)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   LicenseOnClients                                                                          -
@@ -1773,6 +2932,14 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(licenseOnClient)
 		self._sql.update('LICENSE_ON_CLIENT', where, data)
 
+	def licenseOnClient_getHashes(self, attributes=[], **filter):
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return []
+
+		logger.info(u"Getting licenseOnClient hashes, filter: %s" % filter)
+		return self._getHashes(LicenseOnClient, 'LICENSE_ON_CLIENT', attributes, filter)
+
 	def licenseOnClient_getObjects(self, attributes=[], **filter):
 		if not self._licenseManagementModule:
 			logger.warning(u"License management module disabled")
@@ -1780,11 +2947,7 @@ class SQLBackend(ConfigDataBackend):
 
 		ConfigDataBackend.licenseOnClient_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting licenseOnClient, filter: %s" % filter)
-		licenseOnClients = []
-		(attributes, filter) = self._adjustAttributes(LicenseOnClient, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('LICENSE_ON_CLIENT', attributes, filter)):
-			licenseOnClients.append(LicenseOnClient.fromHash(res))
-		return licenseOnClients
+		return self._getObjects(LicenseOnClient, 'LICENSE_ON_CLIENT', attributes, filter)
 
 	def licenseOnClient_deleteObjects(self, licenseOnClients):
 		if not self._licenseManagementModule:
@@ -1792,10 +2955,106 @@ class SQLBackend(ConfigDataBackend):
 			return
 
 		ConfigDataBackend.licenseOnClient_deleteObjects(self, licenseOnClients)
-		for licenseOnClient in forceObjectClassList(licenseOnClients, LicenseOnClient):
-			logger.info(u"Deleting licenseOnClient %s" % licenseOnClient)
-			where = self._uniqueCondition(licenseOnClient)
-			self._sql.delete('LICENSE_ON_CLIENT', where)
+		licenseOnClients = forceObjectClassList(licenseOnClients, LicenseOnClient)
+		logger.info(u"Deleting %d licenseOnClients" % len(licenseOnClients))
+		self._deleteObjects('LICENSE_ON_CLIENT', licenseOnClients)
+
+	def licenseOnClient_allocate(self, clientId, licensePoolId=None, productId=None):
+		"""
+		Allocates a free software license of the license pool ( or of
+		the license pools of the product ) to the client and returns
+		the new licenseOnClient, an already allocated one is returned
+		as it is.
+
+		Expired licenses are never allocated. Candidate licenses are
+		locked with FOR UPDATE SKIP LOCKED, so concurrent allocations
+		for different clients take different licenses instead of waiting
+		for each other.
+		"""
+		if not self._licenseManagementModule:
+			logger.warning(u"License management module disabled")
+			return None
+
+		clientId = forceHostId(clientId)
+		if licensePoolId:
+			licensePoolIds = [forceLicensePoolId(licensePoolId)]
+		elif productId:
+			rows = self._sql.getSet(u'select "licensePoolId" from "PRODUCT_ID_TO_LICENSE_POOL" where "productId" = {0}'.format(self._sql._toSqlValue(forceProductId(productId))))
+			licensePoolIds = [row['licensePoolId'] for row in rows]
+			if not licensePoolIds:
+				raise LicenseConfigurationError(u"No license pool for product id '%s' found" % productId)
+		else:
+			raise BackendBadValueError(u"Either licensePoolId or productId has to be given")
+
+		# Every query after a row lock has to see the rows committed while
+		# waiting for it, so the allocation runs in READ COMMITTED
+		return self._sql.runTransaction(self._allocateLicense, clientId, licensePoolIds, isolationLevel=u'READ COMMITTED')
+
+	def _allocateLicense(self, clientId, licensePoolIds):
+		# Allocations for the same client are serialized on its host row,
+		# so two of them can not both find the client without a license.
+		if not self._sql.getRow(
+			u'select 1 from "HOST" where "hostId" = {0} FOR UPDATE'.format(self._sql._toSqlValue(clientId))
+		):
+			raise BackendMissingDataError(u"Client '%s' not found" % clientId)
+
+		pools = self._sql.arrayLiteral(licensePoolIds)
+		row = self._sql.getRow(
+			u'select * from "LICENSE_ON_CLIENT" where "clientId" = {0} and "licensePoolId" = ANY({1}) limit 1'.format(self._sql._toSqlValue(clientId), pools)
+		)
+		if row:
+			return LicenseOnClient.fromHash(row)
+
+		exhausted = []
+		while True:
+			# Skipped licenses may hold the last free installations,
+			# so wait for them before giving up.
+			license = self._sql.getRow(self._freeLicenseQuery(clientId, pools, exhausted, skipLocked=True)) \
+				or self._sql.getRow(self._freeLicenseQuery(clientId, pools, exhausted, skipLocked=False))
+			if not license:
+				raise LicenseMissingError(u"No license available for client '%s' in license pools %s" % (clientId, licensePoolIds))
+
+			if license['maxInstallations']:
+				# The candidate query may have counted before the lock was
+				# granted, count again with a fresh snapshot under the lock.
+				used = self._sql.getRow(
+					u'select count(*) as "used" from "LICENSE_ON_CLIENT" where "softwareLicenseId" = {0}'.format(self._sql._toSqlValue(license['softwareLicenseId']))
+				)['used']
+				if used >= license['maxInstallations']:
+					exhausted.append(license['softwareLicenseId'])
+					continue
+
+			licenseOnClient = LicenseOnClient(
+				softwareLicenseId=license['softwareLicenseId'],
+				licensePoolId=license['licensePoolId'],
+				clientId=clientId,
+				licenseKey=license['licenseKey']
+			)
+			self._sql.insert('LICENSE_ON_CLIENT', self._objectToDatabaseHash(licenseOnClient))
+			logger.info(u"Allocated software license '%s' of license pool '%s' to client '%s'" % (license['softwareLicenseId'], license['licensePoolId'], clientId))
+			return licenseOnClient
+
+	def _freeLicenseQuery(self, clientId, pools, exhausted, skipLocked):
+		client = self._sql._toSqlValue(clientId)
+		conditions = [
+			u'sltlp."licensePoolId" = ANY({0})'.format(pools),
+			u'(sl."boundToHost" is NULL or sl."boundToHost" = \'\' or sl."boundToHost" = {0})'.format(client),
+			u'(sl."expirationDate" = \'0001-01-01 00:00:00\' or sl."expirationDate" > LOCALTIMESTAMP)',
+			u'(COALESCE(sl."maxInstallations", 0) = 0 or sl."maxInstallations" > '
+			u'(select count(*) from "LICENSE_ON_CLIENT" AS loc where loc."softwareLicenseId" = sl."softwareLicenseId"))'
+		]
+		if exhausted:
+			conditions.append(u'NOT (sl."softwareLicenseId" = ANY({0}))'.format(self._sql.arrayLiteral(exhausted)))
+
+		# Licenses bound to the client come first.
+		return (
+			u'select sl."softwareLicenseId", sl."maxInstallations", sltlp."licensePoolId", sltlp."licenseKey" '
+			u'from "SOFTWARE_LICENSE" AS sl '
+			u'join "SOFTWARE_LICENSE_TO_LICENSE_POOL" AS sltlp on sltlp."softwareLicenseId" = sl."softwareLicenseId" '
+			u'where {0} '
+			u'order by COALESCE(sl."boundToHost" = {1}, false) desc, sl."softwareLicenseId" '
+			u'limit 1 FOR UPDATE OF sl{2}'
+		).format(u' and '.join(conditions), client, skipLocked and u' SKIP LOCKED' or u'')
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditSoftwares                                                                            -
@@ -1817,23 +3076,18 @@ class SQLBackend(ConfigDataBackend):
 		self._sql.update('SOFTWARE', where, data)
 
 	def auditSoftware_getHashes(self, attributes=[], **filter):
-		(attributes, filter) = self._adjustAttributes(AuditSoftware, attributes, filter)
-		return self._sql.getSet(self._createQuery('SOFTWARE', attributes, filter))
+		return self._getHashes(AuditSoftware, 'SOFTWARE', attributes, filter)
 
 	def auditSoftware_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.auditSoftware_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting auditSoftware, filter: %s" % filter)
-		auditSoftwares = []
-		for h in self.auditSoftware_getHashes(attributes, **filter):
-			auditSoftwares.append(AuditSoftware.fromHash(h))
-		return auditSoftwares
+		return self._getObjects(AuditSoftware, 'SOFTWARE', attributes, filter)
 
 	def auditSoftware_deleteObjects(self, auditSoftwares):
 		ConfigDataBackend.auditSoftware_deleteObjects(self, auditSoftwares)
-		for auditSoftware in forceObjectClassList(auditSoftwares, AuditSoftware):
-			logger.info(u"Deleting auditSoftware %s" % auditSoftware)
-			where = self._uniqueCondition(auditSoftware)
-			self._sql.delete('SOFTWARE', where)
+		auditSoftwares = forceObjectClassList(auditSoftwares, AuditSoftware)
+		logger.info(u"Deleting %d auditSoftwares" % len(auditSoftwares))
+		self._deleteObjects('SOFTWARE', auditSoftwares)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditSoftwareToLicensePools                                                               -
@@ -1855,23 +3109,18 @@ class SQLBackend(ConfigDataBackend):
 		self._sql.update('AUDIT_SOFTWARE_TO_LICENSE_POOL', where, data)
 
 	def auditSoftwareToLicensePool_getHashes(self, attributes=[], **filter):
-		(attributes, filter) = self._adjustAttributes(AuditSoftwareToLicensePool, attributes, filter)
-		return self._sql.getSet(self._createQuery('AUDIT_SOFTWARE_TO_LICENSE_POOL', attributes, filter))
+		return self._getHashes(AuditSoftwareToLicensePool, 'AUDIT_SOFTWARE_TO_LICENSE_POOL', attributes, filter)
 
 	def auditSoftwareToLicensePool_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.auditSoftwareToLicensePool_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting auditSoftwareToLicensePool, filter: %s" % filter)
-		auditSoftwareToLicensePools = []
-		for h in self.auditSoftwareToLicensePool_getHashes(attributes, **filter):
-			auditSoftwareToLicensePools.append(AuditSoftwareToLicensePool.fromHash(h))
-		return auditSoftwareToLicensePools
+		return self._getObjects(AuditSoftwareToLicensePool, 'AUDIT_SOFTWARE_TO_LICENSE_POOL', attributes, filter)
 
 	def auditSoftwareToLicensePool_deleteObjects(self, auditSoftwareToLicensePools):
 		ConfigDataBackend.auditSoftwareToLicensePool_deleteObjects(self, auditSoftwareToLicensePools)
-		for auditSoftwareToLicensePool in forceObjectClassList(auditSoftwareToLicensePools, AuditSoftwareToLicensePool):
-			logger.info(u"Deleting auditSoftware %s" % auditSoftwareToLicensePool)
-			where = self._uniqueCondition(auditSoftwareToLicensePool)
-			self._sql.delete('AUDIT_SOFTWARE_TO_LICENSE_POOL', where)
+		auditSoftwareToLicensePools = forceObjectClassList(auditSoftwareToLicensePools, AuditSoftwareToLicensePool)
+		logger.info(u"Deleting %d auditSoftwareToLicensePools" % len(auditSoftwareToLicensePools))
+		self._deleteObjects('AUDIT_SOFTWARE_TO_LICENSE_POOL', auditSoftwareToLicensePools)
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditSoftwareOnClients                                                                    -
@@ -1895,31 +3144,121 @@ class SQLBackend(ConfigDataBackend):
 		self._sql.update('SOFTWARE_CONFIG', where, data)
 
 	def auditSoftwareOnClient_getHashes(self, attributes=[], **filter):
-		(attributes, filter) = self._adjustAttributes(AuditSoftwareOnClient, attributes, filter)
-		result = self._sql.getSet(self._createQuery('SOFTWARE_CONFIG', attributes, filter))
+		result = self._getHashes(AuditSoftwareOnClient, 'SOFTWARE_CONFIG', attributes, filter)
 
 		# this fixes the problem that datetime.datetime types cannot be converted to json
 		# convert them to str first
 		for r in result:
-			r['lastUsed'] = str(r['lastUsed'])
-			r['firstseen'] = str(r['firstseen'])
-			r['lastseen'] = str(r['lastseen'])
+			for attribute in ('lastUsed', 'firstseen', 'lastseen'):
+				if attribute in r:
+					r[attribute] = str(r[attribute])
 		return result
 
 	def auditSoftwareOnClient_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.auditSoftwareOnClient_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting auditSoftwareOnClient, filter: %s" % filter)
-		auditSoftwareOnClients = []
-		for h in self.auditSoftwareOnClient_getHashes(attributes, **filter):
-			auditSoftwareOnClients.append(AuditSoftwareOnClient.fromHash(h))
-		return auditSoftwareOnClients
+		return self._getObjects(AuditSoftwareOnClient, 'SOFTWARE_CONFIG', attributes, filter)
 
 	def auditSoftwareOnClient_deleteObjects(self, auditSoftwareOnClients):
 		ConfigDataBackend.auditSoftwareOnClient_deleteObjects(self, auditSoftwareOnClients)
+		auditSoftwareOnClients = forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient)
+		logger.info(u"Deleting %d auditSoftwareOnClients" % len(auditSoftwareOnClients))
+		self._deleteObjects('SOFTWARE_CONFIG', auditSoftwareOnClients)
+
+	def auditSoftwareOnClient_syncInventory(self, clientId, auditSoftwareOnClients, auditSoftwares=[]):
+		"""
+		Replaces the software inventory of a client with the uploaded one.
+
+		The upload is staged into a temporary table and merged into
+		SOFTWARE and SOFTWARE_CONFIG with a few set based statements in
+		one transaction: new entries are inserted, known entries get
+		their lastseen and state updated and entries missing in the
+		upload are marked as not installed (state 0).
+		"""
+		clientId = forceHostId(clientId)
+		softwareKey = ('name', 'version', 'subVersion', 'language', 'architecture')
+		softwareColumns = softwareKey + ('windowsSoftwareId', 'windowsDisplayName', 'windowsDisplayVersion', 'type', 'installSize')
+		stagingColumns = softwareKey + ('uninstallString', 'binaryName', 'firstseen', 'lastseen', 'state', 'usageFrequency', 'lastUsed', 'licenseKey')
+
+		softwares = {}
+		for auditSoftware in forceObjectClassList(auditSoftwares, AuditSoftware):
+			data = self._objectToDatabaseHash(auditSoftware)
+			softwares[tuple([data[key] for key in softwareKey])] = data
+
+		rows = {}
 		for auditSoftwareOnClient in forceObjectClassList(auditSoftwareOnClients, AuditSoftwareOnClient):
-			logger.info(u"Deleting auditSoftwareOnClient %s" % auditSoftwareOnClient)
-			where = self._uniqueCondition(auditSoftwareOnClient)
-			self._sql.delete('SOFTWARE_CONFIG', where)
+			if auditSoftwareOnClient.clientId != clientId:
+				raise BackendBadValueError(u"Software %s does not belong to client '%s'" % (auditSoftwareOnClient, clientId))
+			data = self._objectToDatabaseHash(auditSoftwareOnClient)
+			if data['lastUsed'] == '0000-00-00 00:00:00':
+				data['lastUsed'] = '0001-01-01 00:00:00'
+			rows[tuple([data[key] for key in softwareKey])] = data
+
+		logger.info(u"Syncing software inventory of client '%s': %d entries" % (clientId, len(rows)))
+		match = u' AND '.join([u'sc."{0}" = t."{0}"'.format(key) for key in softwareKey])
+		client = self._sql._toSqlValue(clientId)
+
+		batch = self._sql.batch()
+		if softwares:
+			batch.execute(self._sql._insertRowsQuery('SOFTWARE', softwareColumns, softwares.values(),
+				u' ON CONFLICT ({0}) DO UPDATE SET {1}'.format(
+					u', '.join([u'"{0}"'.format(key) for key in softwareKey]),
+					u', '.join([u'"{0}" = EXCLUDED."{0}"'.format(column) for column in softwareColumns[len(softwareKey):]])
+				)
+			))
+
+		batch.execute(u'''CREATE TEMPORARY TABLE "SOFTWARE_CONFIG_SYNC" (
+				"name" varchar(100) NOT NULL,
+				"version" varchar(100) NOT NULL,
+				"subVersion" varchar(100) NOT NULL,
+				"language" varchar(10) NOT NULL,
+				"architecture" varchar(3) NOT NULL,
+				"uninstallString" varchar(200),
+				"binaryName" varchar(100),
+				"firstseen" TIMESTAMP,
+				"lastseen" TIMESTAMP,
+				"state" SMALLINT,
+				"usageFrequency" integer,
+				"lastUsed" TIMESTAMP,
+				"licenseKey" VARCHAR(1024)
+			) ON COMMIT DROP''')
+		if rows:
+			batch.execute(self._sql._insertRowsQuery('SOFTWARE_CONFIG_SYNC', stagingColumns, rows.values()))
+			# Software only known by the client entries
+			batch.execute(
+				u'INSERT INTO "SOFTWARE" ({0}, "type") SELECT DISTINCT {1}, \'AuditSoftware\' '
+				u'FROM "SOFTWARE_CONFIG_SYNC" AS t ON CONFLICT DO NOTHING'.format(
+					u', '.join([u'"{0}"'.format(key) for key in softwareKey]),
+					u', '.join([u't."{0}"'.format(key) for key in softwareKey])
+				)
+			)
+
+		batch.execute(
+			u'UPDATE "SOFTWARE_CONFIG" AS sc SET '
+			u'"uninstallString" = t."uninstallString", "binaryName" = t."binaryName", "licenseKey" = t."licenseKey", '
+			u'"usageFrequency" = COALESCE(t."usageFrequency", sc."usageFrequency"), "lastUsed" = COALESCE(t."lastUsed", sc."lastUsed"), '
+			u'"lastseen" = COALESCE(t."lastseen", now()), "state" = COALESCE(t."state", 1) '
+			u'FROM "SOFTWARE_CONFIG_SYNC" AS t WHERE sc."clientId" = {0} AND {1}'.format(client, match)
+		)
+		batch.execute(
+			u'INSERT INTO "SOFTWARE_CONFIG" ("clientId", {0}, "uninstallString", "binaryName", "licenseKey", '
+			u'"firstseen", "lastseen", "state", "usageFrequency", "lastUsed") '
+			u'SELECT {1}, {2}, t."uninstallString", t."binaryName", t."licenseKey", '
+			u'COALESCE(t."firstseen", now()), COALESCE(t."lastseen", now()), COALESCE(t."state", 1), '
+			u'COALESCE(t."usageFrequency", -1), COALESCE(t."lastUsed", \'0001-01-01 00:00:00\') '
+			u'FROM "SOFTWARE_CONFIG_SYNC" AS t WHERE NOT EXISTS '
+			u'(SELECT 1 FROM "SOFTWARE_CONFIG" AS sc WHERE sc."clientId" = {1} AND {3})'.format(
+				u', '.join([u'"{0}"'.format(key) for key in softwareKey]),
+				client,
+				u', '.join([u't."{0}"'.format(key) for key in softwareKey]),
+				match
+			)
+		)
+		batch.execute(
+			u'UPDATE "SOFTWARE_CONFIG" AS sc SET "state" = 0 WHERE sc."clientId" = {0} AND sc."state" <> 0 '
+			u'AND NOT EXISTS (SELECT 1 FROM "SOFTWARE_CONFIG_SYNC" AS t WHERE {1})'.format(client, match)
+		)
+		batch.flush()
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditHardwares                                                                            -
@@ -2002,20 +3341,21 @@ class SQLBackend(ConfigDataBackend):
 		return self._auditHardware_search(returnHardwareIds = False, attributes = attributes, **filter)
 
 	def _auditHardware_search(self, returnHardwareIds=False, attributes=[], **filter):
+		self._checkNoPaging(filter)
 		results = []
 		hardwareClasses = []
 		hardwareClass = filter.get('hardwareClass')
 		if not hardwareClass in ([], None):
 			for hwc in forceUnicodeList(hardwareClass):
 				regex = re.compile(u'^' + hwc.replace('*', '.*') + u'$')
-				for key in self._auditHardwareConfig.keys():
+				for key in self._getAuditHardwareConfig().keys():
 					if regex.search(key):
 						if not key in hardwareClasses:
 							hardwareClasses.append(key)
 			if not hardwareClasses:
 				return results
 		if not hardwareClasses:
-			for key in self._auditHardwareConfig.keys():
+			for key in self._getAuditHardwareConfig().keys():
 				hardwareClasses.append(key)
 
 		for unwanted_key in ('hardwareClass', 'type'):
@@ -2037,7 +3377,7 @@ class SQLBackend(ConfigDataBackend):
 			classFilter = {}
 			skipHardwareClass = False
 			for (attribute, value) in filter.items():
-				valueInfo = self._auditHardwareConfig[hardwareClass].get(attribute)
+				valueInfo = self._getAuditHardwareConfig()[hardwareClass].get(attribute)
 				if not valueInfo:
 					skipHardwareClass = True
 					logger.debug(u"Skipping hardwareClass '%s', because of missing info for attribute '%s'" % (hardwareClass, attribute))
@@ -2063,7 +3403,7 @@ class SQLBackend(ConfigDataBackend):
 				elif 'hardware_id' in res:
 					del res['hardware_id']
 				res['hardwareClass'] = hardwareClass
-				for (attribute, valueInfo) in self._auditHardwareConfig[hardwareClass].items():
+				for (attribute, valueInfo) in self._getAuditHardwareConfig()[hardwareClass].items():
 					if (valueInfo.get('Scope', 'g') == 'i'):
 						continue
 					if attribute not in res:
@@ -2073,13 +3413,19 @@ class SQLBackend(ConfigDataBackend):
 
 	def auditHardware_deleteObjects(self, auditHardwares):
 		ConfigDataBackend.auditHardware_deleteObjects(self, auditHardwares)
+		hardwareIds = {}
 		for auditHardware in forceObjectClassList(auditHardwares, AuditHardware):
 			logger.info(u"Deleting auditHardware: %s" % auditHardware)
+			hardwareIds.setdefault(auditHardware.getHardwareClass(), []).extend(self._getHardwareIds(auditHardware))
 
-			where = self._uniqueAuditHardwareCondition(auditHardware)
-			for hardware_id in self._getHardwareIds(auditHardware):
-				self._sql.delete( u'HARDWARE_CONFIG_' + auditHardware.getHardwareClass(), u'"hardware_id" = %s' % hardware_id)
-			self._sql.delete( u'HARDWARE_DEVICE_' + auditHardware.getHardwareClass(), where)
+		batch = self._sql.batch()
+		for (hardwareClass, ids) in hardwareIds.items():
+			if not ids:
+				continue
+			where = u'"hardware_id" = ANY({0})'.format(self._sql.arrayLiteral(ids))
+			batch.delete(u'HARDWARE_CONFIG_' + hardwareClass, where)
+			batch.delete(u'HARDWARE_DEVICE_' + hardwareClass, where)
+		batch.flush()
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   AuditHardwareOnHosts                                                                      -
@@ -2102,7 +3448,7 @@ class SQLBackend(ConfigDataBackend):
 				auditHardware[attribute] = value
 				auditHardwareOnHostNew[attribute] = value
 				continue
-			valueInfo = self._auditHardwareConfig[hardwareClass].get(attribute)
+			valueInfo = self._getAuditHardwareConfig()[hardwareClass].get(attribute)
 			if valueInfo is None:
 				raise BackendConfigurationError(u"Attribute '%s' not found in config of hardware class '%s'" % (attribute, hardwareClass))
 			if valueInfo.get('Scope', '') == 'g':
@@ -2190,20 +3536,21 @@ class SQLBackend(ConfigDataBackend):
 			self._sql.update('HARDWARE_CONFIG_%s' % auditHardwareOnHost.hardwareClass, where, update)
 
 	def auditHardwareOnHost_getHashes(self, attributes=[], **filter):
+		self._checkNoPaging(filter)
 		hashes = []
 		hardwareClasses = []
 		hardwareClass = filter.get('hardwareClass')
 		if not hardwareClass in ([], None):
 			for hwc in forceUnicodeList(hardwareClass):
 				regex = re.compile(u'^' + hwc.replace('*', '.*') + u'$')
-				for key in self._auditHardwareConfig.keys():
+				for key in self._getAuditHardwareConfig().keys():
 					if regex.search(key):
 						if not key in hardwareClasses:
 							hardwareClasses.append(key)
 			if not hardwareClasses:
 				return hashes
 		if not hardwareClasses:
-			for key in self._auditHardwareConfig.keys():
+			for key in self._getAuditHardwareConfig().keys():
 				hardwareClasses.append(key)
 
 		for unwanted_key in ('hardwareClass', 'type'):
@@ -2223,7 +3570,7 @@ class SQLBackend(ConfigDataBackend):
 			for (attribute, value) in filter.items():
 				valueInfo = None
 				if not attribute in ('hostId', 'state', 'firstseen', 'lastseen'):
-					valueInfo = self._auditHardwareConfig[hardwareClass].get(attribute)
+					valueInfo = self._getAuditHardwareConfig()[hardwareClass].get(attribute)
 					if not valueInfo:
 						logger.debug(u"Skipping hardwareClass '%s', because of missing info for attribute '%s'" % (hardwareClass, attribute))
 						skipHardwareClass = True
@@ -2268,7 +3615,7 @@ class SQLBackend(ConfigDataBackend):
                                 except KeyError:
                                         pass # not there - everything okay
 
-				for attribute in self._auditHardwareConfig[hardwareClass].keys():
+				for attribute in self._getAuditHardwareConfig()[hardwareClass].keys():
 					if attribute not in data:
 						data[attribute] = None
 				hashes.append(data)
@@ -2285,10 +3632,16 @@ class SQLBackend(ConfigDataBackend):
 
 	def auditHardwareOnHost_deleteObjects(self, auditHardwareOnHosts):
 		ConfigDataBackend.auditHardwareOnHost_deleteObjects(self, auditHardwareOnHosts)
+		conditions = {}
 		for auditHardwareOnHost in forceObjectClassList(auditHardwareOnHosts, AuditHardwareOnHost):
 			logger.info(u"Deleting auditHardwareOnHost: %s" % auditHardwareOnHost)
 			where = self._uniqueAuditHardwareOnHostCondition(auditHardwareOnHost)
-			self._sql.delete( u'HARDWARE_CONFIG_' + auditHardwareOnHost.getHardwareClass(), where)
+			conditions.setdefault(auditHardwareOnHost.getHardwareClass(), []).append(where)
+
+		batch = self._sql.batch()
+		for (hardwareClass, wheres) in conditions.items():
+			batch.delete(u'HARDWARE_CONFIG_' + hardwareClass, u' or '.join([u'({0})'.format(where) for where in wheres]))
+		batch.flush()
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 	# -   BootConfigurations                                                                        -
@@ -2309,22 +3662,20 @@ class SQLBackend(ConfigDataBackend):
 		where = self._uniqueCondition(bootConfiguration)
 		self._sql.update('BOOT_CONFIGURATION', where, data)
 
+	def bootConfiguration_getHashes(self, attributes=[], **filter):
+		logger.info(u"Getting bootConfiguration hashes, filter: %s" % filter)
+		return self._getHashes(BootConfiguration, 'BOOT_CONFIGURATION', attributes, filter)
+
 	def bootConfiguration_getObjects(self, attributes=[], **filter):
 		ConfigDataBackend.bootConfiguration_getObjects(self, attributes=[], **filter)
 		logger.info(u"Getting bootConfigurations, filter: %s" % filter)
-		bootConfigurations = []
-		(attributes, filter) = self._adjustAttributes(BootConfiguration, attributes, filter)
-		for res in self._sql.getSet(self._createQuery('BOOT_CONFIGURATION', attributes, filter)):
-			self._adjustResult(BootConfiguration, res)
-			bootConfigurations.append(BootConfiguration.fromHash(res))
-		return bootConfigurations
+		return self._getObjects(BootConfiguration, 'BOOT_CONFIGURATION', attributes, filter)
 
 	def bootConfiguration_deleteObjects(self, bootConfigurations):
 		ConfigDataBackend.bootConfiguration_deleteObjects(self, bootConfigurations)
-		for bootConfiguration in forceObjectClassList(bootConfigurations, BootConfiguration):
-			logger.info(u"Deleting bootConfiguration %s" % bootConfiguration)
-			where = self._uniqueCondition(bootConfiguration)
-			self._sql.delete('BOOT_CONFIGURATION', where)
+		bootConfigurations = forceObjectClassList(bootConfigurations, BootConfiguration)
+		logger.info(u"Deleting %d bootConfigurations" % len(bootConfigurations))
+		self._deleteObjects('BOOT_CONFIGURATION', bootConfigurations)
 
 
 	# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
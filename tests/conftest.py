@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+The tests import the modules of this checkout as OPSI.Backend.Postgres,
+OPSI.Backend.SQLpg and OPSI.Backend.AsyncPostgres, so python-opsi,
+psycopg2, sqlalchemy and twisted have to be installed.
+
+Tests using the backend fixture need a database given by the
+environment variables OPSI_PG_TEST_ADDRESS, OPSI_PG_TEST_DATABASE,
+OPSI_PG_TEST_USERNAME and OPSI_PG_TEST_PASSWORD and are skipped without
+it. All tables of that database are dropped, never use a production
+database.
+"""
+
+import os
+
+import pytest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+	import OPSI.Backend
+except ImportError:
+	pass
+else:
+	OPSI.Backend.__path__.insert(0, REPOSITORY)
+
+
+def databaseConfig():
+	if not os.environ.get('OPSI_PG_TEST_DATABASE'):
+		return None
+	return {
+		'address': os.environ.get('OPSI_PG_TEST_ADDRESS', u'localhost'),
+		'database': os.environ['OPSI_PG_TEST_DATABASE'],
+		'username': os.environ.get('OPSI_PG_TEST_USERNAME', u'opsi'),
+		'password': os.environ.get('OPSI_PG_TEST_PASSWORD', u'opsi'),
+		'auditHardwareConfigFile': os.path.join(REPOSITORY, 'opsihwaudit.conf'),
+	}
+
+
+@pytest.fixture
+def offlineBackend():
+	"""
+	A backend without connection for the methods creating queries,
+	they only need the escaping of Postgres.
+	"""
+	from OPSI.Backend.Postgres import Postgres, PostgresBackend
+	backend = PostgresBackend.__new__(PostgresBackend)
+	backend._sql = Postgres.__new__(Postgres)
+	return backend
+
+
+@pytest.fixture
+def backend():
+	config = databaseConfig()
+	if not config:
+		pytest.skip(u"OPSI_PG_TEST_DATABASE not set")
+	from OPSI.Backend.Postgres import PostgresBackend
+	backend = PostgresBackend(**config)
+	backend.backend_deleteBase()
+	backend.backend_createBase()
+	yield backend
+	backend.backend_deleteBase()
+	backend.backend_exit()
+
+
+@pytest.fixture
+def objects(backend):
+	"""
+	Creates one or two objects of every class and returns them by
+	backend method prefix.
+	"""
+	from OPSI.Object import (
+		OpsiClient, OpsiDepotserver, UnicodeConfig, BoolConfig, ConfigState,
+		LocalbootProduct, UnicodeProductProperty, BoolProductProperty,
+		ProductDependency, ProductOnDepot, ProductOnClient, ProductPropertyState,
+		HostGroup, ObjectToGroup, LicenseContract, RetailSoftwareLicense,
+		LicensePool, SoftwareLicenseToLicensePool, LicenseOnClient,
+		AuditSoftware, AuditSoftwareOnClient, AuditSoftwareToLicensePool
+	)
+	backend._licenseManagementModule = True
+
+	depot = OpsiDepotserver(
+		id=u'depot.test.local', opsiHostKey=u'19012334567845645678901232789012',
+		depotLocalUrl=u'file:///var/lib/opsi/depot', depotRemoteUrl=u'smb://depot/opsi_depot',
+		repositoryLocalUrl=u'file:///var/lib/opsi/repository', repositoryRemoteUrl=u'webdavs://depot:4447/repository',
+		description=u'Depot', maxBandwidth=10000, isMasterDepot=True
+	)
+	client = OpsiClient(
+		id=u'client1.test.local', opsiHostKey=u'45656789789012789012345612340123',
+		description=u'Client', hardwareAddress=u'00:01:02:03:04:05', ipAddress=u'192.168.1.100',
+		created=u'2014-01-01 10:00:00', lastSeen=u'2014-02-01 10:00:00'
+	)
+	objects = {
+		'host': [depot, client],
+		'config': [
+			UnicodeConfig(id=u'clientconfig.depot.id', possibleValues=[depot.id], defaultValues=[depot.id], editable=True, multiValue=False),
+			BoolConfig(id=u'opsiclientd.event_gui_startup.active', defaultValues=[True]),
+		],
+		'product': [LocalbootProduct(id=u'firefox', productVersion=u'52.0', packageVersion=u'1', name=u'Firefox', setupScript=u'setup.ins', priority=10)],
+		'group': [HostGroup(id=u'lab', description=u'Lab')],
+		'licenseContract': [LicenseContract(id=u'contract1', partner=u'Vendor', conclusionDate=u'2014-01-01 00:00:00')],
+		'licensePool': [LicensePool(id=u'pool1', productIds=[u'firefox'])],
+		'auditSoftware': [AuditSoftware(name=u'Firefox', version=u'52.0', subVersion=u'', language=u'', architecture=u'x64', windowsDisplayName=u'Mozilla Firefox')],
+	}
+	objects['configState'] = [ConfigState(configId=u'clientconfig.depot.id', objectId=client.id, values=[depot.id])]
+	objects['productProperty'] = [
+		UnicodeProductProperty(productId=u'firefox', productVersion=u'52.0', packageVersion=u'1', propertyId=u'language',
+			possibleValues=[u'de', u'en'], defaultValues=[u'en'], editable=False, multiValue=False),
+		BoolProductProperty(productId=u'firefox', productVersion=u'52.0', packageVersion=u'1', propertyId=u'desktoplink', defaultValues=[False]),
+	]
+	objects['productDependency'] = [ProductDependency(productId=u'firefox', productVersion=u'52.0', packageVersion=u'1',
+		productAction=u'setup', requiredProductId=u'javavm', requiredInstallationStatus=u'installed', requirementType=u'before')]
+	objects['productOnDepot'] = [ProductOnDepot(productId=u'firefox', productType=u'LocalbootProduct',
+		productVersion=u'52.0', packageVersion=u'1', depotId=depot.id, locked=False)]
+	objects['productOnClient'] = [ProductOnClient(productId=u'firefox', productType=u'LocalbootProduct', clientId=client.id,
+		installationStatus=u'installed', actionRequest=u'none', actionResult=u'successful', productVersion=u'52.0',
+		packageVersion=u'1', modificationTime=u'2014-02-01 10:00:00')]
+	objects['productPropertyState'] = [ProductPropertyState(productId=u'firefox', propertyId=u'language', objectId=client.id, values=[u'de'])]
+	objects['objectToGroup'] = [ObjectToGroup(groupType=u'HostGroup', groupId=u'lab', objectId=client.id)]
+	objects['softwareLicense'] = [RetailSoftwareLicense(id=u'license1', licenseContractId=u'contract1', maxInstallations=1, boundToHost=client.id)]
+	objects['softwareLicenseToLicensePool'] = [SoftwareLicenseToLicensePool(softwareLicenseId=u'license1', licensePoolId=u'pool1', licenseKey=u'abc-123')]
+	objects['licenseOnClient'] = [LicenseOnClient(softwareLicenseId=u'license1', licensePoolId=u'pool1', clientId=client.id, licenseKey=u'abc-123')]
+	objects['auditSoftwareOnClient'] = [AuditSoftwareOnClient(name=u'Firefox', version=u'52.0', subVersion=u'', language=u'', architecture=u'x64',
+		clientId=client.id, uninstallString=u'uninstall.exe', firstseen=u'2014-01-01 10:00:00', lastseen=u'2014-02-01 10:00:00', state=1)]
+	objects['auditSoftwareToLicensePool'] = [AuditSoftwareToLicensePool(name=u'Firefox', version=u'52.0', subVersion=u'', language=u'', architecture=u'x64', licensePoolId=u'pool1')]
+
+	for prefix in (
+		'host', 'config', 'configState', 'product', 'productProperty', 'productDependency',
+		'productOnDepot', 'productOnClient', 'productPropertyState', 'group', 'objectToGroup',
+		'licenseContract', 'softwareLicense', 'licensePool', 'softwareLicenseToLicensePool',
+		'licenseOnClient', 'auditSoftware', 'auditSoftwareOnClient', 'auditSoftwareToLicensePool'):
+		getattr(backend, '%s_createObjects' % prefix)(objects[prefix])
+	return objects
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('twisted')
+pytest.importorskip('OPSI.Backend.AsyncPostgres')
+
+from twisted.internet import defer
+
+
+class FakeCursor(object):
+
+	def __init__(self, rows):
+		self.queries = []
+		self.description = [(column, ) for column in ('hostId', 'type')]
+		self.rowcount = len(rows)
+		self._rows = rows
+
+	def execute(self, query):
+		self.queries.append(query)
+		return defer.succeed(self)
+
+	def fetchall(self):
+		return self._rows
+
+
+class FakePool(object):
+
+	def __init__(self, cursor):
+		self.cursor = cursor
+
+	def runInteraction(self, interaction, *args, **kwargs):
+		return defer.maybeDeferred(interaction, self.cursor, *args, **kwargs)
+
+
+def asyncSql(rows=[]):
+	from OPSI.Backend.AsyncPostgres import AsyncPostgres
+	sql = AsyncPostgres.__new__(AsyncPostgres)
+	sql._pool = FakePool(FakeCursor(rows))
+	return sql
+
+
+def result(deferred):
+	results = []
+	deferred.addCallback(results.append)
+	assert results
+	return results[0]
+
+
+def testGetTuplesKeepsColumnOrder():
+	sql = asyncSql([{'type': u'OpsiClient', 'hostId': u'client1.test.local'}])
+	(columns, rows) = result(sql.getTuples(u'SELECT "hostId", "type" FROM "HOST"'))
+	assert columns == ['hostId', 'type']
+	assert rows == [(u'client1.test.local', u'OpsiClient')]
+
+
+def testDeleteUsesDeleteQuery():
+	sql = asyncSql()
+	assert result(sql.delete('HOST', u'"hostId" = \'client1.test.local\'')) == 0
+	assert sql._pool.cursor.queries == [sql._deleteQuery('HOST', u'"hostId" = \'client1.test.local\'')]
+
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+
+def recordingSql():
+	from OPSI.Backend.Postgres import Postgres
+	sql = Postgres.__new__(Postgres)
+	sql.queries = []
+	sql.execute = lambda query, conn=None, cursor=None: sql.queries.append(query)
+	sql.runTransaction = lambda function, *args, **kwargs: function(*args, **kwargs)
+	return sql
+
+
+def testBatchIsSentWithOneQuery():
+	sql = recordingSql()
+	batch = sql.batch()
+	batch.update('CONFIG', u'"configId" = \'a\'', {'description': u'A'})
+	batch.delete('CONFIG_VALUE', u'"configId" = \'a\'')
+	batch.insert('CONFIG_VALUE', {'configId': u'a', 'value': u'x'})
+	batch.execute(u'select 1')
+	assert len(batch) == 4
+	assert not sql.queries
+
+	batch.flush()
+	assert len(batch) == 0
+	assert sql.queries == [u'\n'.join([
+		u'UPDATE "CONFIG" SET "description" = \'A\' WHERE "configId" = \'a\';',
+		u'DELETE FROM "CONFIG_VALUE" WHERE "configId" = \'a\';',
+		sql._insertQuery('CONFIG_VALUE', {'configId': u'a', 'value': u'x'}),
+		u'select 1;',
+	])]
+
+
+def testEmptyBatchSendsNothing():
+	sql = recordingSql()
+	sql.batch().flush()
+	assert not sql.queries
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Types import BackendBadValueError
+
+
+def testCountQuery(offlineBackend):
+	query = offlineBackend._productOnClientCountQuery(['productId', 'installationStatus'], {'actionResult': 'failed'})
+	assert query == (
+		u'SELECT "productId", "installationStatus", count(*) AS "count" FROM '
+		u'(SELECT "poc".* FROM "PRODUCT_ON_CLIENT" AS "poc" ) AS "productOnClient" '
+		u'WHERE ("actionResult" = \'failed\') '
+		u'group by "productId", "installationStatus" order by "productId", "installationStatus"'
+	)
+
+
+def testGroupAndDepotAreJoined(offlineBackend):
+	query = offlineBackend._productOnClientCountQuery(['groupId'], {'depotId': 'depot1.test.local'})
+	assert u'JOIN "OBJECT_TO_GROUP" AS "otg"' in query
+	assert u'LEFT JOIN "CONFIG_STATE" AS "cs"' in query
+	assert query.endswith(u'WHERE ("depotId" = \'depot1.test.local\') group by "groupId" order by "groupId"')
+
+
+def testUnknownAttributeIsRejected(offlineBackend):
+	with pytest.raises(BackendBadValueError):
+		offlineBackend._productOnClientCountQuery(['productId'], {'description': 'x'})
+
+
+def testCounts(backend, objects):
+	assert backend.productOnClient_getCounts(['productId', 'installationStatus']) == [
+		{'productId': u'firefox', 'installationStatus': u'installed', 'count': 1}
+	]
+	assert backend.productOnClient_getCounts(['depotId'], groupId=u'lab') == [
+		{'depotId': u'depot.test.local', 'count': 1}
+	]
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Object import BoolConfig, HostGroup, OpsiClient, ProductOnDepot, UnicodeConfig
+
+
+def testSingleColumnKeysAreOneArray(offlineBackend):
+	clients = [OpsiClient(id=u'client1.test.local'), OpsiClient(id=u'client2.test.local')]
+	assert offlineBackend._uniqueConditions(clients) == [u""""hostId" = ANY('{"client1.test.local","client2.test.local"}')"""]
+
+
+def testMultiColumnKeysAreValuesList(offlineBackend):
+	productOnDepots = [
+		ProductOnDepot(productId=u'firefox', productType=u'LocalbootProduct', productVersion=u'52.0', packageVersion=u'1', depotId=u'depot1.test.local'),
+		ProductOnDepot(productId=u'javavm', productType=u'LocalbootProduct', productVersion=u'8.0', packageVersion=u'2', depotId=u'depot1.test.local'),
+	]
+	assert offlineBackend._uniqueConditions(productOnDepots) == [
+		u'("productId", "productType", "productVersion", "packageVersion", "depotId") IN (VALUES '
+		u"('firefox', 'LocalbootProduct', '52.0', '1', 'depot1.test.local'), "
+		u"('javavm', 'LocalbootProduct', '8.0', '2', 'depot1.test.local'))"
+	]
+	assert offlineBackend._uniqueConditions([HostGroup(id=u'lab')]) == [u"""("groupId", "type") IN (VALUES ('lab', 'HostGroup'))"""]
+
+
+def testDeleteIsOneBatch(offlineBackend):
+	batches = []
+	offlineBackend._sql.executeBatch = batches.append
+	offlineBackend._deleteObjects(('CONFIG_VALUE', 'CONFIG'), [])
+	assert not batches
+
+	offlineBackend._deleteObjects(('CONFIG_VALUE', 'CONFIG'), [UnicodeConfig(id=u'a'), BoolConfig(id=u'b')])
+	assert batches == [[
+		u"""DELETE FROM "CONFIG_VALUE" WHERE "configId" = ANY('{"a","b"}');""",
+		u"""DELETE FROM "CONFIG" WHERE "configId" = ANY('{"a","b"}');""",
+	]]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+
+def testQueryReadsAllClientsAtOnce(offlineBackend):
+	query = offlineBackend._effectiveProductStateQuery([u'Client1.test.local', u'client2.test.local'])
+	assert u'''"h"."hostId" = ANY('{"client1.test.local","client2.test.local"}')''' in query
+	assert query.endswith(u'order by "c"."clientId", "pod"."productId"')
+
+
+def testModificationTimeIsOpsiTimestamp(offlineBackend):
+	rows = [
+		{'productId': u'firefox', 'modificationTime': datetime.datetime(2014, 2, 1, 10, 0, 0)},
+		{'productId': u'javavm', 'modificationTime': None},
+	]
+	assert offlineBackend._effectiveProductStates(rows) == [
+		{'productId': u'firefox', 'modificationTime': u'2014-02-01 10:00:00'},
+		{'productId': u'javavm', 'modificationTime': None},
+	]
+
+
+def testEffectiveStates(backend, objects):
+	client = objects['host'][1]
+	(state, ) = backend.productOnClient_getEffectiveStates([client.id])
+	assert state['clientId'] == client.id
+	assert state['depotId'] == u'depot.test.local'
+	assert state['productId'] == u'firefox'
+	assert state['installationStatus'] == u'installed'
+	assert state['actionRequest'] == u'none'
+	assert state['modificationTime'] == u'2014-02-01 10:00:00'
+	# The client's state, else the default values
+	assert state['properties'] == {u'language': [u'de'], u'desktoplink': [False]}
+
+
+def testProductsWithoutStateAreNotInstalled(backend, objects):
+	client = objects['host'][1]
+	backend.productOnClient_deleteObjects(objects['productOnClient'])
+	(state, ) = backend.productOnClient_getEffectiveStates([client.id])
+	assert state['installationStatus'] == u'not_installed'
+	assert state['actionRequest'] == u'none'
+	assert state['installedProductVersion'] is None
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+
+def testEmptyStringIsMatchedAsValue(offlineBackend):
+	assert offlineBackend._filterToSql({'description': ''}) == u"""("description" = '')"""
+	assert offlineBackend._filterToSql({'actionRequest': ['', 'setup']}) == u"""("actionRequest" = ANY('{"","setup"}'))"""
+
+
+def testAsteriskMatchesAnyValue(offlineBackend):
+	assert offlineBackend._filterToSql({'description': '*'}) == u'("description" is not NULL)'
+	assert offlineBackend._filterToSql({'description': '**'}) == u'("description" is not NULL)'
+
+
+def testWildcard(offlineBackend):
+	assert offlineBackend._filterToSql({'productId': 'fire*'}, 'PRODUCT_ON_CLIENT') == u"""("productId" LIKE 'fire%')"""
+	assert offlineBackend._filterToSql({'description': '*_1*'}, 'PRODUCT') == u"""("description" LIKE '%\\_1%')"""
+
+
+def testTrigramColumnsAreCaseInsensitive(offlineBackend):
+	assert offlineBackend._filterToSql({'hostId': 'client*'}, 'HOST') == u"""("hostId" ILIKE 'client%')"""
+	assert offlineBackend._filterToSql({'description': '*lab*'}, 'HOST') == u"""("description" ILIKE '%lab%')"""
+	assert offlineBackend._createQuery('SOFTWARE', ['name'], {'name': '*fox'}) == u"""select "name" from "SOFTWARE" where ("name" ILIKE '%fox')"""
+
+
+def testNone(offlineBackend):
+	assert offlineBackend._filterToSql({'description': [None, 'x']}) == u"""("description" = 'x' or "description" is NULL)"""
+
+
+def testValuesAreMatchedByContainment(offlineBackend):
+	assert offlineBackend._filterToSql({'values': 'de'}) == u"""("values" @> '["de"]'::jsonb)"""
+	assert offlineBackend._filterToSql({'values': [True, None]}) == u"""("values" @> '[true]'::jsonb or "values" is NULL)"""
+
+
+def testValuesWildcardMatchesElements(offlineBackend):
+	assert offlineBackend._filterToSql({'values': 'depot*'}) == \
+		u"""(EXISTS (SELECT 1 FROM jsonb_array_elements_text("values") AS element WHERE element LIKE 'depot%'))"""
+
+
+def testConfigValueFiltersAreSubqueries(offlineBackend):
+	(filter, conditions) = offlineBackend._configValueConditions({'configId': 'a*', 'possibleValues': ['x', 'y'], 'defaultValues': []})
+	assert filter == {'configId': 'a*'}
+	assert conditions == [
+		u"""EXISTS (SELECT 1 FROM "CONFIG_VALUE" WHERE "CONFIG_VALUE"."configId" = "CONFIG"."configId" AND ("value" = ANY('{"x","y"}')))"""
+	]
+	assert offlineBackend._createQuery('CONFIG', ['configId'], filter, conditions) == \
+		u"""select "configId" from "CONFIG" where ("configId" LIKE 'a%') and """ + conditions[0]
+
+
+def testListIsOneArrayComparison(offlineBackend):
+	assert offlineBackend._filterToSql({'priority': [1, 2, 3]}) == u"""("priority" = ANY('{"1","2","3"}'))"""
+	assert offlineBackend._filterToSql({'hostId': ['a', 'b*', None, "c'd"]}, 'PRODUCT_ON_CLIENT') == \
+		u"""("hostId" = ANY('{"a","c''d"}') or "hostId" LIKE 'b%' or "hostId" is NULL)"""
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Object import HostGroup, ObjectToGroup
+
+
+def testSubtreeRowsAreFolded(offlineBackend):
+	rows = [
+		{'groupId': u'a', 'objectId': u'client2.test.local'},
+		{'groupId': u'a', 'objectId': u'client3.test.local'},
+		{'groupId': u'b', 'objectId': None},
+		{'groupId': u'c', 'objectId': u'client1.test.local'},
+		{'groupId': u'c', 'objectId': u'client2.test.local'},
+	]
+	assert offlineBackend._groupSubtree(rows) == {
+		'groupIds': [u'a', u'b', u'c'],
+		'objectIds': [u'client1.test.local', u'client2.test.local', u'client3.test.local'],
+	}
+
+
+def testSubtree(backend, objects):
+	client = objects['host'][1]
+	backend.group_createObjects([
+		HostGroup(id=u'building', parentGroupId=u'lab'),
+		HostGroup(id=u'room', parentGroupId=u'building'),
+		HostGroup(id=u'other'),
+	])
+	backend.objectToGroup_createObjects([ObjectToGroup(groupType=u'HostGroup', groupId=u'room', objectId=objects['host'][0].id)])
+
+	assert backend.group_getSubtree([u'lab']) == {
+		'groupIds': [u'building', u'lab', u'room'],
+		'objectIds': [client.id, u'depot.test.local'],
+	}
+	assert backend.group_getSubtree([u'room']) == {'groupIds': [u'room'], 'objectIds': [u'depot.test.local']}
+	assert backend.group_getSubtree([u'lab'], u'ProductGroup') == {'groupIds': [], 'objectIds': []}
+
+
+def testSubtreeStopsAtCycles(backend, objects):
+	backend.group_createObjects([HostGroup(id=u'building', parentGroupId=u'lab')])
+	backend.group_updateObject(HostGroup(id=u'lab', parentGroupId=u'building'))
+	assert backend.group_getSubtree([u'lab'])['groupIds'] == [u'building', u'lab']
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+PREFIXES = (
+	'host', 'config', 'configState', 'product', 'productProperty', 'productDependency',
+	'productOnDepot', 'productOnClient', 'productPropertyState', 'group', 'objectToGroup',
+	'licenseContract', 'softwareLicense', 'licensePool', 'softwareLicenseToLicensePool',
+	'licenseOnClient', 'auditSoftware', 'auditSoftwareOnClient', 'auditSoftwareToLicensePool'
+)
+
+
+def normalized(hashes):
+	result = []
+	for hash in hashes:
+		hash = dict(hash)
+		for (key, value) in hash.items():
+			if isinstance(value, list):
+				hash[key] = sorted(value)
+		result.append(sorted(hash.items()))
+	return sorted(result)
+
+
+@pytest.mark.parametrize('prefix', PREFIXES)
+def testHashesEqualToHash(backend, objects, prefix):
+	hashes = getattr(backend, '%s_getHashes' % prefix)()
+	expected = [obj.toHash() for obj in getattr(backend, '%s_getObjects' % prefix)()]
+	assert hashes
+	assert normalized(hashes) == normalized(expected)
+
+
+@pytest.mark.parametrize('prefix', ('host', 'product', 'productOnClient', 'group'))
+def testHashesWithAttributesEqualToHash(backend, objects, prefix):
+	attributes = {
+		'host': ['description'],
+		'product': ['name'],
+		'productOnClient': ['installationStatus'],
+		'group': ['description'],
+	}[prefix]
+	hashes = getattr(backend, '%s_getHashes' % prefix)(attributes)
+	expected = [obj.toHash() for obj in getattr(backend, '%s_getObjects' % prefix)(attributes)]
+	assert all('type' in hash for hash in hashes)
+	assert normalized(hashes) == normalized(expected)
+
+
+def testHashProjectionSelectsAttributesAndKey(offlineBackend):
+	from OPSI.Object import Host, ProductOnClient
+	assert offlineBackend._projection(Host, ['description'], hashesOnly=True) == ['description', 'type', 'hostId']
+	assert offlineBackend._projection(ProductOnClient, ['actionRequest'], hashesOnly=True) == ['actionRequest', 'productId', 'productType', 'clientId']
+	(attributes, filter) = offlineBackend._adjustAttributes(Host, ['id', 'description'], {'type': 'OpsiClient'}, hashesOnly=True)
+	assert attributes == ['description', 'hostId', 'type']
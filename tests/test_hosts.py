@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Object import ObjectToGroup, ProductGroup
+
+
+def testDeleteHostWithDependentObjects(backend, objects):
+	client = objects['host'][1]
+	backend.group_createObjects([ProductGroup(id=u'browsers')])
+	backend.objectToGroup_createObjects([ObjectToGroup(groupType=u'ProductGroup', groupId=u'browsers', objectId=client.id)])
+
+	backend.host_deleteObjects([client])
+
+	assert not backend.host_getObjects(id=client.id)
+	assert backend.host_getObjects(id=objects['host'][0].id)
+	assert not backend.objectToGroup_getObjects(objectId=client.id)
+	assert not backend.productOnClient_getObjects(clientId=client.id)
+	assert not backend.productPropertyState_getObjects(objectId=client.id)
+	assert not backend.configState_getObjects(objectId=client.id)
+	assert not backend.licenseOnClient_getObjects(clientId=client.id)
+	assert not backend.auditSoftwareOnClient_getObjects(clientId=client.id)
+	# Objects not belonging to the host are kept
+	assert backend.group_getObjects(id=[u'lab', u'browsers'])
+	assert backend.softwareLicense_getObjects(id=u'license1')
+	assert backend.productOnDepot_getObjects(productId=u'firefox')
+
+
+def testDeleteQueryIsOneStatement(offlineBackend):
+	offlineBackend._auditHardwareConfig = {'PCI_DEVICE': {}, 'BIOS': {}}
+	query = offlineBackend._hostDeleteQuery([u'client1.test.local', u'client2.test.local'])
+	hostIds = u"""'{"client1.test.local","client2.test.local"}'"""
+	assert query.startswith(u'WITH "delete_0" AS (DELETE FROM "OBJECT_TO_GROUP" WHERE "objectId" = ANY(%s)), ' % hostIds)
+	assert query.endswith(u' DELETE FROM "HOST" WHERE "hostId" = ANY(%s);' % hostIds)
+	assert query.count(u'DELETE FROM') == 11
+	assert u'"delete_8" AS (DELETE FROM "HARDWARE_CONFIG_BIOS" WHERE "hostId" = ANY(%s))' % hostIds in query
+	assert u'"delete_9" AS (DELETE FROM "HARDWARE_CONFIG_PCI_DEVICE" WHERE "hostId" = ANY(%s))' % hostIds in query
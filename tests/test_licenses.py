@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Types import LicenseMissingError
+from OPSI.Object import OpsiClient, RetailSoftwareLicense, SoftwareLicenseToLicensePool, VolumeSoftwareLicense
+
+
+def testAllocatedLicenseIsReturnedAgain(backend, objects):
+	client = objects['host'][1]
+	licenseOnClient = backend.licenseOnClient_allocate(client.id, u'pool1')
+	assert licenseOnClient.softwareLicenseId == u'license1'
+	assert backend.licenseOnClient_allocate(client.id, u'pool1').softwareLicenseId == u'license1'
+	assert len(backend.licenseOnClient_getObjects(clientId=client.id)) == 1
+
+
+def testExpiredLicenseIsNotAllocated(backend, objects):
+	client = OpsiClient(id=u'client2.test.local')
+	backend.host_createObjects([client])
+	backend.softwareLicense_createObjects([RetailSoftwareLicense(id=u'expired', licenseContractId=u'contract1',
+		maxInstallations=1, expirationDate=u'2000-01-01 00:00:00')])
+	backend.softwareLicenseToLicensePool_createObjects([SoftwareLicenseToLicensePool(softwareLicenseId=u'expired', licensePoolId=u'pool1')])
+
+	with pytest.raises(LicenseMissingError):
+		backend.licenseOnClient_allocate(client.id, u'pool1')
+
+
+def testConcurrentAllocationsForOneClient(backend, objects):
+	client = OpsiClient(id=u'client3.test.local')
+	backend.host_createObjects([client])
+	backend.softwareLicense_createObjects([VolumeSoftwareLicense(id=u'volume%d' % i, licenseContractId=u'contract1', maxInstallations=10) for i in range(4)])
+	backend.softwareLicenseToLicensePool_createObjects([SoftwareLicenseToLicensePool(softwareLicenseId=u'volume%d' % i, licensePoolId=u'pool1') for i in range(4)])
+
+	results = []
+	threads = [threading.Thread(target=lambda: results.append(backend.licenseOnClient_allocate(client.id, u'pool1'))) for i in range(4)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert len(results) == 4
+	assert len(set(licenseOnClient.softwareLicenseId for licenseOnClient in results)) == 1
+	assert len(backend.licenseOnClient_getObjects(clientId=client.id)) == 1
+
+
+def testAllocationDoesNotWriteLockedRows(backend, objects):
+	client = OpsiClient(id=u'client4.test.local')
+	backend.host_createObjects([client])
+	backend.softwareLicense_createObjects([VolumeSoftwareLicense(id=u'volume', licenseContractId=u'contract1', maxInstallations=10)])
+	backend.softwareLicenseToLicensePool_createObjects([SoftwareLicenseToLicensePool(softwareLicenseId=u'volume', licensePoolId=u'pool1')])
+	query = u'''select (select xmin::text from "HOST" where "hostId" = 'client4.test.local') AS "host",
+		(select xmin::text from "SOFTWARE_LICENSE" where "softwareLicenseId" = 'volume') AS "license"'''
+	versions = backend._sql.getRow(query)
+
+	assert backend.licenseOnClient_allocate(client.id, u'pool1').softwareLicenseId == u'volume'
+	assert backend._sql.getRow(query) == versions
+
+
+def testAllocationRunsReadCommitted(backend, objects):
+	backend._sql._transactionIsolationLevel = u'REPEATABLE READ'
+	levels = []
+	allocateLicense = backend._allocateLicense
+
+	def _allocateLicense(clientId, licensePoolIds):
+		levels.append(backend._sql.getRow(u'SHOW transaction_isolation')['transaction_isolation'])
+		return allocateLicense(clientId, licensePoolIds)
+	backend._allocateLicense = _allocateLicense
+
+	backend.licenseOnClient_allocate(objects['host'][1].id, u'pool1')
+	assert levels == [u'read committed']
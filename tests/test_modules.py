@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('twisted.conch.ssh.keys')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+
+class BackendInfoContext(object):
+	def __init__(self, modulesFile):
+		self.modulesFile = modulesFile
+		self.calls = 0
+
+	def backend_info(self):
+		self.calls += 1
+		modules = {}
+		with open(self.modulesFile) as f:
+			for line in f:
+				(key, value) = line.split('=', 1)
+				modules[key.strip()] = value.strip()
+		return {'modules': modules, 'realmodules': {}}
+
+
+def testSignatureIsVerifiedAgainAfterContentChange(offlineBackend, tmpdir):
+	modulesFile = tmpdir.join('modules')
+	modulesFile.write('license_management = yes\nsignature = 1234\n')
+	offlineBackend._opsiModulesFile = str(modulesFile)
+	offlineBackend._context = BackendInfoContext(str(modulesFile))
+
+	assert not offlineBackend._modulesSignatureValid()
+	assert not offlineBackend._modulesSignatureValid()
+	assert offlineBackend._context.calls == 1
+
+	# Same size and mtime, different signature
+	mtime = os.path.getmtime(str(modulesFile))
+	modulesFile.write('license_management = yes\nsignature = 5678\n')
+	os.utime(str(modulesFile), (mtime, mtime))
+	assert not offlineBackend._modulesSignatureValid()
+	assert offlineBackend._context.calls == 2
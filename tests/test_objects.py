@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+
+def sampleObjects():
+	from OPSI.Object import (
+		OpsiClient, OpsiDepotserver, ConfigState, ProductDependency,
+		ProductOnClient, ProductPropertyState, HostGroup, ObjectToGroup,
+		RetailSoftwareLicense, LicenseOnClient, AuditSoftware
+	)
+	return [
+		OpsiClient(id=u'client1.test.local', description=u'Client', hardwareAddress=u'00:01:02:03:04:05',
+			ipAddress=u'192.168.1.100', lastSeen=u'2014-02-01 10:00:00'),
+		OpsiDepotserver(id=u'depot.test.local', depotLocalUrl=u'file:///var/lib/opsi/depot', isMasterDepot=True),
+		ConfigState(configId=u'clientconfig.depot.id', objectId=u'client1.test.local', values=[u'depot.test.local']),
+		ProductDependency(productId=u'firefox', productVersion=u'52.0', packageVersion=u'1', productAction=u'setup',
+			requiredProductId=u'javavm', requiredInstallationStatus=u'installed', requirementType=u'before'),
+		ProductOnClient(productId=u'firefox', productType=u'LocalbootProduct', clientId=u'client1.test.local',
+			installationStatus=u'installed', actionRequest=u'none', modificationTime=u'2014-02-01 10:00:00'),
+		ProductPropertyState(productId=u'firefox', propertyId=u'language', objectId=u'client1.test.local', values=[u'de']),
+		HostGroup(id=u'lab', description=u'Lab'),
+		ObjectToGroup(groupType=u'HostGroup', groupId=u'lab', objectId=u'client1.test.local'),
+		RetailSoftwareLicense(id=u'license1', licenseContractId=u'contract1', maxInstallations=1),
+		LicenseOnClient(softwareLicenseId=u'license1', licensePoolId=u'pool1', clientId=u'client1.test.local'),
+		AuditSoftware(name=u'Firefox', version=u'52.0', subVersion=u'', language=u'', architecture=u'x64'),
+	]
+
+
+@pytest.mark.parametrize('obj', sampleObjects(), ids=lambda obj: obj.getType())
+def testDecodedObjectEqualsFromHash(offlineBackend, obj):
+	objectClass = obj.__class__
+	while objectClass.__base__.__name__ not in ('Entity', 'Relationship'):
+		objectClass = objectClass.__base__
+	data = offlineBackend._objectToDatabaseHash(obj)
+	columns = sorted(data.keys())
+	decoded = offlineBackend._rowDecoder(objectClass, columns)(tuple(data[column] for column in columns))
+	expected = objectClass.fromHash(offlineBackend._adjustResult(objectClass, dict(data)))
+	assert decoded.__class__ is expected.__class__
+	assert decoded.toHash() == expected.toHash()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Object import OpsiClient
+from OPSI.Types import BackendBadValueError
+
+
+def testKeyIsDefaultOrder(offlineBackend):
+	(condition, clause) = offlineBackend._pagingToSql('HOST', {'limit': 10})
+	assert condition == u''
+	assert clause == u' order by "hostId" limit 10'
+
+
+def testKeyBreaksTies(offlineBackend):
+	(condition, clause) = offlineBackend._pagingToSql('PRODUCT_ON_CLIENT', {
+		'orderBy': ['installationStatus'],
+		'after': ['installed', 'firefox', 'client9.uib.local'],
+		'limit': 10
+	})
+	assert condition == (
+		u"""("installationStatus" > 'installed' or "installationStatus" is NULL or """
+		u"""("installationStatus" = 'installed' and ("productId", "clientId") > ('firefox', 'client9.uib.local')))"""
+	)
+	assert clause == u' order by "installationStatus" nulls last, "productId", "clientId" limit 10'
+
+
+def testKeyOnlyIsRowComparison(offlineBackend):
+	(condition, clause) = offlineBackend._pagingToSql('PRODUCT_ON_CLIENT', {'after': ['firefox', 'client9.uib.local']})
+	assert condition == u"""("productId", "clientId") > ('firefox', 'client9.uib.local')"""
+	assert clause == u' order by "productId", "clientId"'
+
+
+def testOnlyNullsFollowNull(offlineBackend):
+	(condition, clause) = offlineBackend._pagingToSql('PRODUCT_ON_CLIENT', {
+		'orderBy': ['actionRequest', 'installationStatus'],
+		'after': [None, 'installed', 'firefox', 'client9.uib.local']
+	})
+	assert condition == (
+		u"""("actionRequest" is NULL and ("installationStatus" > 'installed' or "installationStatus" is NULL or """
+		u"""("installationStatus" = 'installed' and ("productId", "clientId") > ('firefox', 'client9.uib.local'))))"""
+	)
+	assert clause == u' order by "actionRequest" nulls last, "installationStatus" nulls last, "productId", "clientId"'
+
+
+def testNullInLastOrderByColumn(offlineBackend):
+	(condition, clause) = offlineBackend._pagingToSql('HOST', {'orderBy': ['hostId', 'description'], 'after': ['client1.test.local', None]})
+	assert condition == u"""("hostId" > 'client1.test.local' or ("hostId" = 'client1.test.local' and false))"""
+
+
+def testKeyColumnsInOrderByAreNotRepeated(offlineBackend):
+	(condition, clause) = offlineBackend._pagingToSql('PRODUCT_ON_CLIENT', {'orderBy': ['clientId', 'productId']})
+	assert clause == u' order by "clientId", "productId"'
+
+
+def testAfterNeedsTieBreakerValues(offlineBackend):
+	with pytest.raises(BackendBadValueError):
+		offlineBackend._pagingToSql('PRODUCT_ON_CLIENT', {'orderBy': ['installationStatus'], 'after': ['installed']})
+
+
+def testTableWithoutKeyIsNotPaged(offlineBackend):
+	with pytest.raises(BackendBadValueError):
+		offlineBackend._pagingToSql('HARDWARE_DEVICE_PCI_DEVICE', {'limit': 10})
+
+
+def testPagesOverNulls(backend):
+	clients = []
+	for (index, description) in enumerate([u'b', None, u'a', None, u'b', u'a', None]):
+		clients.append(OpsiClient(id=u'client%d.test.local' % index, description=description or u''))
+	backend.host_createObjects(clients)
+	backend._sql.execute(u"""update "HOST" set "description" = NULL where "description" = ''""")
+
+	ids = []
+	after = None
+	while True:
+		page = backend.host_getHashes(attributes=['description'], type='OpsiClient', orderBy=['description'], after=after, limit=2)
+		if not page:
+			break
+		ids.extend([host['id'] for host in page])
+		after = [page[-1]['description'], page[-1]['id']]
+
+	assert ids == [
+		u'client2.test.local', u'client5.test.local',
+		u'client0.test.local', u'client4.test.local',
+		u'client1.test.local', u'client3.test.local', u'client6.test.local'
+	]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+
+def valueRows(backend, value):
+	return backend._sql.getSet(u'''select "value", "isDefault" from "PRODUCT_PROPERTY_VALUE"
+		where "propertyId" = 'language' and "value" %s''' % (u'is NULL' if value is None else u"= '%s'" % value))
+
+
+def insertValue(backend, value, isDefault):
+	backend._sql.insert('PRODUCT_PROPERTY_VALUE', {
+		'productId': u'firefox', 'productVersion': u'52.0', 'packageVersion': u'1',
+		'propertyId': u'language', 'value': value, 'isDefault': isDefault
+	})
+
+
+def testDuplicatesKeepDefaultValue(backend, objects):
+	backend._sql.execute(u'DROP INDEX "index_product_property_value_key"')
+	insertValue(backend, u'en', False)
+	insertValue(backend, u'en', True)
+	insertValue(backend, None, False)
+	insertValue(backend, None, False)
+
+	backend._createProductPropertyValueIndex()
+
+	assert valueRows(backend, u'en') == [{'value': u'en', 'isDefault': True}]
+	assert valueRows(backend, None) == [{'value': None, 'isDefault': False}]
+	assert valueRows(backend, u'de') == [{'value': u'de', 'isDefault': False}]
+
+
+def testNullValuesAreUnique(backend, objects):
+	insertValue(backend, None, False)
+	with pytest.raises(Exception):
+		insertValue(backend, None, False)
+
+
+def testValuesAreReconciled(backend, objects):
+	productProperty = objects['productProperty'][0]
+	productProperty.setPossibleValues([u'en', u'fr'])
+	productProperty.setDefaultValues([u'fr'])
+	backend.productProperty_updateObject(productProperty)
+
+	(result,) = backend.productProperty_getObjects(propertyId=u'language')
+	assert sorted(result.possibleValues) == [u'en', u'fr']
+	assert result.defaultValues == [u'fr']
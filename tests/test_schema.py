@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Backend.Postgres import Postgres
+
+
+@pytest.mark.parametrize('query', (
+	u'CREATE TABLE "HOST" ("hostId" varchar(255))',
+	u'ALTER TABLE "HARDWARE_CONFIG_PCI_DEVICE" ADD "revision" varchar(20)',
+	u'DROP TABLE "PRODUCT_ON_CLIENT_SUMMARY"',
+	u'INSERT INTO "HOST" ("hostId") VALUES (\'a\');\nCREATE INDEX "index_host_type" on "HOST" ("type");',
+	u'CREATE TEMPORARY TABLE "SYNC" ("name" varchar(100)) ON COMMIT DROP;\nALTER TABLE "HOST" ADD "x" integer;',
+))
+def testSchemaChangesInvalidateSchema(query):
+	assert Postgres.DDL_PATTERN.search(query)
+
+
+@pytest.mark.parametrize('query', (
+	u'CREATE TEMPORARY TABLE "SOFTWARE_CONFIG_SYNC" ("name" varchar(100)) ON COMMIT DROP',
+	u'INSERT INTO "SOFTWARE" ("name") VALUES (\'a\');\nCREATE TEMP TABLE "SYNC" ("name" varchar(100))',
+	u'CREATE LOCAL TEMPORARY TABLE "SYNC" ("name" varchar(100))',
+	u'UPDATE "HOST" SET "description" = \'drop table\'',
+))
+def testTemporaryTablesKeepSchema(query):
+	assert not Postgres.DDL_PATTERN.search(query)
+
+
+def testSchemaIsReadWithOneCachedQuery():
+	sql = Postgres.__new__(Postgres)
+	sql._schema = None
+	queries = []
+
+	def getSet(query):
+		queries.append(query)
+		return [
+			{'table_name': u'HOST', 'column_name': u'hostId', 'data_type': u'character varying(255)'},
+			{'table_name': u'HOST', 'column_name': u'type', 'data_type': u'character varying(30)'},
+			{'table_name': u'EMPTY', 'column_name': None, 'data_type': None},
+		]
+	sql.getSet = getSet
+
+	assert sql.getTables() == {'HOST': [u'hostId', u'type'], 'EMPTY': []}
+	assert sql.getSchema()['HOST'][u'type'] == u'character varying(30)'
+	assert len(queries) == 1
+
+	sql.invalidateSchema()
+	sql.getTables()
+	assert len(queries) == 2
+
+
+def auditHardwareSchema(offlineBackend, columns):
+	from collections import OrderedDict
+	offlineBackend._auditHardwareConfig = {
+		'PCI_DEVICE': {
+			'vendorId': {'Type': 'varchar(4)', 'Scope': 'g'},
+			'deviceType': {'Type': 'varchar(20)', 'Scope': 'g'},
+			'busId': {'Type': 'varchar(60)', 'Scope': 'i'},
+		}
+	}
+	offlineBackend._sql._schema = {
+		'HARDWARE_DEVICE_PCI_DEVICE': OrderedDict([('hardware_id', u'integer')] + columns),
+		'HARDWARE_CONFIG_PCI_DEVICE': OrderedDict([
+			('config_id', u'integer'), ('hostId', u'character varying(50)'), ('hardware_id', u'integer'),
+			('firstseen', u'timestamp without time zone'), ('lastseen', u'timestamp without time zone'),
+			('state', u'smallint'), ('busId', u'character varying(60)')
+		]),
+	}
+	return offlineBackend._auditHardwareSchemaMigrations()
+
+
+def testUnchangedColumnsAreNotMigrated(offlineBackend):
+	assert auditHardwareSchema(offlineBackend, [('deviceType', u'character varying(20)'), ('vendorId', u'character varying(4)')]) == []
+
+
+def testMissingAndChangedColumns(offlineBackend):
+	migrations = auditHardwareSchema(offlineBackend, [('vendorId', u'character varying(2)')])
+	assert migrations == [{
+		'table': u'HARDWARE_DEVICE_PCI_DEVICE',
+		'statement': u'ALTER TABLE "HARDWARE_DEVICE_PCI_DEVICE"\nADD "deviceType" varchar(20) NULL,\nALTER COLUMN "vendorId" TYPE varchar(4);',
+		'changes': [
+			{'column': 'deviceType', 'action': 'add', 'currentType': None, 'type': 'varchar(20)'},
+			{'column': 'vendorId', 'action': 'alter', 'currentType': u'character varying(2)', 'type': 'varchar(4)'},
+		]
+	}]
+
+
+def testLowerCaseColumnsOfOlderVersionsAreRenamed(offlineBackend):
+	migrations = auditHardwareSchema(offlineBackend, [('devicetype', u'character varying(20)'), ('vendorid', u'character varying(2)')])
+	assert [migration['statement'] for migration in migrations] == [
+		u'ALTER TABLE "HARDWARE_DEVICE_PCI_DEVICE" RENAME COLUMN "devicetype" TO "deviceType";\n'
+		u'ALTER TABLE "HARDWARE_DEVICE_PCI_DEVICE" RENAME COLUMN "vendorid" TO "vendorId";\n'
+		u'ALTER TABLE "HARDWARE_DEVICE_PCI_DEVICE"\nALTER COLUMN "vendorId" TYPE varchar(4);'
+	]
+	assert [change['action'] for change in migrations[0]['changes']] == ['rename', 'rename', 'alter']
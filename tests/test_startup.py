@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Types import BackendIOError
+from OPSI.Backend.Postgres import ConnectionPool, Postgres
+
+
+@pytest.fixture
+def noPool():
+	# The pool is a singleton, it must not be shared with other tests
+	ConnectionPool._ConnectionPool__instance = None
+	yield
+	ConnectionPool._ConnectionPool__instance = None
+
+
+@pytest.mark.parametrize('startupMode', ('eager', None))
+def testStartupFailsWithUnreachableServer(noPool, startupMode):
+	kwargs = {'address': u'unreachable.invalid', 'connectionPoolSize': 2}
+	if startupMode:
+		kwargs['startupMode'] = startupMode
+	with pytest.raises(BackendIOError):
+		Postgres(**kwargs)
+	assert ConnectionPool._ConnectionPool__instance is None
+
+
+def testLazyStartupDoesNotConnect(noPool):
+	Postgres(address=u'unreachable.invalid', startupMode=u'lazy')
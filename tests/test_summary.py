@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+from OPSI.Object import ConfigState, OpsiClient, OpsiDepotserver, ProductOnClient, UnicodeConfig
+
+from conftest import databaseConfig
+
+
+@pytest.fixture
+def summaryBackend():
+	config = databaseConfig()
+	if not config:
+		pytest.skip(u"OPSI_PG_TEST_DATABASE not set")
+	from OPSI.Backend.Postgres import PostgresBackend
+	backend = PostgresBackend(summaryTables=True, **config)
+	backend.backend_deleteBase()
+	backend.backend_createBase()
+	yield backend
+	backend.backend_deleteBase()
+	backend.backend_exit()
+
+
+def depotConfig(defaultDepotId, depotIds):
+	return UnicodeConfig(id=u'clientconfig.depot.id', possibleValues=depotIds, defaultValues=[defaultDepotId], editable=True, multiValue=False)
+
+
+def summaryRows(backend, table):
+	return sorted(backend._sql.getSet(u'select * from "%s"' % table))
+
+
+def testClientsOnDefaultDepotAreCounted(summaryBackend):
+	depots = [
+		OpsiDepotserver(id=u'depot1.test.local', isMasterDepot=True),
+		OpsiDepotserver(id=u'depot2.test.local', isMasterDepot=True),
+	]
+	clients = [OpsiClient(id=u'client%d.test.local' % index) for index in range(4)]
+	summaryBackend.host_createObjects(depots)
+	summaryBackend.config_createObjects([depotConfig(depots[0].id, [depot.id for depot in depots])])
+	summaryBackend.host_createObjects(clients)
+	summaryBackend.configState_createObjects([ConfigState(configId=u'clientconfig.depot.id', objectId=clients[0].id, values=[depots[1].id])])
+
+	counts = summaryBackend.host_getCounts()
+	assert counts['clientsOnDepot'] == {depots[0].id: 3, depots[1].id: 1}
+	assert counts['hosts'] == {u'OpsiDepotserver': 2, u'OpsiClient': 4}
+
+	# Deleting the client and its config state in one statement
+	summaryBackend.host_deleteObjects([clients[0]])
+	assert summaryBackend.host_getCounts()['clientsOnDepot'] == {depots[0].id: 3}
+	assert summaryRows(summaryBackend, 'CLIENT_DEPOT_SUMMARY') == [{'depotId': depots[0].id, 'count': 3}]
+
+	# Changing the default depot moves the clients without config state
+	summaryBackend.config_createObjects([depotConfig(depots[1].id, [depot.id for depot in depots])])
+	assert summaryBackend.host_getCounts()['clientsOnDepot'] == {depots[1].id: 3}
+
+	summaryBackend._summaryTables = False
+	assert summaryBackend.host_getCounts()['clientsOnDepot'] == {depots[1].id: 3}
+
+
+def testZeroCountsAreDeleted(summaryBackend):
+	client = OpsiClient(id=u'client1.test.local')
+	summaryBackend.host_createObjects([client])
+	summaryBackend.productOnClient_createObjects([ProductOnClient(productId=u'firefox', productType=u'LocalbootProduct',
+		clientId=client.id, installationStatus=u'installed', actionRequest=u'none')])
+	summaryBackend.host_deleteObjects([client])
+
+	for table in ('PRODUCT_ON_CLIENT_SUMMARY', 'HOST_SUMMARY', 'CLIENT_DEPOT_SUMMARY'):
+		assert summaryRows(summaryBackend, table) == []
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('OPSI.Backend.Postgres')
+
+import psycopg2
+
+from OPSI.Backend.Postgres import Postgres
+
+
+class FakeCursor(object):
+
+	def __init__(self, log):
+		self._log = log
+
+	def execute(self, query):
+		self._log.append(query)
+
+	def close(self):
+		pass
+
+
+class FakeConnection(object):
+
+	def __init__(self, log):
+		self._log = log
+
+	def cursor(self, cursor_factory=None):
+		return FakeCursor(self._log)
+
+	def commit(self):
+		self._log.append('COMMIT')
+
+	def rollback(self):
+		self._log.append('ROLLBACK')
+
+	def close(self):
+		self._log.append('CLOSE')
+
+
+class FakePool(object):
+
+	def __init__(self):
+		self.log = []
+
+	def connect(self):
+		return FakeConnection(self.log)
+
+	def status(self):
+		return u''
+
+
+class OfflinePostgres(Postgres):
+
+	def _createConnectionPool(self):
+		self._pool = FakePool()
+
+
+def testQueriesOfTheBlockShareOneCommit():
+	sql = OfflinePostgres()
+	with sql.transaction():
+		sql.execute(u'DELETE FROM "HOST"')
+		sql.execute(u'DELETE FROM "CONFIG"')
+	assert sql._pool.log == [u'DELETE FROM "HOST"', u'DELETE FROM "CONFIG"', 'COMMIT', 'CLOSE']
+
+
+def testExceptionRollsBack():
+	sql = OfflinePostgres(transactionIsolationLevel=u'serializable')
+	with pytest.raises(ValueError):
+		with sql.transaction():
+			sql.execute(u'DELETE FROM "HOST"')
+			raise ValueError(u'failed')
+	assert sql._pool.log == [u'SET TRANSACTION ISOLATION LEVEL SERIALIZABLE', u'DELETE FROM "HOST"', 'ROLLBACK', 'CLOSE']
+	assert not sql._boundTransaction()
+
+
+def testNestedBlockIsSavepoint():
+	sql = OfflinePostgres()
+	with sql.transaction():
+		with pytest.raises(ValueError):
+			with sql.transaction(u'SERIALIZABLE'):
+				sql.execute(u'DELETE FROM "HOST"')
+				raise ValueError(u'failed')
+		with sql.transaction():
+			sql.execute(u'DELETE FROM "CONFIG"')
+	assert sql._pool.log == [
+		u'SAVEPOINT "savepoint_1"', u'DELETE FROM "HOST"', u'ROLLBACK TO SAVEPOINT "savepoint_1"',
+		u'SAVEPOINT "savepoint_1"', u'DELETE FROM "CONFIG"', u'RELEASE SAVEPOINT "savepoint_1"',
+		'COMMIT', 'CLOSE'
+	]
+
+
+class SerializationFailure(psycopg2.OperationalError):
+	pgcode = '40001'
+
+
+def testSerializationFailureIsRetried():
+	sql = OfflinePostgres(transactionRetryDelay=0)
+	attempts = []
+
+	def work():
+		sql.execute(u'UPDATE "HOST" SET "description" = NULL')
+		attempts.append(1)
+		if len(attempts) < 3:
+			raise SerializationFailure()
+		return u'done'
+
+	assert sql.runTransaction(work) == u'done'
+	assert sql._pool.log.count('ROLLBACK') == 2
+	assert sql._pool.log.count('COMMIT') == 1
+	statistics = sql.getTransactionStatistics()
+	assert statistics['transactions'] == 1
+	assert statistics['retries'] == 2
+	assert statistics['serializationFailures'] == 2
+
+
+def testRetriesAreLimited():
+	sql = OfflinePostgres(transactionMaxRetries=2, transactionRetryDelay=0)
+	assert sql._retryDelay(psycopg2.OperationalError(), 1) is None
+	assert sql._retryDelay(SerializationFailure(), 1) is not None
+	assert sql._retryDelay(SerializationFailure(), 3) is None
+	assert sql.getTransactionStatistics()['failures'] == 1